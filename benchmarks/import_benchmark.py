@@ -0,0 +1,142 @@
+"""
+Import-Time / Collection Benchmark
+
+Measures what a run costs before the first test starts: interpreter start-up,
+imports of conftest, plugins, page objects and test modules, and collection.
+Each measurement is a fresh `pytest --collect-only` process (or any pytest
+arguments given after --), reporting:
+- wall time of the whole process (median and best of --runs)
+- time until collection finished, measured inside the process
+- which heavy client modules (Appium, Selenium WebDriver, urllib3, NumPy,
+  Pillow) were imported although no driver was started
+- log files created under logs/
+
+--compare-ref measures another git revision the same way from a temporary
+worktree, e.g. the commit before lazy imports, to show before/after.
+
+Usage:
+    python -m benchmarks.import_benchmark
+    python -m benchmarks.import_benchmark --compare-ref HEAD~1 --runs 7
+    python -m benchmarks.import_benchmark -- -m smoke
+"""
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("appium.webdriver", "selenium.webdriver", "urllib3", "numpy", "PIL")
+
+# Runs inside the measured process: collect, then report timings and loaded modules
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import pytest
+
+class Probe:
+    collected = 0
+    finished = None
+
+    def pytest_collection_finish(self, session):
+        self.collected = len(session.items)
+        self.finished = time.perf_counter()
+
+probe = Probe()
+code = pytest.main(sys.argv[2:], plugins=[probe])
+with open(sys.argv[1], "w") as handle:
+    json.dump({"exit_code": int(code), "collected": probe.collected,
+               "collection_seconds": (probe.finished or time.perf_counter()) - start,
+               "heavy_modules": [name for name in %r if name in sys.modules]}, handle)
+""" % (HEAVY_MODULES,)
+
+
+def _log_files(root):
+    directory = os.path.join(root, "logs")
+    return set(os.listdir(directory)) if os.path.isdir(directory) else set()
+
+
+def measure(root, pytest_args, runs=5):
+    """Time fresh pytest processes in a source tree
+
+    Args:
+        root: Repository root to run in
+        pytest_args: pytest arguments (default: --collect-only)
+        runs: Number of processes
+
+    Returns:
+        dict: wall_median, wall_best, collection_median, collected, heavy_modules, logs_created
+    """
+    walls, collections, result = [], [], {}
+    logs_before = _log_files(root)
+    with tempfile.TemporaryDirectory() as workdir:
+        output = os.path.join(workdir, "probe.json")
+        command = [sys.executable, "-c", PROBE, output, "-p", "no:cacheprovider", "-qqq",
+                   "--html", os.path.join(workdir, "report.html"), *pytest_args]
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(command, cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+            walls.append(time.perf_counter() - start)
+            with open(output, encoding="utf-8") as handle:
+                result = json.load(handle)
+            collections.append(result["collection_seconds"])
+    created = sorted(_log_files(root) - logs_before)
+    for name in created:
+        os.remove(os.path.join(root, "logs", name))  # Measurement leftovers, not real runs
+    return {
+        "wall_median": statistics.median(walls),
+        "wall_best": min(walls),
+        "collection_median": statistics.median(collections),
+        "collected": result.get("collected", 0),
+        "exit_code": result.get("exit_code"),
+        "heavy_modules": result.get("heavy_modules", []),
+        "logs_created": len(created),
+    }
+
+
+@contextlib.contextmanager
+def worktree(ref):
+    """Temporary git worktree checked out at ref"""
+    directory = tempfile.mkdtemp(prefix="import-benchmark-")
+    subprocess.run(["git", "worktree", "add", "--detach", "--quiet", directory, ref], cwd=ROOT, check=True)
+    try:
+        yield directory
+    finally:
+        subprocess.run(["git", "worktree", "remove", "--force", directory], cwd=ROOT, check=False)
+
+
+def format_row(label, result):
+    heavy = ", ".join(result["heavy_modules"]) or "none"
+    return (f"{label:<14} {result['wall_median'] * 1000:>8.0f} {result['wall_best'] * 1000:>8.0f} "
+            f"{result['collection_median'] * 1000:>10.0f} {result['collected']:>6} {result['logs_created']:>5}  {heavy}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure start-up and collection cost of the test suite")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--compare-ref", default=None, help="Also measure this git revision (e.g. HEAD~1)")
+    args, pytest_args = parser.parse_known_args(argv)
+    if pytest_args[:1] == ["--"]:
+        pytest_args = pytest_args[1:]
+    pytest_args = pytest_args or ["--collect-only"]
+
+    rows = []
+    if args.compare_ref:
+        with worktree(args.compare_ref) as directory:
+            rows.append((args.compare_ref, measure(directory, pytest_args, args.runs)))
+    rows.append(("working tree", measure(ROOT, pytest_args, args.runs)))
+
+    print(f"pytest {' '.join(pytest_args)}  ({args.runs} runs each)")
+    print(f"{'tree':<14} {'wall ms':>8} {'best ms':>8} {'collect ms':>10} {'tests':>6} {'logs':>5}  heavy modules loaded")
+    for label, result in rows:
+        print(format_row(label, result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
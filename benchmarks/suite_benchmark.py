@@ -0,0 +1,273 @@
+"""
+End-to-End Suite Benchmark
+
+Runs the test suite (tests/ by default) in a pytest subprocess against the
+fake Appium server started with a network latency profile, and reports where
+the wall time went. The subprocess records a timeline (plugins/timeline_profiler.py)
+which is split per test into:
+- sleep: time.sleep() calls (fixed delays, polling waits)
+- commands: WebDriver commands, including the simulated network latency
+- python: everything else (test code, pytest, fixtures, interpreter start-up)
+
+Results (wall time, throughput, the split above, commands per test and
+per-test figures) can be stored as a JSON baseline per profile in
+BENCHMARK_BASELINE_DIR and compared later: --check exits with status 1 when
+throughput dropped by more than BENCHMARK_MAX_REGRESSION. Throughput is
+compared over the tests present in both runs, so adding or removing tests does
+not count as a regression.
+
+Latency profiles apply to tests that use the `driver` fixture (APPIUM_SERVER);
+offline tests start their own zero-latency fake server.
+
+Usage:
+    python -m benchmarks.suite_benchmark --profile lan --save-baseline
+    python -m benchmarks.suite_benchmark --profile farm --check
+    python -m benchmarks.suite_benchmark tests/test_shopping_items.py --profile lan -- -k exact
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+from config.settings import get_settings
+from utils.fake_appium_server import FakeAppiumServer
+
+logger = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Simulated network conditions between the test host and the Appium server
+PROFILES = {
+    "local": {"latency": 0.0, "connect_latency": 0.0, "bandwidth": None},
+    "lan": {"latency": 0.003, "connect_latency": 0.005, "bandwidth": 10_000_000},
+    "farm": {"latency": 0.12, "connect_latency": 0.35, "bandwidth": 1_000_000},
+}
+
+
+def analyze_trace(path):
+    """Split the time of each test of a timeline trace into sleep, commands and Python
+
+    Sleep and command spans are attributed to the test whose span contains them
+    on the same thread; spans of other threads (in-process fake servers,
+    keepalive pings) are ignored.
+
+    Args:
+        path: Chrome trace written by --timeline
+
+    Returns:
+        dict: nodeid -> {"seconds", "sleep", "commands", "command_seconds", "python"}
+    """
+    with open(path, encoding="utf-8") as handle:
+        events = [event for event in json.load(handle)["traceEvents"] if event.get("ph") == "X"]
+    tests = sorted((e for e in events if e["cat"] == "test"), key=lambda e: e["ts"])
+    spans = defaultdict(list)
+    for event in events:
+        if event["cat"] in ("sleep", "webdriver"):
+            spans[(event["pid"], event["tid"])].append(event)
+
+    results = {}
+    for test in tests:
+        start, end = test["ts"], test["ts"] + test["dur"]
+        inside = [e for e in spans[(test["pid"], test["tid"])] if start <= e["ts"] and e["ts"] + e["dur"] <= end]
+        sleep = sum(e["dur"] for e in inside if e["cat"] == "sleep") / 1_000_000
+        commands = [e for e in inside if e["cat"] == "webdriver"]
+        command_seconds = sum(e["dur"] for e in commands) / 1_000_000
+        seconds = test["dur"] / 1_000_000
+        results[test["name"]] = {
+            "seconds": round(seconds, 4),
+            "sleep": round(sleep, 4),
+            "commands": len(commands),
+            "command_seconds": round(command_seconds, 4),
+            "python": round(max(seconds - sleep - command_seconds, 0.0), 4),
+        }
+    return results
+
+
+def summarize(per_test, wall_seconds, profile, exit_code):
+    """Suite-level figures from per-test results
+
+    Returns:
+        dict: JSON-serializable benchmark result
+    """
+    count = len(per_test)
+    sleep = sum(t["sleep"] for t in per_test.values())
+    command_seconds = sum(t["command_seconds"] for t in per_test.values())
+    commands = sum(t["commands"] for t in per_test.values())
+    return {
+        "profile": profile,
+        "network": PROFILES[profile],
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "exit_code": exit_code,
+        "tests": count,
+        "wall_seconds": round(wall_seconds, 3),
+        "sleep_seconds": round(sleep, 3),
+        "command_seconds": round(command_seconds, 3),
+        "python_seconds": round(max(wall_seconds - sleep - command_seconds, 0.0), 3),
+        "commands": commands,
+        "commands_per_test": round(commands / count, 1) if count else 0.0,
+        "tests_per_minute": round(count / wall_seconds * 60, 2) if wall_seconds else 0.0,
+        "per_test": per_test,
+    }
+
+
+def run_suite(paths, profile="lan", pytest_args=()):
+    """Run pytest against a fake Appium server with a latency profile
+
+    Args:
+        paths: Test files or directories
+        profile: Key of PROFILES
+        pytest_args: Extra pytest arguments
+
+    Returns:
+        dict: Result of summarize()
+    """
+    with tempfile.TemporaryDirectory() as workdir, FakeAppiumServer(**PROFILES[profile]) as server:
+        trace = os.path.join(workdir, "timeline.json")
+        command = [sys.executable, "-m", "pytest", *paths, "-q", "-p", "no:cacheprovider",
+                   "--appium-server", server.url, "--timeline", trace,
+                   "--html", os.path.join(workdir, "report.html"), *pytest_args]
+        logger.info(f"[{profile}] {' '.join(command)}")
+        start = time.perf_counter()
+        completed = subprocess.run(command, cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        wall_seconds = time.perf_counter() - start
+        if not os.path.exists(trace):
+            raise RuntimeError(f"pytest wrote no timeline (exit code {completed.returncode}):\n"
+                               f"{completed.stdout[-2000:]}")
+        per_test = analyze_trace(trace)
+    if completed.returncode:
+        logger.warning(f"pytest exited with {completed.returncode}:\n{completed.stdout[-2000:]}")
+    return summarize(per_test, wall_seconds, profile, completed.returncode)
+
+
+def shared_throughput(result, baseline):
+    """Throughput of both runs over the tests present in both
+
+    Tests added or removed since the baseline would change the workload, so
+    throughput is taken from the per-test seconds of the shared tests only.
+
+    Returns:
+        tuple: (shared test count, current tests/min, baseline tests/min)
+    """
+    shared = result["per_test"].keys() & baseline["per_test"].keys()
+    current = sum(result["per_test"][nodeid]["seconds"] for nodeid in shared)
+    before = sum(baseline["per_test"][nodeid]["seconds"] for nodeid in shared)
+    return (len(shared),
+            round(len(shared) / current * 60, 2) if current else 0.0,
+            round(len(shared) / before * 60, 2) if before else 0.0)
+
+
+def compare(result, baseline, max_regression):
+    """Throughput regressions of a result against a baseline
+
+    Only tests present in both runs are compared (see shared_throughput()).
+
+    Args:
+        result: Current result
+        baseline: Stored result of the same profile
+        max_regression: Allowed throughput drop as a fraction (0.10 = 10%)
+
+    Returns:
+        list: Problem descriptions (empty when within the threshold)
+    """
+    problems = []
+    if result["exit_code"]:
+        problems.append(f"pytest exited with {result['exit_code']}")
+    shared, current, before = shared_throughput(result, baseline)
+    if not shared:
+        problems.append("no tests in common with the baseline; save a new baseline")
+    elif before:
+        drop = 1 - current / before
+        if drop > max_regression:
+            problems.append(f"throughput {current:.2f} tests/min over {shared} shared tests is {drop:.0%} below "
+                            f"baseline {before:.2f} (allowed {max_regression:.0%})")
+    return problems
+
+
+def slowest_changes(result, baseline, limit=5):
+    """Tests whose duration grew the most since the baseline"""
+    changes = []
+    for nodeid, test in result["per_test"].items():
+        before = baseline["per_test"].get(nodeid)
+        if before:
+            changes.append((test["seconds"] - before["seconds"], nodeid, before, test))
+    return sorted(changes, reverse=True)[:limit]
+
+
+def baseline_path(profile, directory=None):
+    return os.path.join(directory or get_settings().BENCHMARK_BASELINE_DIR, f"suite_{profile}.json")
+
+
+def format_result(result):
+    wall = result["wall_seconds"] or 1.0
+    lines = [
+        f"profile {result['profile']}: {result['tests']} tests in {result['wall_seconds']:.1f} s "
+        f"({result['tests_per_minute']:.1f} tests/min), exit code {result['exit_code']}",
+    ]
+    for label, key in (("sleep", "sleep_seconds"), ("commands", "command_seconds"), ("python", "python_seconds")):
+        lines.append(f"  {label:<9} {result[key]:8.2f} s  {result[key] / wall:6.1%}")
+    lines.append(f"  {result['commands']} commands, {result['commands_per_test']} per test")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the test suite against the fake Appium server")
+    parser.add_argument("paths", nargs="*", default=["tests"], help="Test paths (default: tests)")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="lan")
+    parser.add_argument("--baseline-dir", default=None, help="Default: BENCHMARK_BASELINE_DIR")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the result as the profile's baseline")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if throughput regressed beyond the threshold")
+    parser.add_argument("--max-regression", type=float, default=None, help="Default: BENCHMARK_MAX_REGRESSION")
+    parser.add_argument("--output", default=None, help="Also write the result JSON here")
+    args, pytest_args = parser.parse_known_args(argv)
+    if pytest_args[:1] == ["--"]:
+        pytest_args = pytest_args[1:]
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    settings = get_settings()
+    result = run_suite(args.paths, args.profile, pytest_args)
+    print(format_result(result))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(result, handle, indent=2)
+
+    path = baseline_path(args.profile, args.baseline_dir)
+    status = 0
+    if args.check:
+        if not os.path.exists(path):
+            raise SystemExit(f"No baseline at {path}; run with --save-baseline first")
+        with open(path, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        max_regression = settings.BENCHMARK_MAX_REGRESSION if args.max_regression is None else args.max_regression
+        for delta, nodeid, before, after in slowest_changes(result, baseline):
+            if delta > 0:
+                print(f"  +{delta:.2f} s  {nodeid} ({before['seconds']:.2f} -> {after['seconds']:.2f} s, "
+                      f"{before['commands']} -> {after['commands']} commands)")
+        shared = len(result["per_test"].keys() & baseline["per_test"].keys())
+        if shared != len(result["per_test"]) or shared != len(baseline["per_test"]):
+            print(f"Comparing {shared} shared tests ({len(result['per_test']) - shared} new, "
+                  f"{len(baseline['per_test']) - shared} no longer run)")
+        problems = compare(result, baseline, max_regression)
+        for problem in problems:
+            print(f"REGRESSION: {problem}")
+        status = 1 if problems else 0
+        if not problems:
+            print(f"Within {max_regression:.0%} of baseline {path}")
+
+    if args.save_baseline:
+        if result["exit_code"]:
+            raise SystemExit("Not saving a baseline from a failing run")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(result, handle, indent=2)
+        print(f"Baseline written to {path}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+HTTP Transport Benchmark
+
+Compares the stock command executor (a fresh PoolManager per session) with
+the shared transport in utils/http_transport.py against the fake Appium
+server, under simulated network conditions. Each scenario runs several short
+sessions doing what a typical test does: start a session, look up elements,
+read the page source of a long shopping list, quit.
+
+Usage:
+    python -m benchmarks.transport_benchmark
+    python -m benchmarks.transport_benchmark --sessions 20 --latency 0.005 --connect-latency 0.05
+"""
+import argparse
+import logging
+import time
+
+from appium import webdriver
+from appium.options.android import UiAutomator2Options
+from appium.webdriver.common.appiumby import AppiumBy
+
+from config.settings import get_settings
+from utils.fake_appium_server import FakeAppiumServer
+from utils.http_transport import close_shared_pools, create_connection
+
+logger = logging.getLogger(__name__)
+
+LONG_LIST = [(f"Item {i}", i + 1) for i in range(40)]
+
+
+def run_scenario(server, executor_factory, sessions, lookups):
+    """Run the session workload once
+
+    Args:
+        server: Running FakeAppiumServer
+        executor_factory: Callable returning the command_executor for webdriver.Remote
+        sessions: Number of sessions to start
+        lookups: Element lookups per session
+
+    Returns:
+        dict: commands, seconds, ms_per_command, connections, bytes_sent
+    """
+    server.command_counts.clear()
+    server.connections = 0
+    server.bytes_sent = 0
+    options = UiAutomator2Options().load_capabilities(get_settings().desired_capabilities)
+
+    start = time.perf_counter()
+    for _ in range(sessions):
+        driver = webdriver.Remote(executor_factory(), options=options)
+        try:
+            driver.find_element(AppiumBy.ACCESSIBILITY_ID, "Shopping List").click()
+            server.sessions[driver.session_id].app.seed_items(LONG_LIST)
+            for _ in range(lookups):
+                driver.find_element(AppiumBy.ACCESSIBILITY_ID, "Back")
+            driver.page_source
+            driver.page_source
+        finally:
+            driver.quit()
+    seconds = time.perf_counter() - start
+
+    commands = sum(server.command_counts.values())
+    return {
+        "commands": commands,
+        "seconds": seconds,
+        "ms_per_command": seconds / commands * 1000,
+        "connections": server.connections,
+        "bytes_sent": server.bytes_sent,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the shared HTTP transport")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--lookups", type=int, default=20, help="Element lookups per session")
+    parser.add_argument("--latency", type=float, default=0.002, help="Seconds added to every command")
+    parser.add_argument("--connect-latency", type=float, default=0.03,
+                        help="Seconds added to every new connection (TCP/TLS handshake)")
+    parser.add_argument("--bandwidth", type=int, default=1_000_000, help="Bytes/second, 0 = unlimited")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    settings = get_settings()
+    scenarios = [
+        ("stock executor", lambda url: url),
+        ("shared pool", lambda url: create_connection(url, settings.with_overrides(HTTP_COMPRESSION=False))),
+        ("shared pool + gzip", lambda url: create_connection(url, settings)),
+    ]
+
+    with FakeAppiumServer(latency=args.latency, connect_latency=args.connect_latency,
+                          bandwidth=args.bandwidth or None) as server:
+        print(f"{'scenario':<20} {'commands':>8} {'total s':>8} {'ms/cmd':>8} {'conns':>6} {'KiB sent':>9}")
+        for name, factory in scenarios:
+            result = run_scenario(server, lambda: factory(server.url), args.sessions, args.lookups)
+            close_shared_pools()
+            print(f"{name:<20} {result['commands']:>8} {result['seconds']:>8.2f} "
+                  f"{result['ms_per_command']:>8.2f} {result['connections']:>6} "
+                  f"{result['bytes_sent'] / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,11 @@ This module contains all configuration settings for Appium test execution includ
 - Device capabilities
 - App details
 - Timeout values
+- HTTP transport settings
+- Visual check baseline settings
+
+These values are the defaults layer. Profiles, environment variables and CLI
+options are applied on top by config.settings (see get_settings()).
 """
 import os
 
@@ -39,24 +44,84 @@ class Config:
     # Timeouts (in seconds)
     IMPLICIT_WAIT = 10  # Default wait for element finding
     EXPLICIT_WAIT = 20  # Maximum wait for explicit waits
+    NEW_COMMAND_TIMEOUT = 300  # Server-side idle timeout for a session
+    ADD_ITEM_DELAY = 2.0  # Wait after adding a shopping list item
+    DELETE_ITEM_DELAY = 1.0  # Wait after deleting a shopping list item
+    NAVIGATION_DELAY = 2.0  # Wait after opening or leaving a screen
+    
+    # HTTP Transport (see utils/http_transport.py)
+    HTTP_KEEP_ALIVE = True  # Share one keep-alive connection pool across sessions
+    HTTP_COMPRESSION = True  # Ask for gzip-compressed responses (page source, screenshots)
+    HTTP_POOL_MAXSIZE = 4  # Connections kept per endpoint
+    HTTP_POOL_LIMITS = ""  # Per-endpoint overrides, e.g. "farm.example.com:4723=2"
+    
+    # External-App Checks (see utils/app_lanes.py)
+    EXTERNAL_APP_LANE = "inline"  # inline, activation or session
+    EXTERNAL_APP_TIMEOUT = 10.0  # Wait for the external app to open / the app to come back
+    SECONDARY_SYSTEM_PORT = 8210  # UiAutomator2 systemPort of the secondary session
+    
+    # Session Keepalive (see utils/session_keepalive.py)
+    KEEPALIVE_MARGIN = 30.0  # Ping an idle session this long before NEW_COMMAND_TIMEOUT
+    KEEPALIVE_MAX_IDLE = 900.0  # Release instead of ping after this much idle time (0 = never)
+    KEEPALIVE_MAX_SESSIONS = 2  # Live managed sessions; the longest-idle one is released beyond this
+    
+    # Screen Stability (see pages/stability.py)
+    STABILITY_WAIT = True  # Settle add/delete by screen stability (ADD/DELETE_ITEM_DELAY become upper bounds)
+    STABILITY_MATCHES = 3  # Consecutive equal page source fingerprints that count as stable
+    STABILITY_TIMEOUT = 5.0  # Default maximum wait of wait_until_stable()
+    STABILITY_MIN_INTERVAL = 0.05  # Pause between samples after a change
+    STABILITY_MAX_INTERVAL = 0.5  # Longest pause between samples while the screen is still
+    STABILITY_VOLATILE_ATTRIBUTES = "focused,selected"  # Ignored when fingerprinting
+    
+    # App Performance Sampling (see utils/perf_sampler.py)
+    PERF_SAMPLE_INTERVAL = 2.0  # Seconds between samples during device tests (0 = off)
+    PERF_DATA_TYPES = "cpuinfo,memoryinfo,gfxinfo"  # Sampled data types
+    PERF_MAX_OVERHEAD = 0.05  # Max share of wall time the sampler may spend in device commands
+    
+    # Text Entry (see pages/text_entry.py)
+    TEXT_ENTRY_STRATEGIES = "set_value,type,paste,send_keys"  # Candidates in order of preference
+    TEXT_ENTRY_PROBES = 1  # Timed uses of each strategy per field before picking the fastest
+    
+    # Multi-Host Runs (see plugins/distributed.py)
+    WORK_LEASE_SIZE = 4  # Tests handed to a worker per request
+    WORK_MAX_ATTEMPTS = 2  # Runs of a test before a worker death counts as its failure
+    WORKER_HEARTBEAT_INTERVAL = 5.0  # Seconds between worker heartbeats
+    WORKER_HEARTBEAT_TIMEOUT = 20.0  # Seconds without a heartbeat before a worker's tests are requeued
+    
+    # Generative Stress Tests (see utils/shopping_list_stress.py)
+    STRESS_EXAMPLES = 25  # Generated operation sequences per run
+    STRESS_MAX_OPERATIONS = 12  # Upper bound on operations per sequence
+    STRESS_SEED = 0  # Same seed replays the same sequences
+    
+    # Visual Checks
+    VISUAL_BASELINE_DIR = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), "baselines", "visual"
+    )
+    VISUAL_TOLERANCE = 6  # Max differing hash bits (of 64) per region
+    
+    # Self-Healing Locators (see pages/locator_index.py)
+    LOCATOR_INDEX_DIR = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), "baselines", "locators"
+    )
+    LOCATOR_SNAPSHOT_DIR = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), "baselines", "page_sources"
+    )
+    
+    # Suite Benchmark (see benchmarks/suite_benchmark.py)
+    BENCHMARK_BASELINE_DIR = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), "baselines", "benchmarks"
+    )
+    BENCHMARK_MAX_REGRESSION = 0.10  # Allowed throughput drop against the baseline (fraction)
     
     @staticmethod
     def get_desired_capabilities():
         """Returns desired capabilities for Appium session
         
+        Capabilities are built once from the resolved settings (defaults, profile,
+        environment and CLI layers) and cached for the rest of the process.
+        
         Returns:
-            dict: Appium capabilities dictionary
+            Mapping: Read-only Appium capabilities mapping
         """
-        return {
-            'platformName': Config.PLATFORM_NAME,
-            'platformVersion': Config.PLATFORM_VERSION,
-            'deviceName': Config.DEVICE_NAME,
-            'app': Config.APK_PATH,
-            'appPackage': Config.APP_PACKAGE,
-            'appActivity': Config.APP_ACTIVITY,
-            'automationName': Config.AUTOMATION_NAME,
-            'noReset': Config.NO_RESET,
-            'fullReset': Config.FULL_RESET,
-            'newCommandTimeout': 300,
-            'autoGrantPermissions': True,
-        }
+        from config.settings import get_settings
+        return get_settings().desired_capabilities
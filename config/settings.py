@@ -0,0 +1,311 @@
+"""
+Layered Settings Loader for Appium Test Execution
+
+Resolves the effective configuration once per process from these layers
+(later layers win):
+1. Defaults - the class attributes of config.config.Config
+2. Profile file - YAML or TOML, chosen with --appium-profile or APPIUM_PROFILE
+3. Worker section - the profile's [workers.<id>] table for the current
+   pytest-xdist worker (PYTEST_XDIST_WORKER), for parallel device runs
+4. Environment variables - APPIUM_<NAME> (e.g. APPIUM_DEVICE_NAME);
+   names that already start with APPIUM_ are used as-is (APPIUM_SERVER)
+5. CLI options - --appium-server, --device-name, --config-override KEY=VALUE
+
+The result is an immutable Settings object validated against a schema
+derived from the Config defaults, so new settings only need a default.
+"""
+import os
+import logging
+from functools import cached_property
+from types import MappingProxyType
+
+from config.config import Config
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV_VAR = "APPIUM_PROFILE"
+WORKER_ENV_VAR = "PYTEST_XDIST_WORKER"
+
+# Setting name -> expected type, derived from the Config defaults
+SCHEMA = MappingProxyType({
+    name: type(value)
+    for name, value in vars(Config).items()
+    if name.isupper() and not name.startswith("_")
+})
+
+# Extra constraints beyond the type check: name -> (predicate, description)
+CONSTRAINTS = {
+    "IMPLICIT_WAIT": (lambda v: v >= 0, "must be >= 0"),
+    "EXPLICIT_WAIT": (lambda v: v > 0, "must be > 0"),
+    "NEW_COMMAND_TIMEOUT": (lambda v: v > 0, "must be > 0"),
+    "ADD_ITEM_DELAY": (lambda v: v >= 0, "must be >= 0"),
+    "DELETE_ITEM_DELAY": (lambda v: v >= 0, "must be >= 0"),
+    "NAVIGATION_DELAY": (lambda v: v >= 0, "must be >= 0"),
+    "STRESS_EXAMPLES": (lambda v: v >= 1, "must be >= 1"),
+    "STRESS_MAX_OPERATIONS": (lambda v: v >= 1, "must be >= 1"),
+    "VISUAL_TOLERANCE": (lambda v: 0 <= v <= 64, "must be between 0 and 64"),
+    "HTTP_POOL_MAXSIZE": (lambda v: v >= 1, "must be >= 1"),
+    "HTTP_POOL_LIMITS": (lambda v: _valid_pool_limits(v), "must look like 'host:port=N,host=N'"),
+    "EXTERNAL_APP_LANE": (lambda v: v in ("inline", "activation", "session"),
+                          "must be one of inline, activation, session"),
+    "EXTERNAL_APP_TIMEOUT": (lambda v: v > 0, "must be > 0"),
+    "SECONDARY_SYSTEM_PORT": (lambda v: 1024 <= v <= 65535, "must be a port number (1024-65535)"),
+    "KEEPALIVE_MARGIN": (lambda v: v >= 0, "must be >= 0"),
+    "KEEPALIVE_MAX_IDLE": (lambda v: v >= 0, "must be >= 0"),
+    "KEEPALIVE_MAX_SESSIONS": (lambda v: v >= 1, "must be >= 1"),
+    "STABILITY_MATCHES": (lambda v: v >= 2, "must be >= 2"),
+    "STABILITY_TIMEOUT": (lambda v: v > 0, "must be > 0"),
+    "STABILITY_MIN_INTERVAL": (lambda v: v > 0, "must be > 0"),
+    "STABILITY_MAX_INTERVAL": (lambda v: v > 0, "must be > 0"),
+    "PERF_SAMPLE_INTERVAL": (lambda v: v >= 0, "must be >= 0"),
+    "PERF_DATA_TYPES": (lambda v: all(name.strip() in ("cpuinfo", "memoryinfo", "gfxinfo")
+                                      for name in v.split(",") if name.strip()),
+                        "must be a comma-separated list of cpuinfo, memoryinfo, gfxinfo"),
+    "PERF_MAX_OVERHEAD": (lambda v: 0 < v <= 1, "must be between 0 (exclusive) and 1"),
+    "TEXT_ENTRY_STRATEGIES": (lambda v: _valid_text_entry_strategies(v),
+                              "must be a comma-separated list of set_value, type, paste, send_keys"),
+    "TEXT_ENTRY_PROBES": (lambda v: v >= 1, "must be >= 1"),
+    "WORK_LEASE_SIZE": (lambda v: v >= 1, "must be >= 1"),
+    "WORK_MAX_ATTEMPTS": (lambda v: v >= 1, "must be >= 1"),
+    "WORKER_HEARTBEAT_INTERVAL": (lambda v: v > 0, "must be > 0"),
+    "WORKER_HEARTBEAT_TIMEOUT": (lambda v: v > 0, "must be > 0"),
+    "BENCHMARK_MAX_REGRESSION": (lambda v: 0 <= v < 1, "must be between 0 and 1"),
+    "APPIUM_SERVER": (lambda v: v.startswith(("http://", "https://")), "must be an http(s) URL"),
+}
+
+_TRUE_STRINGS = ("1", "true", "yes", "on")
+_FALSE_STRINGS = ("0", "false", "no", "off")
+
+_settings = None
+
+
+def _valid_pool_limits(text):
+    from utils.http_transport import parse_pool_limits
+    try:
+        parse_pool_limits(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _valid_text_entry_strategies(text):
+    from pages.text_entry import STRATEGIES
+    names = [name.strip() for name in text.split(",") if name.strip()]
+    return bool(names) and all(name in STRATEGIES for name in names)
+
+
+class ConfigError(ValueError):
+    """Raised when a configuration layer contains invalid settings"""
+
+
+def env_var_name(name):
+    """Environment variable that overrides a setting
+
+    Args:
+        name: Setting name (e.g. "DEVICE_NAME")
+
+    Returns:
+        str: Variable name (e.g. "APPIUM_DEVICE_NAME")
+    """
+    return name if name.startswith("APPIUM_") else f"APPIUM_{name}"
+
+
+def _coerce(name, value, source):
+    """Validate a value against the schema, converting strings where needed"""
+    if name not in SCHEMA:
+        raise ConfigError(f"Unknown setting '{name}' in {source}")
+    expected = SCHEMA[name]
+
+    if isinstance(value, str) and expected is not str:
+        text = value.strip().lower()
+        try:
+            if expected is bool:
+                if text not in _TRUE_STRINGS + _FALSE_STRINGS:
+                    raise ValueError(value)
+                value = text in _TRUE_STRINGS
+            else:
+                value = expected(value)
+        except ValueError:
+            raise ConfigError(
+                f"Setting '{name}' from {source} must be {expected.__name__}, got '{value}'"
+            ) from None
+
+    if expected is float and isinstance(value, int) and not isinstance(value, bool):
+        value = float(value)
+    if not isinstance(value, expected) or (expected is not bool and isinstance(value, bool)):
+        raise ConfigError(
+            f"Setting '{name}' from {source} must be {expected.__name__}, "
+            f"got {type(value).__name__}"
+        )
+
+    if name in CONSTRAINTS:
+        check, description = CONSTRAINTS[name]
+        if not check(value):
+            raise ConfigError(f"Setting '{name}' from {source} {description}, got {value!r}")
+    return value
+
+
+def load_profile(path):
+    """Read a YAML or TOML profile file
+
+    Args:
+        path: Profile path; the format is picked from the extension
+
+    Returns:
+        dict: Raw profile data
+    """
+    if not os.path.exists(path):
+        raise ConfigError(f"Profile file not found: {path}")
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".toml":
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ConfigError(f"Reading {path} needs the 'tomli' package on Python < 3.11 "
+                                  "(pip install -r requirements.txt)") from None
+        with open(path, "rb") as handle:
+            data = tomllib.load(handle)
+    elif extension in (".yaml", ".yml"):
+        import yaml
+        with open(path, encoding="utf-8") as handle:
+            data = yaml.safe_load(handle) or {}
+    else:
+        raise ConfigError(f"Unsupported profile format '{extension}' (use .toml, .yaml or .yml)")
+
+    if not isinstance(data, dict):
+        raise ConfigError(f"Profile {path} must contain a mapping of settings")
+    return data
+
+
+class Settings:
+    """Immutable, fully resolved configuration for one process
+
+    Settings are read as attributes (settings.DEVICE_NAME). Values cannot
+    be changed after resolution; use Settings.with_overrides() to derive a
+    new object instead.
+    """
+
+    def __init__(self, values, profile=None, worker_id=None, sources=None):
+        object.__setattr__(self, "_values", MappingProxyType(dict(values)))
+        object.__setattr__(self, "profile", profile)
+        object.__setattr__(self, "worker_id", worker_id)
+        object.__setattr__(self, "sources", MappingProxyType(dict(sources or {})))
+
+    def __getattr__(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(f"Unknown setting '{name}'") from None
+
+    def __setattr__(self, name, value):
+        # cached_property stores into __dict__ directly, so only explicit writes land here
+        raise AttributeError("Settings are immutable; use with_overrides() instead")
+
+    def __repr__(self):
+        return f"Settings(profile={self.profile!r}, worker_id={self.worker_id!r})"
+
+    def as_dict(self):
+        """Return a plain dict copy of all settings"""
+        return dict(self._values)
+
+    def with_overrides(self, **overrides):
+        """Return a new Settings with validated overrides applied"""
+        values = dict(self._values)
+        sources = dict(self.sources)
+        for name, value in overrides.items():
+            values[name] = _coerce(name, value, "overrides")
+            sources[name] = "overrides"
+        return Settings(values, self.profile, self.worker_id, sources)
+
+    @cached_property
+    def desired_capabilities(self):
+        """Appium capabilities, built once and shared (read-only)"""
+        return MappingProxyType({
+            'platformName': self.PLATFORM_NAME,
+            'platformVersion': self.PLATFORM_VERSION,
+            'deviceName': self.DEVICE_NAME,
+            'app': self.APK_PATH,
+            'appPackage': self.APP_PACKAGE,
+            'appActivity': self.APP_ACTIVITY,
+            'automationName': self.AUTOMATION_NAME,
+            'noReset': self.NO_RESET,
+            'fullReset': self.FULL_RESET,
+            'newCommandTimeout': self.NEW_COMMAND_TIMEOUT,
+            'autoGrantPermissions': True,
+        })
+
+
+def resolve_settings(profile=None, cli_overrides=None, environ=None, worker_id=None):
+    """Resolve all configuration layers into a Settings object
+
+    Args:
+        profile: Optional profile file path (falls back to APPIUM_PROFILE)
+        cli_overrides: Optional dict of setting name -> value from the command line
+        environ: Environment mapping (defaults to os.environ)
+        worker_id: Worker id for per-worker overrides (defaults to PYTEST_XDIST_WORKER)
+
+    Returns:
+        Settings: Validated, immutable settings
+    """
+    environ = os.environ if environ is None else environ
+    profile = profile or environ.get(PROFILE_ENV_VAR) or None
+    worker_id = worker_id or environ.get(WORKER_ENV_VAR) or None
+
+    values = {name: getattr(Config, name) for name in SCHEMA}
+    sources = dict.fromkeys(values, "defaults")
+
+    def apply(layer, source):
+        for name, value in layer.items():
+            values[name] = _coerce(name, value, source)
+            sources[name] = source
+
+    if profile:
+        data = load_profile(profile)
+        workers = data.pop("workers", {}) or {}
+        apply(data, f"profile {profile}")
+        if worker_id and worker_id in workers:
+            apply(workers[worker_id], f"profile {profile} [workers.{worker_id}]")
+
+    apply({name: environ[env_var_name(name)] for name in SCHEMA if env_var_name(name) in environ},
+          "environment")
+    apply(cli_overrides or {}, "command line")
+
+    settings = Settings(values, profile, worker_id, sources)
+    overridden = {name: source for name, source in sources.items() if source != "defaults"}
+    if overridden:
+        logger.debug(f"Settings overridden: {overridden}")
+    return settings
+
+
+def configure_settings(profile=None, cli_overrides=None):
+    """Resolve settings for this process and cache them
+
+    Called once from pytest_configure; later calls replace the cached object.
+
+    Returns:
+        Settings: The newly cached settings
+    """
+    global _settings
+    _settings = resolve_settings(profile=profile, cli_overrides=cli_overrides)
+    return _settings
+
+
+def get_settings():
+    """Return the cached settings, resolving them on first use
+
+    Returns:
+        Settings: Process-wide settings
+    """
+    if _settings is None:
+        return configure_settings()
+    return _settings
+
+
+def reset_settings():
+    """Drop the cached settings so the next get_settings() resolves again"""
+    global _settings
+    _settings = None
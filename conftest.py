@@ -2,26 +2,33 @@
 Pytest configuration and fixtures
 
 This module provides pytest configuration and fixtures for Appium test execution including:
-- Driver setup and teardown
+- Driver setup and teardown (shared across a screen's tests with --screen-affinity)
+- External-app lanes (see utils/app_lanes.py)
+- Session keepalive for long-lived secondary sessions (see utils/session_keepalive.py)
+- App performance sampling during device tests (see utils/perf_sampler.py)
 - Session-level logging
 - Test markers configuration
+- Command line options for the layered settings (see config/settings.py)
 """
 import pytest
-from appium import webdriver
-from appium.options.android import UiAutomator2Options
-from config.config import Config
+from config.settings import configure_settings, get_settings
+from utils.app_lanes import SecondarySession, create_lane
+from utils.http_transport import close_shared_pools, create_connection
+from utils.session_keepalive import KeepaliveManager
 import time
 import logging
 from datetime import datetime
 
-# Configure logging
+# Configure logging (the log file is only created when the first record is written,
+# so --collect-only and runs that select no tests leave no empty log behind)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
         logging.FileHandler(
             f'logs/test_run_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log',
-            encoding='utf-8'
+            encoding='utf-8',
+            delay=True
         ),
         logging.StreamHandler()
     ]
@@ -29,43 +36,197 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Optional plugins, each enabled by its own command line option
+pytest_plugins = [
+    "plugins.timeline_profiler",
+    "plugins.streaming_report",
+    "plugins.live_dashboard",
+    "plugins.distributed",
+    "plugins.screen_affinity",
+]
 
-@pytest.fixture(scope="function")
-def driver():
-    """Create and tear down Appium driver for each test function
+
+def _start_driver():
+    """Start an Appium driver on the configured device and wait for the app
     
-    Yields:
-        WebDriver: Appium driver instance for the test
+    Returns:
+        WebDriver: Appium driver instance
     """
+    # Imported here so collection does not load the Appium client
+    from appium import webdriver
+    from appium.options.android import UiAutomator2Options
+    
+    settings = get_settings()
+    
     # Initialize driver
     logger.info("[Setup] Starting Appium driver...")
-    logger.info(f"Connecting to Appium server: {Config.APPIUM_SERVER}")
-    logger.info(f"Device: {Config.DEVICE_NAME}, Platform: {Config.PLATFORM_NAME} {Config.PLATFORM_VERSION}")
+    logger.info(f"Connecting to Appium server: {settings.APPIUM_SERVER}")
+    logger.info(f"Device: {settings.DEVICE_NAME}, Platform: {settings.PLATFORM_NAME} {settings.PLATFORM_VERSION}")
     
     appium_driver = webdriver.Remote(
-        Config.APPIUM_SERVER,
+        create_connection(settings.APPIUM_SERVER, settings),
         options=UiAutomator2Options().load_capabilities(
-            Config.get_desired_capabilities()
+            settings.desired_capabilities
         )
     )
     
     logger.info("Appium driver started successfully")
     
     # Set implicit wait
-    appium_driver.implicitly_wait(Config.IMPLICIT_WAIT)
-    logger.info(f"Implicit wait set to {Config.IMPLICIT_WAIT} seconds")
+    appium_driver.implicitly_wait(settings.IMPLICIT_WAIT)
+    logger.info(f"Implicit wait set to {settings.IMPLICIT_WAIT} seconds")
     
     # Wait for app to start
     logger.info("Waiting for app to initialize...")
     time.sleep(5)
     logger.info("App initialized")
+    return appium_driver
+
+
+def _quit_driver(appium_driver):
+    """Close an Appium driver started by _start_driver()"""
+    logger.info("[Teardown] Closing Appium driver...")
+    appium_driver.quit()
+    logger.info("Appium driver closed")
+
+
+@pytest.fixture(scope="function")
+def driver(request):
+    """Create and tear down Appium driver for each test function
+    
+    With --screen-affinity consecutive tests of the same screen share one
+    driver (see plugins/screen_affinity.py).
+    
+    Yields:
+        WebDriver: Appium driver instance for the test
+    """
+    affinity = request.config.pluginmanager.get_plugin("screen_affinity_instance")
+    if affinity is None:
+        appium_driver = _start_driver()
+        yield appium_driver
+        _quit_driver(appium_driver)
+        return
     
+    appium_driver = affinity.acquire(request.node, _start_driver)
     yield appium_driver
+    affinity.release(request.node, appium_driver, _quit_driver)
+
+
+@pytest.fixture(scope="function", autouse=True)
+def perf_sampler(request):
+    """Sample the app's CPU, memory and frame statistics while a device test runs
     
-    # Teardown
-    logger.info("[Teardown] Closing Appium driver...")
+    Active for tests that use the `driver` fixture when PERF_SAMPLE_INTERVAL > 0.
+    The percentiles are attached to the test's report as user properties
+    (perf.<metric>.<p50|p95|max>) and logged.
+    
+    Yields:
+        PerfSampler: Running sampler, or None when not sampling
+    """
+    settings = get_settings()
+    if not settings.PERF_SAMPLE_INTERVAL or "driver" not in request.fixturenames:
+        yield None
+        return
+    from utils.perf_sampler import PerfSampler, result_properties
+    
+    sampler = PerfSampler(
+        request.getfixturevalue("driver"), settings.APP_PACKAGE,
+        interval=settings.PERF_SAMPLE_INTERVAL,
+        data_types=[name.strip() for name in settings.PERF_DATA_TYPES.split(",") if name.strip()],
+        max_overhead=settings.PERF_MAX_OVERHEAD,
+    ).start()
+    yield sampler
+    summary = sampler.stop()
+    request.node.user_properties.extend(result_properties(summary))
+    metrics = ", ".join(f"{name} p95 {values['p95']:g}" for name, values in summary.items() if "p95" in values)
+    logger.info(f"App performance: {metrics or 'no data'} (sampler {summary['sampler']})")
+
+
+@pytest.fixture(scope="session")
+def fake_appium_server():
+    """Start the fake Appium server for offline tests
+    
+    Yields:
+        FakeAppiumServer: Running server (see utils/fake_appium_server.py)
+    """
+    from utils.fake_appium_server import FakeAppiumServer
+    
+    server = FakeAppiumServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="function")
+def fake_driver(fake_appium_server):
+    """Create an Appium driver connected to the fake Appium server
+    
+    Each driver gets a fresh simulated app, like a new session on a device.
+    
+    Yields:
+        WebDriver: Appium driver instance backed by the simulated app
+    """
+    from appium import webdriver
+    from appium.options.android import UiAutomator2Options
+    
+    settings = get_settings()
+    appium_driver = webdriver.Remote(
+        create_connection(fake_appium_server.url, settings),
+        options=UiAutomator2Options().load_capabilities(
+            settings.desired_capabilities
+        )
+    )
+    yield appium_driver
     appium_driver.quit()
-    logger.info("Appium driver closed")
+
+
+@pytest.fixture(scope="session")
+def keepalive_manager():
+    """Keepalive manager for sessions held across tests
+    
+    Pings idle managed sessions before NEW_COMMAND_TIMEOUT, releases them under
+    pressure and rebuilds them on next use.
+    
+    Yields:
+        KeepaliveManager: Running manager (its counters are logged at teardown)
+    """
+    manager = KeepaliveManager(get_settings()).start()
+    yield manager
+    manager.close()
+
+
+@pytest.fixture(scope="session")
+def secondary_session(keepalive_manager):
+    """Secondary Appium session for the 'session' external-app lane
+    
+    Started on first use only, then shared by every external-app check of the
+    run and kept alive between them by the keepalive manager.
+    
+    Yields:
+        SecondarySession: Lazily started secondary session
+    """
+    settings = get_settings()
+    secondary = SecondarySession(
+        settings, connection_factory=lambda url: create_connection(url, settings),
+        keepalive=keepalive_manager,
+    )
+    yield secondary
+    secondary.close()
+
+
+@pytest.fixture(scope="function")
+def external_lane(request, driver):
+    """Lane used by checks that leave the app (EXTERNAL_APP_LANE setting)
+    
+    Yields:
+        AppLane: Lane bound to the test's driver
+    """
+    settings = get_settings()
+    secondary = None
+    if settings.EXTERNAL_APP_LANE == "session":
+        secondary = request.getfixturevalue("secondary_session")
+    lane = create_lane(settings.EXTERNAL_APP_LANE, driver, settings, secondary=secondary)
+    yield lane
+    lane.close()
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -76,17 +237,71 @@ def setup_session():
     logger.info(f"Session started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     logger.info("="*50)
     yield
+    close_shared_pools()
+    from pages.base_page import stability_stats, text_entry_stats
+    for screen, summary in stability_stats().items():
+        logger.info(f"Screen stability {screen}: {summary}")
+    for field, summary in text_entry_stats().items():
+        timings = ", ".join(f"{name} {s['mean_ms']} ms x{s['count']}" for name, s in summary["strategies"].items())
+        logger.info(f"Text entry {field}: using {summary['best']} ({timings})"
+                    + (f", unavailable: {sorted(summary['broken'])}" if summary["broken"] else ""))
     logger.info("="*50)
     logger.info("Test Session Completed")
     logger.info(f"Session ended at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     logger.info("="*50)
 
 
+def pytest_addoption(parser):
+    """Register command line options for the settings layers"""
+    group = parser.getgroup("appium", "Appium settings")
+    group.addoption("--appium-profile", default=None,
+                    help="YAML/TOML settings profile (overrides APPIUM_PROFILE)")
+    group.addoption("--appium-server", default=None, help="Appium server URL")
+    group.addoption("--device-name", default=None, help="Device name / udid")
+    group.addoption("--platform-version", default=None, help="Device platform version")
+    group.addoption("--external-lane", default=None, choices=("inline", "activation", "session"),
+                    help="How external-app checks run (EXTERNAL_APP_LANE)")
+    group.addoption("--config-override", action="append", default=[], metavar="NAME=VALUE",
+                    help="Override any setting, e.g. --config-override EXPLICIT_WAIT=30")
+
+
+def _cli_overrides(config):
+    """Collect setting overrides given on the command line"""
+    overrides = {}
+    for option, name in (("appium_server", "APPIUM_SERVER"),
+                         ("device_name", "DEVICE_NAME"),
+                         ("platform_version", "PLATFORM_VERSION"),
+                         ("external_lane", "EXTERNAL_APP_LANE")):
+        value = config.getoption(option)
+        if value is not None:
+            overrides[name] = value
+    for item in config.getoption("config_override"):
+        name, separator, value = item.partition("=")
+        if not separator:
+            raise pytest.UsageError(f"--config-override expects NAME=VALUE, got '{item}'")
+        overrides[name.strip().upper()] = value
+    return overrides
+
+
 def pytest_configure(config):
-    """Configure pytest with custom markers"""
+    """Configure pytest with custom markers and resolve settings"""
+    configure_settings(profile=config.getoption("appium_profile"), cli_overrides=_cli_overrides(config))
+    
     config.addinivalue_line(
         "markers", "smoke: mark test as smoke test"
     )
     config.addinivalue_line(
         "markers", "regression: mark test as regression test"
     )
+    config.addinivalue_line(
+        "markers", "external_app: test leaves the app for another package (uses external_lane)"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Schedule external-app checks after the in-app tests when they run in their own lane"""
+    if get_settings().EXTERNAL_APP_LANE == "inline":
+        return
+    in_app = [item for item in items if item.get_closest_marker("external_app") is None]
+    external = [item for item in items if item.get_closest_marker("external_app") is not None]
+    items[:] = in_app + external
@@ -4,23 +4,99 @@ Base Page Object for common methods
 This module provides the base page class that all page objects inherit from.
 Contains common methods for element interaction, waiting, and utilities.
 """
-from appium.webdriver.common.appiumby import AppiumBy
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from config.config import Config
+import os
+import re
+import logging
+from selenium.common.exceptions import TimeoutException, UnknownMethodException, WebDriverException
+from config.settings import get_settings
+from utils.batch_query import QUERY_SCRIPT, build_query
+from pages.elements import LookupPlan, collect_elements
+from pages.locator_index import LocatorIndex, record_page_source
+from pages.locators import AppiumBy
+from pages.stability import ScreenStats, fingerprint, volatile_pattern, wait_until_stable
+from pages.text_entry import TextEntry
+
+# selenium.webdriver.support (waits) and pages.visual_check (NumPy, Pillow) are
+# imported where they are used, so collecting tests does not load them
+
+logger = logging.getLogger(__name__)
+
+# Loaded locator indexes, shared by every page instance so learned order survives page objects
+_LOCATOR_INDEXES = {}
+
+# Text entry strategy choices per device, shared the same way so measurements carry over between tests
+_TEXT_ENTRIES = {}
+
+
+# Server messages of extensions that are not installed ('unknown command' and
+# 'unsupported operation' are raised as plain WebDriverExceptions)
+_MISSING_EXTENSION = re.compile(r"unknown command|unknown method|unsupported|not (?:supported|implemented)", re.I)
+
+
+def _extension_missing(error):
+    """Whether a WebDriverException says the server lacks the command (not a transient failure)"""
+    return isinstance(error, UnknownMethodException) or bool(_MISSING_EXTENSION.search(error.msg or ""))
+
+
+# Stability statistics per screen name (see pages/stability.py)
+_SCREEN_STATS = {}
+
+
+def stability_stats():
+    """Screen stability statistics of this process
+
+    Returns:
+        dict: Screen name -> summary (waits, timeouts, settle times, samples per wait)
+    """
+    return {screen: stats.summary() for screen, stats in _SCREEN_STATS.items()}
+
+
+def text_entry_stats():
+    """Text entry statistics of every device used in this process
+
+    Returns:
+        dict: Field key -> strategy summary (see TextEntry.stats)
+    """
+    stats = {}
+    for (server, device, _, _), entry in _TEXT_ENTRIES.items():
+        for key, summary in entry.stats().items():
+            stats[f"{key} @ {device}" if len(_TEXT_ENTRIES) > 1 else key] = summary
+    return stats
 
 
 class BasePage:
     """Base class for all page objects providing common functionality"""
     
+    # Visual check regions: name -> (by, value) locator used when recording baselines
+    VISUAL_REGIONS = {}
+    
+    # Declared Element descriptors and their compiled lookup plan (see pages/elements.py)
+    ELEMENTS = {}
+    LOOKUP_PLAN = LookupPlan({})
+    
+    # Logical elements without a stable locator: name -> callable(snapshot nodes) -> node,
+    # used offline to build the self-healing locator index (see pages/locator_index.py)
+    HEALING_TARGETS = {}
+    
+    def __init_subclass__(cls, **kwargs):
+        """Compile the lookup plan of a page class once, when the class is created"""
+        super().__init_subclass__(**kwargs)
+        cls.ELEMENTS = collect_elements(cls)
+        cls.LOOKUP_PLAN = LookupPlan(cls.ELEMENTS)
+    
     def __init__(self, driver):
         """Initialize BasePage with driver and wait
         
         Args:
             driver: Appium WebDriver instance
         """
+        from selenium.webdriver.support.ui import WebDriverWait
+
         self.driver = driver
-        self.wait = WebDriverWait(driver, Config.EXPLICIT_WAIT)
+        self.settings = get_settings()
+        self.wait = WebDriverWait(driver, self.settings.EXPLICIT_WAIT)
+        self._visual_baseline = None
+        self._bound_elements = {}
     
     def find_element(self, by, value, timeout=None):
         """Find element with explicit wait
@@ -33,6 +109,9 @@ class BasePage:
         Returns:
             WebElement: Found element
         """
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
         if timeout:
             wait = WebDriverWait(self.driver, timeout)
             return wait.until(EC.presence_of_element_located((by, value)))
@@ -90,6 +169,9 @@ class BasePage:
         Returns:
             WebElement: Visible element
         """
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
         if timeout:
             wait = WebDriverWait(self.driver, timeout)
         else:
@@ -97,8 +179,106 @@ class BasePage:
         return wait.until(EC.visibility_of_element_located((by, value)))
         return wait.until(EC.visibility_of_element_located((by, value)))
     
+    def query_elements(self, by, value, attributes=("content-desc",)):
+        """Find elements and read their attributes in a single round trip
+        
+        Sends one batch query to the server (see utils/batch_query.py). When the
+        batch query plugin is not installed on the server, falls back to
+        find_elements plus one get_attribute call per element, and remembers the
+        plugin's absence for the rest of the session. Other errors of the query
+        (a stale element, a timeout) only fall back for this call.
+        
+        Args:
+            by: Locator strategy
+            value: Locator value
+            attributes: Attribute names to read for each element
+            
+        Returns:
+            list: (WebElement, dict of attribute name -> value) tuples in document order
+        """
+        try:
+            plugin_available = self.driver.assert_extension_exists(QUERY_SCRIPT) is not None
+        except UnknownMethodException:
+            plugin_available = False
+        
+        if plugin_available:
+            try:
+                results = self.driver.execute_script(QUERY_SCRIPT, build_query(by, value, attributes))
+                return [(entry['element'], entry['attributes']) for entry in results]
+            except WebDriverException as e:
+                if not _extension_missing(e):
+                    # Stale element, timeout, server hiccup: fall back for this call only
+                    logger.info(f"Batch query failed, using per-element lookups for this call: {e.msg}")
+                else:
+                    logger.info(f"Batch query plugin unavailable, using per-element lookups: {e.msg}")
+                    self.driver.mark_extension_absence(QUERY_SCRIPT)
+        
+        elements = self.driver.find_elements(by, value)
+        return [(element, {name: element.get_attribute(name) for name in attributes})
+                for element in elements]
+    
+    def resolve_elements(self, names=None, attributes=(), timeout=0):
+        """Locate several declared elements using the page's compiled lookup plan
+        
+        Elements found by accessibility id or text are located with one merged
+        query, and the located WebElements are cached on the page's elements.
+        
+        Args:
+            names: Element names (defaults to all declared elements)
+            attributes: Extra attribute names to read for each element
+            timeout: Seconds to keep retrying until every element is found
+            
+        Returns:
+            dict: Element name -> (WebElement, dict of attribute name -> value) for found elements
+        """
+        queries = self.LOOKUP_PLAN.queries(names)
+        wanted = {name for query in queries for name in query.members.values()}
+        found = {}
+        
+        def locate(_driver):
+            for query in queries:
+                if all(name in found for name in query.members.values()):
+                    continue
+                read = tuple(dict.fromkeys(((query.attribute,) if query.attribute else ()) + tuple(attributes)))
+                for web_element, values in self.query_elements(query.by, query.value, read):
+                    name = query.members.get(values.get(query.attribute) if query.attribute else None)
+                    if name and name not in found:
+                        found[name] = (web_element, values)
+            return len(found) == len(wanted)
+        
+        if timeout:
+            from selenium.webdriver.support.ui import WebDriverWait
+
+            try:
+                WebDriverWait(self.driver, timeout).until(locate)
+            except TimeoutException:
+                logger.warning(f"Elements not found: {sorted(wanted - set(found))}")
+        else:
+            locate(self.driver)
+        
+        for name, (web_element, _) in found.items():
+            getattr(self, name).cache(web_element)
+        return found
+    
+    def are_elements_visible(self, names=None, timeout=0):
+        """Check several declared elements are displayed, in one merged query where possible
+        
+        Args:
+            names: Element names (defaults to all declared elements)
+            timeout: Seconds to keep retrying until every element is found
+            
+        Returns:
+            bool: True if every element was found and is displayed
+        """
+        names = list(self.ELEMENTS if names is None else names)
+        found = self.resolve_elements(names, attributes=("displayed",), timeout=timeout)
+        return all(name in found and found[name][1].get("displayed") == "true" for name in names)
+    
     def is_element_present(self, by, value, timeout=5):
         """Check if element is present"""
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
         try:
             WebDriverWait(self.driver, timeout).until(
                 EC.presence_of_element_located((by, value))
@@ -106,3 +286,172 @@ class BasePage:
             return True
         except:
             return False
+    
+    def visual_baseline_path(self):
+        """Path of this page's visual baseline file (one file per page class)"""
+        return os.path.join(self.settings.VISUAL_BASELINE_DIR, f"{type(self).__name__}.json")
+    
+    def has_visual_baseline(self):
+        """Check if a visual baseline has been recorded for this page"""
+        return bool(self._load_visual_baseline())
+    
+    def locator_index(self):
+        """Self-healing locator index of this page class (loaded once per process)"""
+        path = os.path.join(self.settings.LOCATOR_INDEX_DIR, f"{type(self).__name__}.json")
+        if path not in _LOCATOR_INDEXES:
+            _LOCATOR_INDEXES[path] = LocatorIndex.load(path)
+        return _LOCATOR_INDEXES[path]
+    
+    def locate(self, name, fallback=None):
+        """Locate a logical element through the locator index
+        
+        Tries the indexed candidates best first; when none matches (or the
+        element is not indexed) the fallback heuristic is used instead.
+        
+        Args:
+            name: Logical element name (a key of HEALING_TARGETS)
+            fallback: Optional callable returning the element by other means
+            
+        Returns:
+            WebElement: Located element, or None if not found
+        """
+        index = self.locator_index()
+        if name not in index:
+            logger.debug(f"'{name}' is not indexed, using fallback lookup")
+            return fallback() if fallback is not None else None
+        element = index.find(self, name)
+        if element is None and fallback is not None:
+            logger.info(f"'{name}' not found through the locator index, using fallback lookup")
+            element = fallback()
+        return element
+    
+    def text_entry(self):
+        """Text entry strategies for this device (shared by every page instance)"""
+        order = tuple(name.strip() for name in self.settings.TEXT_ENTRY_STRATEGIES.split(",") if name.strip())
+        key = (self.settings.APPIUM_SERVER, self.settings.DEVICE_NAME, order, self.settings.TEXT_ENTRY_PROBES)
+        if key not in _TEXT_ENTRIES:
+            _TEXT_ENTRIES[key] = TextEntry(order, probes=self.settings.TEXT_ENTRY_PROBES)
+        return _TEXT_ENTRIES[key]
+    
+    def enter_text(self, name, element, text):
+        """Replace the text of an input field using the fastest strategy that works for it
+        
+        The first use of each strategy on a field is verified by reading the field
+        back; latency is recorded per field (see pages/text_entry.py).
+        
+        Args:
+            name: Logical field name, e.g. 'name_field'
+            element: WebElement of the input field
+            text: Text to enter
+            
+        Returns:
+            str: Name of the strategy used
+        """
+        return self.text_entry().enter(self.driver, f"{type(self).__name__}.{name}", element, text)
+    
+    def screen_fingerprint(self):
+        """Fingerprint of the current page source without volatile attributes (see pages/stability.py)"""
+        names = self.settings.STABILITY_VOLATILE_ATTRIBUTES.split(",")
+        return fingerprint(self.driver.page_source, volatile_pattern(name.strip() for name in names))
+    
+    def wait_until_stable(self, timeout=None, matches=None, since=None, screen=None):
+        """Wait until the screen stops changing (animations have settled)
+        
+        Samples screen_fingerprint() until `matches` consecutive samples are equal.
+        The pause between samples grows while the screen is still and resets when
+        it changes. Results are recorded per screen (see stability_stats()).
+        
+        Args:
+            timeout: Maximum wait in seconds (uses STABILITY_TIMEOUT if not specified)
+            matches: Equal samples required (uses STABILITY_MATCHES if not specified)
+            since: Fingerprint taken before the action; the screen must change from it first
+            screen: Name statistics are kept under (defaults to the page class name)
+            
+        Returns:
+            bool: True if the screen became stable, False on timeout
+        """
+        screen = screen or type(self).__name__
+        stats = _SCREEN_STATS.setdefault(screen, ScreenStats())
+        stable, settle, samples = wait_until_stable(
+            self.screen_fingerprint,
+            stats,
+            matches=self.settings.STABILITY_MATCHES if matches is None else matches,
+            timeout=self.settings.STABILITY_TIMEOUT if timeout is None else timeout,
+            min_interval=self.settings.STABILITY_MIN_INTERVAL,
+            max_interval=self.settings.STABILITY_MAX_INTERVAL,
+            since=since,
+        )
+        if stable:
+            logger.debug(f"{screen} stable after {settle * 1000:.0f} ms ({samples} samples)")
+        else:
+            logger.warning(f"{screen} still changing after {samples} samples")
+        return stable
+    
+    def record_page_source(self):
+        """Save the current page source as a snapshot for the locator index
+        
+        Returns:
+            str: Path of the snapshot
+        """
+        return record_page_source(
+            self.driver, os.path.join(self.settings.LOCATOR_SNAPSHOT_DIR, type(self).__name__)
+        )
+    
+    def _load_visual_baseline(self):
+        if self._visual_baseline is None:
+            from pages.visual_check import load_baseline
+
+            self._visual_baseline = load_baseline(self.visual_baseline_path())
+        return self._visual_baseline
+    
+    def capture_visual_baseline(self):
+        """Record bounds and hashes of all VISUAL_REGIONS from the current screen
+        
+        Locates each region element once to get its bounds, then hashes all regions
+        from a single screenshot. Run this once per device while the screen is in its
+        expected state; later checks need no element lookups.
+        
+        Returns:
+            dict: Region name -> VisualRegion that was saved
+        """
+        from pages.visual_check import VisualRegion, compute_hashes, decode_screenshot, save_baseline
+
+        regions = []
+        for name, (by, value) in self.VISUAL_REGIONS.items():
+            rect = self.find_element(by, value).rect
+            regions.append(VisualRegion(name, (rect['x'], rect['y'], rect['width'], rect['height'])))
+        
+        image = decode_screenshot(self.driver.get_screenshot_as_png())
+        for region, hash_bits in zip(regions, compute_hashes(image, [r.bounds for r in regions])):
+            region.hash_bits = hash_bits
+        
+        save_baseline(self.visual_baseline_path(), regions)
+        self._visual_baseline = {region.name: region for region in regions}
+        return self._visual_baseline
+    
+    def check_visual_regions(self, names=None, tolerance=None):
+        """Check registered regions against the baseline using one screenshot
+        
+        Args:
+            names: Optional list of region names (defaults to all baseline regions)
+            tolerance: Max differing hash bits per region (uses config default if not specified)
+            
+        Returns:
+            dict: Region name -> True if region matches its baseline, False otherwise
+        """
+        tolerance = self.settings.VISUAL_TOLERANCE if tolerance is None else tolerance
+        baseline = self._load_visual_baseline()
+        names = list(baseline) if names is None else list(names)
+        
+        missing = [name for name in names if name not in baseline]
+        if missing:
+            logger.warning(f"No visual baseline for regions: {missing}")
+        regions = [baseline[name] for name in names if name in baseline]
+        if not regions:
+            return {name: False for name in names}
+        
+        from pages.visual_check import compare_regions, decode_screenshot
+
+        image = decode_screenshot(self.driver.get_screenshot_as_png())
+        distances = compare_regions(image, regions, tolerance)
+        return {name: name in distances and distances[name] <= tolerance for name in names}
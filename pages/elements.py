@@ -0,0 +1,351 @@
+"""
+Declarative Element Descriptors for Page Objects
+
+Page objects declare their elements as class attributes instead of repeating
+find-then-act code in every method:
+
+    class HomePage(BasePage):
+        web_search = Element(AccessibilityId("Web Search"))
+
+    home_page.web_search.click()
+    home_page.web_search.is_visible()
+
+This module provides:
+- Locators - AccessibilityId, Text, ClassName, XPath, UiSelector; each is a
+  (by, value) tuple, so it works anywhere a locator tuple is expected
+- Element - descriptor resolved lazily on first use and cached per page
+  instance (re-resolved once if the cached element has gone stale)
+- LookupPlan - compiled once per page class (BasePage.__init_subclass__);
+  elements located by accessibility id or text are merged into a single
+  UiSelector regex query, so checking every element of a screen costs one
+  batch query instead of one lookup per element
+- Timing - every element action is timed and aggregated in ELEMENT_TIMINGS
+"""
+import logging
+import re
+import time
+from collections import defaultdict
+
+from pages.locators import AppiumBy
+from selenium.common.exceptions import StaleElementReferenceException
+
+logger = logging.getLogger(__name__)
+
+# (page class name, element name, action) -> [calls, total seconds]
+ELEMENT_TIMINGS = defaultdict(lambda: [0, 0.0])
+
+# Characters with a special meaning in (Java) regular expressions
+_REGEX_SPECIAL = re.compile(r'([\\.\[\]{}()*+?^$|-])')
+
+
+def _java_string(text):
+    """Quote text as a Java string literal for UiSelector arguments"""
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _regex_literal(text):
+    return _REGEX_SPECIAL.sub(r'\\\1', text)
+
+
+class Locator(tuple):
+    """(by, value) locator; subclasses define how lookups can be merged
+
+    Attributes:
+        MERGE_METHOD: UiSelector regex method able to match several values at
+            once (None if the locator cannot be merged)
+        MERGE_ATTRIBUTE: Element attribute that tells merged results apart
+    """
+
+    BY = None
+    MERGE_METHOD = None
+    MERGE_ATTRIBUTE = None
+
+    def __new__(cls, value):
+        return super().__new__(cls, (cls.BY, value))
+
+    @property
+    def by(self):
+        return self[0]
+
+    @property
+    def value(self):
+        return self[1]
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.value!r})"
+
+
+class AccessibilityId(Locator):
+    """Flutter semantics label / Android content-desc"""
+    BY = AppiumBy.ACCESSIBILITY_ID
+    MERGE_METHOD = "descriptionMatches"
+    MERGE_ATTRIBUTE = "content-desc"
+
+
+class Text(Locator):
+    """Exact element text, located with a UiSelector"""
+    BY = AppiumBy.ANDROID_UIAUTOMATOR
+    MERGE_METHOD = "textMatches"
+    MERGE_ATTRIBUTE = "text"
+
+    def __new__(cls, value):
+        locator = super().__new__(cls, f"new UiSelector().text({_java_string(value)})")
+        locator.text = value
+        return locator
+
+    def __repr__(self):
+        return f"Text({self.text!r})"
+
+
+class ClassName(Locator):
+    """Android widget class (first match)"""
+    BY = AppiumBy.CLASS_NAME
+
+
+class XPath(Locator):
+    """XPath expression (first match)"""
+    BY = AppiumBy.XPATH
+
+
+class UiSelector(Locator):
+    """Raw UiAutomator selector (first match)"""
+    BY = AppiumBy.ANDROID_UIAUTOMATOR
+
+
+def _merge_key(locator):
+    """Value matched against MERGE_ATTRIBUTE for a mergeable locator"""
+    return locator.text if isinstance(locator, Text) else locator.value
+
+
+class PlannedQuery:
+    """One query of a lookup plan
+
+    Attributes:
+        by: Locator strategy
+        value: Locator value
+        attribute: Attribute used to map results to elements (None = first match)
+        members: Attribute value (or None) -> element name
+    """
+
+    __slots__ = ("by", "value", "attribute", "members")
+
+    def __init__(self, by, value, attribute, members):
+        self.by = by
+        self.value = value
+        self.attribute = attribute
+        self.members = members
+
+    def __repr__(self):
+        return f"PlannedQuery({self.by!r}, {self.value!r}, {sorted(self.members.values())})"
+
+
+class LookupPlan:
+    """Queries that locate a set of elements with as few round trips as possible
+
+    Args:
+        elements: Element name -> Element descriptor
+    """
+
+    def __init__(self, elements):
+        self.elements = dict(elements)
+        self._cache = {}
+
+    def queries(self, names=None):
+        """Compile (and cache) the queries locating the given elements
+
+        Args:
+            names: Element names (defaults to all elements of the page)
+
+        Returns:
+            list: PlannedQuery objects
+        """
+        names = tuple(sorted(self.elements if names is None else names))
+        if names not in self._cache:
+            self._cache[names] = self._compile(names)
+        return self._cache[names]
+
+    def _compile(self, names):
+        groups = defaultdict(list)
+        queries = []
+        for name in names:
+            locator = self.elements[name].locator
+            if locator.MERGE_METHOD:
+                groups[type(locator)].append((name, locator))
+            else:
+                queries.append(PlannedQuery(locator.by, locator.value, None, {None: name}))
+
+        for locator_type, members in groups.items():
+            if len(members) == 1:
+                name, locator = members[0]
+                queries.append(PlannedQuery(locator.by, locator.value, locator.MERGE_ATTRIBUTE,
+                                            {_merge_key(locator): name}))
+                continue
+            pattern = "|".join(_regex_literal(_merge_key(locator)) for _, locator in members)
+            selector = f"new UiSelector().{locator_type.MERGE_METHOD}({_java_string(f'^({pattern})$')})"
+            queries.append(PlannedQuery(AppiumBy.ANDROID_UIAUTOMATOR, selector, locator_type.MERGE_ATTRIBUTE,
+                                        {_merge_key(locator): name for name, locator in members}))
+        return queries
+
+
+def collect_elements(cls):
+    """Element descriptors of a class and its bases (name -> Element)"""
+    elements = {}
+    for klass in reversed(cls.__mro__):
+        for name, member in vars(klass).items():
+            if isinstance(member, Element):
+                elements[name] = member
+    return elements
+
+
+class Element:
+    """Descriptor declaring one element of a page object
+
+    Args:
+        locator: Locator (e.g. AccessibilityId("Web Search"))
+        timeout: Optional lookup timeout (uses the page's explicit wait if not specified)
+    """
+
+    def __init__(self, locator, timeout=None):
+        self.locator = locator
+        self.timeout = timeout
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, page, owner=None):
+        if page is None:
+            return self
+        bound = page._bound_elements.get(self.name)
+        if bound is None:
+            bound = page._bound_elements[self.name] = BoundElement(page, self)
+        return bound
+
+    def __repr__(self):
+        return f"Element({self.locator!r})"
+
+
+def _timed(action):
+    """Decorator recording the duration of a BoundElement action"""
+
+    def decorator(method):
+        def wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                stats = ELEMENT_TIMINGS[(type(self.page).__name__, self.name, action)]
+                stats[0] += 1
+                stats[1] += elapsed
+                logger.debug(f"{type(self.page).__name__}.{self.name}.{action} took {elapsed * 1000:.1f} ms")
+
+        wrapper.__name__ = method.__name__
+        wrapper.__doc__ = method.__doc__
+        return wrapper
+
+    return decorator
+
+
+class BoundElement:
+    """An Element of a specific page instance; resolves and caches its WebElement
+
+    Args:
+        page: Page object instance
+        element: Element descriptor
+    """
+
+    def __init__(self, page, element):
+        self.page = page
+        self.element = element
+        self.name = element.name
+        self._web_element = None
+
+    @property
+    def locator(self):
+        return self.element.locator
+
+    def cache(self, web_element):
+        """Store a WebElement located elsewhere (e.g. by a merged lookup plan)"""
+        self._web_element = web_element
+
+    def invalidate(self):
+        """Forget the cached WebElement"""
+        self._web_element = None
+
+    @_timed("resolve")
+    def resolve(self, timeout=None):
+        """Locate the element (cached after the first lookup)
+
+        Args:
+            timeout: Optional custom timeout
+
+        Returns:
+            WebElement: Located element
+        """
+        if self._web_element is None:
+            self._web_element = self.page.find_element(
+                self.locator.by, self.locator.value, timeout=timeout or self.element.timeout
+            )
+        return self._web_element
+
+    def _act(self, action):
+        """Run action on the element, re-resolving once if the cached element went stale"""
+        try:
+            return action(self.resolve())
+        except StaleElementReferenceException:
+            logger.debug(f"{self.name}: cached element is stale, locating it again")
+            self.invalidate()
+            return action(self.resolve())
+
+    @_timed("click")
+    def click(self):
+        """Click the element"""
+        self._act(lambda web_element: web_element.click())
+
+    @_timed("is_visible")
+    def is_visible(self, timeout=None):
+        """Check if the element is displayed
+
+        Args:
+            timeout: Optional custom timeout for locating the element
+
+        Returns:
+            bool: True if displayed, False if hidden or not found
+        """
+        try:
+            if timeout is not None:
+                self.resolve(timeout=timeout)
+            return self._act(lambda web_element: web_element.is_displayed())
+        except Exception:
+            self.invalidate()
+            return False
+
+    @_timed("text")
+    def text(self):
+        """Text of the element"""
+        return self._act(lambda web_element: web_element.text)
+
+    @_timed("get_attribute")
+    def get_attribute(self, name):
+        """Attribute value of the element"""
+        return self._act(lambda web_element: web_element.get_attribute(name))
+
+    @_timed("send_keys")
+    def send_keys(self, text):
+        """Type text into the element"""
+        self._act(lambda web_element: web_element.send_keys(text))
+
+    def __repr__(self):
+        return f"<{type(self.page).__name__}.{self.name} {self.locator!r}>"
+
+
+def timing_summary():
+    """Element action timings aggregated so far
+
+    Returns:
+        list: (page, element, action, calls, total seconds) tuples, slowest first
+    """
+    rows = [(page, name, action, calls, seconds)
+            for (page, name, action), (calls, seconds) in ELEMENT_TIMINGS.items()]
+    return sorted(rows, key=lambda row: row[4], reverse=True)
@@ -6,8 +6,9 @@ This page object represents the home page of the Flutter app with three main act
 - Open Gmail: Opens Gmail in browser
 - Shopping List: Navigates to the shopping list feature
 """
-from appium.webdriver.common.appiumby import AppiumBy
+from pages.locators import AppiumBy
 from pages.base_page import BasePage
+from pages.elements import AccessibilityId, Element
 import time
 import logging
 
@@ -23,6 +24,17 @@ class HomePage(BasePage):
     SHOPPING_LIST_BUTTON = "Shopping List"
     APP_PACKAGE = "com.example.my_app"
     
+    # Elements
+    web_search = Element(AccessibilityId(WEB_SEARCH_BUTTON))
+    open_gmail = Element(AccessibilityId(OPEN_GMAIL_BUTTON))
+    shopping_list = Element(AccessibilityId(SHOPPING_LIST_BUTTON))
+    
+    VISUAL_REGIONS = {
+        WEB_SEARCH_BUTTON: web_search.locator,
+        OPEN_GMAIL_BUTTON: open_gmail.locator,
+        SHOPPING_LIST_BUTTON: shopping_list.locator,
+    }
+    
     def __init__(self, driver):
         super().__init__(driver)
     
@@ -75,83 +87,71 @@ class HomePage(BasePage):
         
         return True
     
-    def click_gmail_button(self):
-        """Click the Open Gmail button - opens Gmail app"""
+    def _click_button(self, button, label):
+        """Click a declared button, logging the outcome
+        
+        Args:
+            button: Bound element (e.g. self.open_gmail)
+            label: Button name for log messages
+            
+        Returns:
+            bool: True if clicked successfully, False otherwise
+        """
         try:
-            logger.debug("Attempting to find Open Gmail button")
-            element = self.find_element(
-                AppiumBy.ACCESSIBILITY_ID,
-                self.OPEN_GMAIL_BUTTON
-            )
-            element.click()
-            logger.info("Open Gmail button clicked successfully")
+            logger.debug(f"Attempting to find {label} button")
+            button.click()
+            logger.info(f"{label} button clicked successfully")
             return True
         except Exception as e:
-            logger.error(f"Error clicking Open Gmail button: {e}")
+            logger.error(f"Error clicking {label} button: {e}")
             return False
     
+    def click_gmail_button(self):
+        """Click the Open Gmail button - opens Gmail app"""
+        return self._click_button(self.open_gmail, self.OPEN_GMAIL_BUTTON)
+    
     def click_web_search_button(self):
         """Click the Web Search button - opens browser"""
-        try:
-            logger.debug("Attempting to find Web Search button")
-            element = self.find_element(
-                AppiumBy.ACCESSIBILITY_ID,
-                self.WEB_SEARCH_BUTTON
-            )
-            element.click()
-            logger.info("Web Search button clicked successfully")
-            return True
-        except Exception as e:
-            logger.error(f"Error clicking Web Search button: {e}")
-            return False
+        return self._click_button(self.web_search, self.WEB_SEARCH_BUTTON)
     
     def click_shopping_list_button(self):
         """Click the Shopping List button - launches Shopping List app"""
-        try:
-            logger.debug("Attempting to find Shopping List button")
-            element = self.find_element(
-                AppiumBy.ACCESSIBILITY_ID,
-                self.SHOPPING_LIST_BUTTON
-            )
-            element.click()
-            logger.info("Shopping List button clicked successfully")
-            return True
-        except Exception as e:
-            logger.error(f"Error clicking Shopping List button: {e}")
-            return False
+        return self._click_button(self.shopping_list, self.SHOPPING_LIST_BUTTON)
     
     def is_web_search_button_visible(self):
         """Check if Web Search button is visible"""
-        try:
-            element = self.find_element(
-                AppiumBy.ACCESSIBILITY_ID,
-                self.WEB_SEARCH_BUTTON
-            )
-            return element.is_displayed()
-        except:
-            return False
+        return self.web_search.is_visible()
     
     def is_gmail_button_visible(self):
         """Check if Open Gmail button is visible"""
-        try:
-            element = self.find_element(
-                AppiumBy.ACCESSIBILITY_ID,
-                self.OPEN_GMAIL_BUTTON
-            )
-            return element.is_displayed()
-        except:
-            return False
+        return self.open_gmail.is_visible()
     
     def is_shopping_list_button_visible(self):
         """Check if Shopping List button is visible"""
-        try:
-            element = self.find_element(
-                AppiumBy.ACCESSIBILITY_ID,
-                self.SHOPPING_LIST_BUTTON
-            )
-            return element.is_displayed()
-        except:
-            return False
+        return self.shopping_list.is_visible()
+    
+    def are_all_buttons_visible(self, tolerance=None):
+        """Check all three action buttons in one round trip
+        
+        Uses a single screenshot compared against the visual baseline when one has
+        been recorded (see capture_visual_baseline), otherwise locates all buttons
+        with one merged query (see resolve_elements), retried for up to EXPLICIT_WAIT.
+        
+        Args:
+            tolerance: Optional max differing hash bits per button region
+            
+        Returns:
+            bool: True if all buttons are visible
+        """
+        if self.has_visual_baseline():
+            results = self.check_visual_regions(list(self.VISUAL_REGIONS), tolerance=tolerance)
+            logger.info(f"Visual button check: {results}")
+            return all(results.values())
+        
+        logger.debug("No visual baseline recorded, checking buttons with one merged lookup")
+        # Wait like the single-button checks do, e.g. right after navigating back home
+        return self.are_elements_visible(["web_search", "open_gmail", "shopping_list"],
+                                         timeout=self.settings.EXPLICIT_WAIT)
     
     def return_from_webview(self, wait_time=3):
         """Navigate back to Flutter app from WebView opened by Web Search or Gmail buttons
@@ -0,0 +1,305 @@
+"""
+Self-Healing Locator Index
+
+Some elements have no stable accessibility id (the shopping list's Add button
+and its two input fields), so pages used to find them by elimination ("any
+button that is not Back", "the first EditText"), scanning every element of a
+class on each call. This module moves that search offline:
+- record_page_source() saves page_source snapshots of a screen
+- build_index() identifies each logical element in every snapshot with the
+  page's HEALING_TARGETS (the old heuristics, run once offline), generates
+  candidate locators for it and ranks them by how many snapshots they pick out
+  the right element in, then by lookup cost; elements only a class + instance
+  candidate finds are left out (that is the fallback heuristic's own guess)
+- LocatorIndex.find() tries the ranked candidates at runtime, falls back to the
+  next one when a candidate finds nothing, and moves the winner to the front
+  (the learned order is kept for the process only; rebuild the index from new
+  snapshots to change the stored order)
+
+Indexes are JSON files, one per page class, in LOCATOR_INDEX_DIR; snapshots
+live in LOCATOR_SNAPSHOT_DIR/<PageClass>/. The committed ShoppingListPage
+snapshots are recorded from the fake app (utils/fake_flutter_app.py) for the
+tests; an index for a real device has to be built from dumps of that device.
+
+Usage:
+    python -m pages.locator_index build ShoppingListPage
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+from pages.locators import AppiumBy
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+# Lookup cost rank of each candidate kind (lower is cheaper / more robust)
+KIND_COST = {"accessibility_id": 0, "resource_id": 1, "text": 2, "instance": 3}
+
+# Widgets whose text is user input, so it never identifies them
+EDITABLE_CLASSES = ("android.widget.EditText",)
+
+
+def _java_string(text):
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def snapshot_nodes(page_source):
+    """Elements of a page source in document order (without the hierarchy root)"""
+    root = ET.fromstring(page_source)
+    return [node for node in root.iter() if node is not root]
+
+
+class Candidate:
+    """One way of locating a logical element
+
+    Attributes:
+        kind: "accessibility_id", "resource_id", "text" or "instance"
+        class_name: Widget class the candidate is restricted to
+        value: content-desc, resource-id, text or instance number (per kind)
+        score: Fraction of snapshots in which the candidate found the element
+    """
+
+    __slots__ = ("kind", "class_name", "value", "score")
+
+    def __init__(self, kind, class_name, value, score=0.0):
+        self.kind = kind
+        self.class_name = class_name
+        self.value = value
+        self.score = score
+
+    @property
+    def key(self):
+        return (self.kind, self.class_name, self.value)
+
+    @property
+    def locator(self):
+        """(by, value) locator used at runtime"""
+        if self.kind == "accessibility_id":
+            return AppiumBy.ACCESSIBILITY_ID, self.value
+        if self.kind == "resource_id":
+            return AppiumBy.ID, self.value
+        selector = f"new UiSelector().className({_java_string(self.class_name)})"
+        if self.kind == "text":
+            return AppiumBy.ANDROID_UIAUTOMATOR, f"{selector}.text({_java_string(self.value)})"
+        return AppiumBy.ANDROID_UIAUTOMATOR, f"{selector}.instance({self.value})"
+
+    def select(self, nodes):
+        """Node this candidate resolves to in a snapshot (None if none or ambiguous)"""
+        if self.kind == "instance":
+            same_class = [node for node in nodes if node.get("class") == self.class_name]
+            return same_class[self.value] if self.value < len(same_class) else None
+        attribute = {"accessibility_id": "content-desc", "resource_id": "resource-id", "text": "text"}[self.kind]
+        matches = [node for node in nodes if node.get(attribute) == self.value
+                   and (self.kind != "text" or node.get("class") == self.class_name)]
+        return matches[0] if len(matches) == 1 else None
+
+    def as_dict(self):
+        return {"kind": self.kind, "class": self.class_name, "value": self.value, "score": round(self.score, 3)}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["kind"], data["class"], data["value"], data.get("score", 0.0))
+
+    def __repr__(self):
+        return f"Candidate({self.kind}, {self.class_name!r}, {self.value!r}, score={self.score:.2f})"
+
+
+def generate_candidates(nodes, target):
+    """Candidate locators for one element of a snapshot
+
+    Args:
+        nodes: Snapshot elements in document order
+        target: The element to locate
+
+    Returns:
+        list: Candidate objects (unscored)
+    """
+    class_name = target.get("class")
+    candidates = []
+    if target.get("content-desc"):
+        candidates.append(Candidate("accessibility_id", class_name, target.get("content-desc")))
+    if target.get("resource-id"):
+        candidates.append(Candidate("resource_id", class_name, target.get("resource-id")))
+    if target.get("text") and class_name not in EDITABLE_CLASSES:
+        candidates.append(Candidate("text", class_name, target.get("text")))
+    same_class = [node for node in nodes if node.get("class") == class_name]
+    candidates.append(Candidate("instance", class_name, same_class.index(target)))
+    return candidates
+
+
+def build_index(page_sources, targets, min_score=0.5):
+    """Rank candidate locators for each logical element over recorded snapshots
+
+    Args:
+        page_sources: Page source XML strings of one screen
+        targets: Logical element name -> callable(nodes) returning the element or None
+        min_score: Drop candidates that found the element in fewer snapshots than this fraction
+
+    Returns:
+        dict: Logical element name -> ranked list of Candidate objects
+    """
+    snapshots = [snapshot_nodes(source) for source in page_sources]
+    index = {}
+    for name, identify in targets.items():
+        labelled = [(nodes, identify(nodes)) for nodes in snapshots]
+        labelled = [(nodes, target) for nodes, target in labelled if target is not None]
+        if not labelled:
+            logger.warning(f"'{name}' was not found in any snapshot")
+            index[name] = []
+            continue
+        candidates = {}
+        for nodes, target in labelled:
+            for candidate in generate_candidates(nodes, target):
+                candidates.setdefault(candidate.key, candidate)
+        for candidate in candidates.values():
+            hits = sum(1 for nodes, target in labelled if candidate.select(nodes) is target)
+            candidate.score = hits / len(labelled)
+        ranked = sorted((c for c in candidates.values() if c.score >= min_score),
+                        key=lambda c: (-c.score, KIND_COST[c.kind], str(c.value)))
+        index[name] = ranked
+        logger.info(f"'{name}': {len(ranked)} candidates from {len(labelled)} snapshots, best {ranked[:1]}")
+    return index
+
+
+class LocatorIndex:
+    """Ranked candidates of one page class, with runtime fallback and learning
+
+    Args:
+        path: JSON index file
+        entries: Logical element name -> ranked Candidate list
+    """
+
+    def __init__(self, path, entries=None):
+        self.path = path
+        self.entries = entries or {}
+        self.wins = {}
+        self.fallbacks = 0
+
+    @classmethod
+    def load(cls, path):
+        """Load an index file (an empty index if the file does not exist)"""
+        if not os.path.exists(path):
+            return cls(path)
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        entries = {name: [Candidate.from_dict(item) for item in items]
+                   for name, items in data.get("elements", {}).items()}
+        return cls(path, entries)
+
+    def save(self):
+        """Write the index, including the learned candidate order"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = {"version": INDEX_VERSION,
+                "elements": {name: [c.as_dict() for c in candidates] for name, candidates in self.entries.items()}}
+        with open(self.path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=2, ensure_ascii=False)
+
+    def __contains__(self, name):
+        return bool(self.entries.get(name))
+
+    def find(self, page, name):
+        """Locate a logical element with the best candidate that finds it
+
+        Args:
+            page: Page object (its query_elements() runs the lookups)
+            name: Logical element name
+
+        Returns:
+            WebElement: Located element, or None if no candidate found it
+        """
+        candidates = self.entries.get(name, [])
+        for position, candidate in enumerate(candidates):
+            by, value = candidate.locator
+            found = page.query_elements(by, value, ())
+            if len(found) != 1:
+                logger.debug(f"'{name}': {candidate!r} found {len(found)} elements")
+                continue
+            if position:
+                # Learn: the winner is tried first from now on
+                candidates.insert(0, candidates.pop(position))
+                self.fallbacks += 1
+                logger.info(f"'{name}': healed with {candidate!r}, promoted to first candidate")
+            self.wins[(name, candidate.key)] = self.wins.get((name, candidate.key), 0) + 1
+            return found[0][0]
+        logger.warning(f"'{name}': none of {len(candidates)} indexed locators matched")
+        return None
+
+
+def record_page_source(driver, directory):
+    """Save the current page source as a snapshot for build_index()
+
+    Returns:
+        str: Path of the saved snapshot
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{time.strftime('%Y%m%d_%H%M%S')}_{time.perf_counter_ns() % 1000000:06d}.xml")
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(driver.page_source)
+    return path
+
+
+def _page_class(name):
+    import pages.home_page  # noqa: F401  (registers the page classes)
+    import pages.shopping_list_page  # noqa: F401
+    from pages.base_page import BasePage
+
+    pending = list(BasePage.__subclasses__())
+    while pending:
+        cls = pending.pop()
+        if cls.__name__ == name:
+            return cls
+        pending.extend(cls.__subclasses__())
+    raise SystemExit(f"Unknown page class '{name}'")
+
+
+def main(argv=None):
+    from config.settings import get_settings
+
+    parser = argparse.ArgumentParser(description="Build a self-healing locator index from recorded page sources")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    build = subcommands.add_parser("build", help="Rank candidate locators from snapshots")
+    build.add_argument("page", help="Page class, e.g. ShoppingListPage")
+    build.add_argument("--snapshots", default=None, help="Snapshot directory (default: LOCATOR_SNAPSHOT_DIR/<page>)")
+    build.add_argument("--min-score", type=float, default=0.5)
+    build.add_argument("--keep-positional", action="store_true",
+                       help="Also index elements found only by class + instance")
+    args = parser.parse_args(argv)
+
+    settings = get_settings()
+    page_class = _page_class(args.page)
+    directory = args.snapshots or os.path.join(settings.LOCATOR_SNAPSHOT_DIR, args.page)
+    sources = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.xml"))):
+        with open(path, encoding="utf-8") as handle:
+            sources.append(handle.read())
+    if not sources:
+        raise SystemExit(f"No snapshots in {directory}")
+    entries = build_index(sources, page_class.HEALING_TARGETS, min_score=args.min_score)
+    if not args.keep_positional:
+        # A class + instance candidate is the same guess as the page's fallback heuristic,
+        # but a wrong one still finds an element, so it never falls back
+        positional = [name for name, candidates in entries.items()
+                      if all(c.kind == "instance" for c in candidates)]
+        for name in positional:
+            print(f"{name}: only positional candidates, left to the page's fallback")
+            del entries[name]
+        if not entries:
+            print("No element has a stable locator (accessibility id, resource id or text); no index written")
+            return 1
+    index = LocatorIndex(os.path.join(settings.LOCATOR_INDEX_DIR, f"{args.page}.json"), entries)
+    index.save()
+    for name, candidates in entries.items():
+        print(f"{name}: " + ", ".join(f"{c.kind}:{c.value} ({c.score:.0%})" for c in candidates))
+    print(f"Index written to {index.path} from {len(sources)} snapshots")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+"""
+Locator Strategies
+
+The locator strategy names used by the page objects, with the same values as
+appium.webdriver.common.appiumby.AppiumBy. Importing AppiumBy imports the
+appium.webdriver package, which loads the whole Appium/Selenium client
+(every browser driver included); page modules import these constants instead,
+so collecting tests costs nothing until a test actually starts a driver.
+"""
+
+
+class AppiumBy:
+    """Locator strategies understood by the Appium UiAutomator2 driver"""
+
+    ID = "id"
+    XPATH = "xpath"
+    NAME = "name"
+    CLASS_NAME = "class name"
+    ACCESSIBILITY_ID = "accessibility id"
+    ANDROID_UIAUTOMATOR = "-android uiautomator"
+    ANDROID_VIEWTAG = "-android viewtag"
+    ANDROID_DATA_MATCHER = "-android datamatcher"
+    ANDROID_VIEW_MATCHER = "-android viewmatcher"
+    IMAGE = "-image"
+    CUSTOM = "-custom"
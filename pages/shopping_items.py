@@ -0,0 +1,170 @@
+"""
+Typed Model for Shopping List Items
+
+The app renders every item as one View whose content-desc is
+'ItemName\\nx{quantity}'. This module parses those descriptions once into
+compact records instead of re-scanning raw strings in every test:
+- ShoppingItem - __slots__ record (name, quantity, index, bounds)
+- parse_item() - exact parser; the name may itself contain newlines or "x",
+  only the trailing '\\nx<digits>' is the quantity
+- ShoppingItems - ordered items with a name -> items index for O(1) exact lookup
+- assert_items() / assert_has_item() / assert_no_item() - test assertions
+  with readable failure messages
+"""
+import re
+
+ITEM_PATTERN = re.compile(r'(?P<name>.+)\nx(?P<quantity>\d+)', re.DOTALL)
+BOUNDS_PATTERN = re.compile(r'\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]')
+
+# Summary rows rendered below the list
+SUMMARY_PREFIXES = ("Total:", "Completed:")
+
+
+def parse_bounds(text):
+    """Parse UiAutomator2 bounds '[x1,y1][x2,y2]'
+
+    Returns:
+        tuple: (x1, y1, x2, y2), or None if text is not a bounds string
+    """
+    match = BOUNDS_PATTERN.fullmatch(text or "")
+    return tuple(int(value) for value in match.groups()) if match else None
+
+
+class ShoppingItem:
+    """One row of the shopping list
+
+    Attributes:
+        name: Item name exactly as entered (may contain newlines)
+        quantity: Item quantity
+        index: Position in the list (0-based, in the order read)
+        bounds: (x1, y1, x2, y2) on screen, or None if unknown
+    """
+
+    __slots__ = ("name", "quantity", "index", "bounds")
+
+    def __init__(self, name, quantity, index=0, bounds=None):
+        self.name = name
+        self.quantity = quantity
+        self.index = index
+        self.bounds = bounds
+
+    @property
+    def desc(self):
+        """content-desc as rendered by the app ('Name\\nx{quantity}')"""
+        return f"{self.name}\nx{self.quantity}"
+
+    def __eq__(self, other):
+        if isinstance(other, ShoppingItem):
+            return (self.name, self.quantity) == (other.name, other.quantity)
+        if isinstance(other, tuple):
+            return (self.name, self.quantity) == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.name, self.quantity))
+
+    def __repr__(self):
+        return f"ShoppingItem({self.name!r}, {self.quantity}, index={self.index})"
+
+
+def parse_item(desc, index=0, bounds=None):
+    """Parse a View content-desc into a ShoppingItem
+
+    Args:
+        desc: content-desc of the View
+        index: Position to record on the item
+        bounds: Optional bounds tuple or '[x1,y1][x2,y2]' string
+
+    Returns:
+        ShoppingItem: Parsed item, or None if desc is not an item row
+    """
+    if not desc or desc.startswith(SUMMARY_PREFIXES):
+        return None
+    match = ITEM_PATTERN.fullmatch(desc)
+    if not match:
+        return None
+    if isinstance(bounds, str):
+        bounds = parse_bounds(bounds)
+    return ShoppingItem(match.group("name"), int(match.group("quantity")), index, bounds)
+
+
+class ShoppingItems:
+    """Items of the list in display order, indexed by exact name
+
+    Args:
+        items: ShoppingItem objects in display order
+    """
+
+    __slots__ = ("items", "_by_name")
+
+    def __init__(self, items=()):
+        self.items = list(items)
+        self._by_name = {}
+        for item in self.items:
+            self._by_name.setdefault(item.name, []).append(item)
+
+    @classmethod
+    def from_descs(cls, descs):
+        """Build from raw content-desc strings, skipping non-item rows"""
+        parsed = (parse_item(desc) for desc in descs)
+        items = [item for item in parsed if item is not None]
+        for index, item in enumerate(items):
+            item.index = index
+        return cls(items)
+
+    def get(self, name):
+        """First item with exactly this name, or None"""
+        matches = self._by_name.get(name)
+        return matches[0] if matches else None
+
+    def all(self, name):
+        """Every item with exactly this name"""
+        return list(self._by_name.get(name, ()))
+
+    def count(self, name):
+        """Number of items with exactly this name"""
+        return len(self._by_name.get(name, ()))
+
+    def names(self):
+        return [item.name for item in self.items]
+
+    def descs(self):
+        return [item.desc for item in self.items]
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __repr__(self):
+        return f"ShoppingItems({[(item.name, item.quantity) for item in self.items]!r})"
+
+
+# --- Assertion helpers ----------------------------------------------------
+
+def assert_items(items, expected):
+    """Assert the list holds exactly these (name, quantity) pairs, in order"""
+    actual = [(item.name, item.quantity) for item in items]
+    assert actual == list(expected), f"Shopping list is {actual!r}, expected {list(expected)!r}"
+
+
+def assert_has_item(items, name, quantity=None):
+    """Assert an item with exactly this name (and quantity, if given) is in the list"""
+    matches = items.all(name)
+    assert matches, f"{name!r} not found in shopping list {items.names()!r}"
+    if quantity is not None:
+        assert any(item.quantity == quantity for item in matches), (
+            f"{name!r} has quantity {[item.quantity for item in matches]}, expected {quantity}"
+        )
+
+
+def assert_no_item(items, name):
+    """Assert no item with exactly this name is in the list"""
+    assert name not in items, f"{name!r} still in shopping list {items.names()!r}"
@@ -6,13 +6,39 @@ This page object represents the shopping list feature where users can:
 - View all items in the list
 - Delete items from the list
 - Check if list is empty
+- Stream items of lists longer than the screen (scrolling)
+- Open, reset and leave the screen (see plugins/screen_affinity.py)
 """
-from appium.webdriver.common.appiumby import AppiumBy
+from pages.locators import AppiumBy
+from selenium.common.exceptions import UnknownMethodException, WebDriverException
 from pages.base_page import BasePage
+from pages.home_page import HomePage
+from pages.shopping_items import BOUNDS_PATTERN, ShoppingItems, parse_item
 import logging
+import time
+import xml.etree.ElementTree as ET
 
 logger = logging.getLogger(__name__)
 
+SCROLL_GESTURE = 'mobile: scrollGesture'
+EDIT_TEXT = "android.widget.EditText"
+BUTTON = "android.widget.Button"
+
+
+# --- Locator index targets: identify logical elements in a recorded page source ---
+
+def _identify_edit_text(position):
+    def identify(nodes):
+        edit_texts = [node for node in nodes if node.get('class') == EDIT_TEXT]
+        return edit_texts[position] if len(edit_texts) >= 2 else None
+    return identify
+
+
+def _identify_add_button(nodes):
+    # The Add button is the first button that is not Back (item delete buttons follow it)
+    buttons = [node for node in nodes if node.get('class') == BUTTON and node.get('content-desc') != 'Back']
+    return buttons[0] if buttons else None
+
 
 class ShoppingListPage(BasePage):
     """Page object for the Shopping List page"""
@@ -23,6 +49,15 @@ class ShoppingListPage(BasePage):
     HEADER_TEXT = "Add items to your shopping list"
     NO_ITEMS_TEXT = "No items yet"
     
+    # Start screen name used by @pytest.mark.screen (see plugins/screen_affinity.py)
+    SCREEN = "shopping_list"
+    
+    HEALING_TARGETS = {
+        "name_field": _identify_edit_text(0),
+        "quantity_field": _identify_edit_text(1),
+        "add_button": _identify_add_button,
+    }
+    
     def __init__(self, driver):
         super().__init__(driver)
     
@@ -76,14 +111,62 @@ class ShoppingListPage(BasePage):
             logger.error(f"Shopping List page did not load: {e}")
             return False
     
+    @classmethod
+    def navigate(cls, driver):
+        """Open the Shopping List from the home page
+        
+        Args:
+            driver: Appium WebDriver on the home page
+            
+        Returns:
+            ShoppingListPage: Loaded page, or None if it could not be opened
+        """
+        home_page = HomePage(driver)
+        home_page.wait_for_home_page_load()
+        if not home_page.click_shopping_list_button():
+            logger.error("Failed to open Shopping List")
+            return None
+        page = cls(driver)
+        time.sleep(page.settings.NAVIGATION_DELAY)
+        return page if page.verify_page_loaded() else None
+    
+    def reset_screen(self):
+        """Return the screen to its freshly opened state: no items, empty input fields
+        
+        Returns:
+            bool: True if the screen was reset, False otherwise
+        """
+        items = self.get_shopping_items()
+        for _ in range(len(items)):
+            if not self.delete_item(items[0].name):
+                return False
+            items = self.get_shopping_items()
+        if items:
+            logger.warning(f"{len(items)} items left after reset")
+            return False
+        for position in (0, 1):
+            field = self._edit_text(position)
+            if field is not None:
+                field.clear()
+        logger.info("Shopping List reset")
+        return True
+    
+    def leave(self):
+        """Go back to the home page"""
+        self.driver.back()
+        time.sleep(self.settings.NAVIGATION_DELAY)
+    
     def add_item(self, item_name, quantity=1):
         """Add an item to the shopping list with specified name and quantity
         
         Process:
-        1. Click on item name field and enter name
-        2. Click on quantity field and enter quantity
+        1. Enter the name into the item name field
+        2. Enter the quantity into the quantity field
         3. Click Add button to add item to list
         
+        Text is entered with the fastest strategy that works for each field
+        (see BasePage.enter_text).
+        
         Args:
             item_name: Name of the item to add
             quantity: Quantity of the item (default: 1)
@@ -94,115 +177,271 @@ class ShoppingListPage(BasePage):
         try:
             logger.debug(f"Adding item: {item_name}, quantity: {quantity}")
             
-            # Find the EditText fields (index 0 is item name, index 1 is quantity)
-            edit_texts = self.driver.find_elements(AppiumBy.CLASS_NAME, "android.widget.EditText")
-            
-            if len(edit_texts) < 2:
+            # Locate the fields and the Add button through the locator index
+            # (falls back to the EditText order / "not Back" heuristics)
+            item_field = self.locate("name_field", lambda: self._edit_text(0))
+            quantity_field = self.locate("quantity_field", lambda: self._edit_text(1))
+            if item_field is None or quantity_field is None:
                 logger.error("Shopping list input fields not found")
                 return False
             
-            # Step 1: Click on first EditText and enter item name
-            item_field = edit_texts[0]
-            item_field.click()
-            logger.debug("Clicked on item name field")
-            item_field.clear()
-            item_field.send_keys(item_name)
-            logger.debug(f"Entered item name: {item_name}")
-            
-            # Step 2: Click on second EditText and change quantity
-            quantity_field = edit_texts[1]
-            quantity_field.click()
-            logger.debug("Clicked on quantity field")
-            quantity_field.clear()
-            quantity_field.send_keys(str(quantity))
-            logger.debug(f"Entered quantity: {quantity}")
-            
-            # Step 3: Find and click the Add button (skip Back button)
-            buttons = self.driver.find_elements(AppiumBy.CLASS_NAME, "android.widget.Button")
-            logger.debug(f"Found {len(buttons)} buttons total")
+            # Step 1: Enter item name
+            strategy = self.enter_text("name_field", item_field, item_name)
+            logger.debug(f"Entered item name: {item_name} ({strategy})")
             
-            add_clicked = False
-            for i, btn in enumerate(buttons):
-                try:
-                    desc = btn.get_attribute('content-desc')
-                    clickable = btn.get_attribute('clickable')
-                    logger.debug(f"  Button[{i}]: desc='{desc}', clickable={clickable}")
-                    # Skip the Back button - look for button that's NOT 'Back'
-                    if desc != 'Back' and desc != self.BACK_BUTTON:
-                        logger.info(f"Clicking Add button (button {i}: desc='{desc}')")
-                        btn.click()
-                        add_clicked = True
-                        break
-                except Exception as e:
-                    logger.debug(f"  Error with button {i}: {e}")
-                    continue
+            # Step 2: Enter quantity
+            strategy = self.enter_text("quantity_field", quantity_field, str(quantity))
+            logger.debug(f"Entered quantity: {quantity} ({strategy})")
             
-            if not add_clicked:
+            # Step 3: Click the Add button
+            add_button = self.locate("add_button", self._add_button_by_elimination)
+            if add_button is None:
                 logger.error("Could not find or click Add button")
                 return False
+            before = self._fingerprint_before_action(self.settings.ADD_ITEM_DELAY)
+            add_button.click()
             
             # Wait for item to be added
-            import time
-            time.sleep(2)
+            self._settle(self.settings.ADD_ITEM_DELAY, before)
             logger.info(f"[PASS] Successfully added item: {item_name} (quantity: {quantity})")
             return True
         except Exception as e:
             logger.error(f"Error adding shopping item: {e}")
             return False
     
-    def get_items(self):
-        """Get all items from the shopping list
+    def _fingerprint_before_action(self, delay):
+        """Screen fingerprint to wait for a change from, when settling by stability"""
+        if delay > 0 and self.settings.STABILITY_WAIT:
+            return self.screen_fingerprint()
+        return None
+    
+    def _settle(self, delay, before):
+        """Wait for the list to settle after an action
         
-        Items are displayed as View elements with content-desc format: 'ItemName\\nx{quantity}'
-        Example: 'Milk\\nx2' or 'Apple\\nx1' (where \\n is an actual newline character)
+        With STABILITY_WAIT the screen is sampled until it changed and stopped
+        changing, for at most `delay` seconds; otherwise sleeps `delay`.
+        """
+        if delay <= 0:
+            return
+        if self.settings.STABILITY_WAIT:
+            self.wait_until_stable(timeout=delay, since=before)
+        else:
+            time.sleep(delay)
+    
+    def _edit_text(self, position):
+        """EditText by position (index 0 is item name, index 1 is quantity)"""
+        edit_texts = self.driver.find_elements(AppiumBy.CLASS_NAME, EDIT_TEXT)
+        return edit_texts[position] if len(edit_texts) >= 2 else None
+    
+    def _add_button_by_elimination(self):
+        """First button that is not Back (the Add button precedes the item delete buttons)"""
+        buttons = self.query_elements(AppiumBy.CLASS_NAME, BUTTON, ('content-desc',))
+        logger.debug(f"Found {len(buttons)} buttons total")
+        for button, attributes in buttons:
+            if attributes['content-desc'] != self.BACK_BUTTON:
+                return button
+        return None
+    
+    def _is_item_desc(self, desc):
+        """Check if a View content-desc looks like a shopping list item
+        
+        Item entries have format 'ItemName\nx{quantity}' where \n is an actual newline
+        (see pages/shopping_items.py). Page labels, the Back button and the
+        Total/Completed summaries are excluded.
+        """
+        excluded_descs = [
+            self.TITLE,
+            self.HEADER_TEXT,
+            self.NO_ITEMS_TEXT,
+            self.BACK_BUTTON,
+            "null",
+            "",
+            None
+        ]
+        if desc in excluded_descs:
+            return False
+        return parse_item(desc) is not None
+    
+    def get_shopping_items(self):
+        """Get all items currently rendered in the shopping list as typed records
+        
+        Only rows inside the viewport are returned; use iter_items() for lists
+        longer than the screen.
         
         Returns:
-            list: List of item strings in format 'ItemName\\nx{quantity}', or empty list if no items
+            ShoppingItems: Items in display order with an exact name index, empty if no items
         """
         try:
             logger.debug("Retrieving shopping list items")
             
-            # Look for item entries - items are View elements with specific content-desc pattern
-            items = []
-            excluded_descs = [
-                self.TITLE,
-                self.HEADER_TEXT, 
-                self.NO_ITEMS_TEXT,
-                self.BACK_BUTTON,
-                "null",
-                "",
-                None
-            ]
-            
-            all_views = self.driver.find_elements(AppiumBy.CLASS_NAME, "android.view.View")
+            # One batch query returns every View with its content-desc and bounds
+            all_views = self.query_elements(AppiumBy.CLASS_NAME, "android.view.View", ('content-desc', 'bounds'))
             logger.debug(f"Total Views found: {len(all_views)}")
             
-            for view in all_views:
-                try:
-                    desc = view.get_attribute('content-desc')
-                    if desc:
-                        logger.debug(f"  View desc: '{desc}'")
-                    
-                    # Item entries have format 'ItemName\nx{quantity}' where \n is actual newline
-                    # Check if desc contains newline and 'x' pattern (not in excluded list)
-                    if desc and desc not in excluded_descs:
-                        # Filter out Total and Completed views
-                        if 'Total:' not in desc and 'Completed:' not in desc:
-                            # Check if it looks like an item (contains newline and x followed by number)
-                            if '\n' in desc and 'x' in desc.lower():
-                                items.append(desc)
-                                logger.info(f"  ✓ FOUND ITEM: {repr(desc)}")
-                except Exception as e:
-                    logger.debug(f"  Error checking view: {e}")
+            items = []
+            for view, attributes in all_views:
+                desc = attributes['content-desc']
+                if not self._is_item_desc(desc):
                     continue
+                item = parse_item(desc, index=len(items), bounds=attributes.get('bounds'))
+                items.append(item)
+                logger.info(f"  ✓ FOUND ITEM: {item!r}")
             
             logger.info(f"Found {len(items)} items in shopping list")
             if len(items) == 0:
                 logger.warning("No items found - check if item format has changed")
-            return items
+            return ShoppingItems(items)
         except Exception as e:
             logger.error(f"Error getting shopping list items: {e}")
-            return []
+            return ShoppingItems()
+    
+    def get_items(self):
+        """Get all items currently rendered in the shopping list
+        
+        Items are displayed as View elements with content-desc format: 'ItemName\\nx{quantity}'
+        Example: 'Milk\\nx2' or 'Apple\\nx1' (where \\n is an actual newline character)
+        
+        Returns:
+            list: List of item strings in format 'ItemName\\nx{quantity}', or empty list if no items
+        """
+        return self.get_shopping_items().descs()
+    
+    def iter_items(self, max_swipes=50, scroll_percent=0.75):
+        """Yield every item in the shopping list, scrolling through long lists
+        
+        Items are yielded lazily in list order, so callers can stop early without
+        paying for further scrolls. Each viewport is read from a single page_source
+        call. Rows visible in two consecutive viewports are yielded once: the
+        overlap is matched by item text and a consistent shift of the bounds of
+        its fully visible rows.
+        
+        Scrolling uses 'mobile: scrollGesture', falling back to a W3C swipe when
+        the driver does not support it. Iteration stops when the gesture reports
+        the end of the list or the viewport no longer changes.
+        
+        Args:
+            max_swipes: Safety limit on the number of scrolls
+            scroll_percent: Fraction of the list area to scroll per swipe
+            
+        Yields:
+            str: Item strings in format 'ItemName\nx{quantity}'
+        """
+        previous = []
+        expected_shift = None
+        at_end = False
+        swipes = 0
+        while True:
+            viewport = self._viewport_items(self.driver.page_source)
+            new_items = self._new_viewport_items(previous, viewport, expected_shift)
+            logger.debug(f"Viewport {swipes}: {len(viewport)} items, {len(new_items)} new")
+            for desc, _ in new_items:
+                yield desc
+            
+            if at_end or not viewport or viewport == previous:
+                return
+            if swipes >= max_swipes:
+                logger.warning(f"Stopped scrolling after {max_swipes} swipes - list may be longer")
+                return
+            
+            area = self._list_area(viewport)
+            expected_shift = area[3] * scroll_percent
+            at_end = not self._scroll_item_list(area, scroll_percent)
+            previous = viewport
+            swipes += 1
+    
+    def _viewport_items(self, page_source):
+        """Parse item rows from one page source
+        
+        Args:
+            page_source: UiAutomator2 XML page source
+            
+        Returns:
+            list: (desc, (x1, y1, x2, y2)) tuples in document order, without duplicates
+        """
+        rows = []
+        seen = set()
+        for node in ET.fromstring(page_source).iter('android.view.View'):
+            desc = node.get('content-desc')
+            match = BOUNDS_PATTERN.fullmatch(node.get('bounds', ''))
+            if not match or not self._is_item_desc(desc):
+                continue
+            row = (desc, tuple(int(value) for value in match.groups()))
+            # Nested semantics nodes can repeat the same row
+            if row not in seen:
+                seen.add(row)
+                rows.append(row)
+        return rows
+    
+    def _new_viewport_items(self, previous, current, expected_shift=None):
+        """Return rows of the current viewport that were not in the previous one
+        
+        The overlap is the longest run of rows at the end of the previous viewport
+        whose texts match the start of the current one and whose fully visible rows
+        all moved by the same amount. Rows cut by the viewport edges have clipped
+        bounds, so only rows with the same height in both viewports are compared.
+        When several overlaps fit (e.g. repeated item names), the one whose shift is
+        closest to the requested scroll distance wins; an overlap of clipped rows
+        only, whose shift is unknown, ranks after those.
+        """
+        candidates = []
+        for size in range(min(len(previous), len(current)), 0, -1):
+            tail, head = previous[-size:], current[:size]
+            if [desc for desc, _ in tail] != [desc for desc, _ in head]:
+                continue
+            shifts = {old[1] - new[1] for (_, old), (_, new) in zip(tail, head)
+                      if old[3] - old[1] == new[3] - new[1]}
+            if len(shifts) <= 1:
+                candidates.append((size, shifts.pop() if shifts else None))
+        
+        if not candidates:
+            return current
+        if expected_shift is None:
+            size = candidates[0][0]
+        else:
+            size = min(candidates, key=lambda candidate: (candidate[1] is None,
+                                                          abs((candidate[1] or 0) - expected_shift)))[0]
+        return current[size:]
+    
+    def _list_area(self, viewport):
+        """Bounding box (left, top, width, height) of the visible item rows"""
+        left = min(bounds[0] for _, bounds in viewport)
+        top = min(bounds[1] for _, bounds in viewport)
+        right = max(bounds[2] for _, bounds in viewport)
+        bottom = max(bounds[3] for _, bounds in viewport)
+        return left, top, right - left, bottom - top
+    
+    def _scroll_item_list(self, area, percent):
+        """Scroll the item list down by a fraction of its visible area
+        
+        Args:
+            area: (left, top, width, height) of the list
+            percent: Fraction of the area height to scroll
+            
+        Returns:
+            bool: False if the list reported it cannot scroll further, True otherwise
+        """
+        left, top, width, height = area
+        try:
+            gesture_available = self.driver.assert_extension_exists(SCROLL_GESTURE) is not None
+        except UnknownMethodException:
+            gesture_available = False
+        
+        if gesture_available:
+            try:
+                return bool(self.driver.execute_script(SCROLL_GESTURE, {
+                    'left': left, 'top': top, 'width': width, 'height': height,
+                    'direction': 'down', 'percent': percent,
+                }))
+            except WebDriverException as e:
+                logger.info(f"scrollGesture unavailable, falling back to W3C swipe: {e.msg}")
+                self.driver.mark_extension_absence(SCROLL_GESTURE)
+        
+        # W3C pointer swipe from the bottom of the area upwards
+        x = left + width // 2
+        start_y = top + int(height * (0.5 + percent / 2))
+        end_y = start_y - int(height * percent)
+        self.driver.swipe(x, start_y, x, end_y, 400)
+        return True
     
     def is_empty(self):
         """Check if shopping list is empty by looking for 'No items yet' message
@@ -236,7 +475,7 @@ class ShoppingListPage(BasePage):
         6. Verify deletion
         
         Args:
-            item_name: Name of the item to delete
+            item_name: Exact name of the item to delete; with duplicates the first one is deleted
             
         Returns:
             bool: True if item deleted successfully, False otherwise
@@ -244,39 +483,35 @@ class ShoppingListPage(BasePage):
         try:
             logger.debug(f"Attempting to delete item: {item_name}")
             
-            # Get all items to find the index of the target item
-            items = self.get_items()
+            # Get all items to find the index of the target item (exact name match)
+            items = self.get_shopping_items()
             logger.debug(f"Current items in list: {items}")
             
             if not items:
                 logger.warning(f"No items found in shopping list")
                 return False
             
-            # Find the index of our target item
-            target_item_index = -1
-            for idx, item_desc in enumerate(items):
-                if item_name in item_desc:
-                    target_item_index = idx
-                    logger.debug(f"Target item '{item_name}' is at position {idx} in the list")
-                    break
-            
-            if target_item_index == -1:
+            target = items.get(item_name)
+            if target is None:
                 logger.warning(f"Item '{item_name}' not found in shopping list")
                 return False
+            target_item_index = target.index
+            logger.debug(f"Target item '{item_name}' is at position {target_item_index} in the list")
             
             # Use UIAutomator selector to find all buttons
             try:
-                all_buttons = self.driver.find_elements(
+                all_buttons = self.query_elements(
                     AppiumBy.ANDROID_UIAUTOMATOR,
-                    'new UiSelector().className("android.widget.Button")'
+                    'new UiSelector().className("android.widget.Button")',
+                    ('content-desc',)
                 )
                 
                 logger.debug(f"Found {len(all_buttons)} buttons via UIAutomator")
                 
                 # Filter out the Back button to get Add and delete buttons
                 delete_buttons = []
-                for btn in all_buttons:
-                    desc = btn.get_attribute('content-desc')
+                for btn, attributes in all_buttons:
+                    desc = attributes['content-desc']
                     if desc != 'Back' and desc != self.BACK_BUTTON:
                         delete_buttons.append(btn)
                         logger.debug(f"  Delete button candidate: desc='{desc}'")
@@ -290,14 +525,14 @@ class ShoppingListPage(BasePage):
                 if delete_button_index < len(delete_buttons):
                     delete_btn = delete_buttons[delete_button_index]
                     logger.info(f"Clicking delete button at index {delete_button_index} for item '{item_name}'")
+                    before = self._fingerprint_before_action(self.settings.DELETE_ITEM_DELAY)
                     delete_btn.click()
                     
-                    import time
-                    time.sleep(1)
+                    self._settle(self.settings.DELETE_ITEM_DELAY, before)
                     
-                    # Verify deletion
-                    items_after = self.get_items()
-                    if item_name not in str(items_after):
+                    # Verify deletion (one fewer item with this exact name)
+                    items_after = self.get_shopping_items()
+                    if items_after.count(item_name) < items.count(item_name):
                         logger.info(f"[PASS] Successfully deleted item: {item_name}")
                         return True
                     else:
@@ -0,0 +1,135 @@
+"""
+Screen Stability Detection
+
+Flutter keeps animating for a while after a tap (list rows slide in, buttons
+ripple), so a fixed sleep after an action is either too long or too short.
+Instead the screen is sampled until it stops changing:
+- A sample is a fingerprint of the page source: a CRC32 of the XML with
+  volatile attributes (e.g. focused) removed, so blinking state that is not
+  layout does not count as movement
+- The screen is stable once N consecutive samples have the same fingerprint
+  (optionally only after it first differed from a fingerprint taken before
+  the action, so a frame that has not rendered the tap yet is not mistaken
+  for a settled screen)
+- The interval between samples starts short, grows while samples match and
+  drops back to the minimum when the screen changes; a screen that is known
+  to animate for a while is first sampled after its usual settle time
+- Settle time, samples and timeouts are kept per screen (ScreenStats)
+"""
+import re
+import time
+import zlib
+
+
+def volatile_pattern(names):
+    """Compile a regex removing the given attributes from a page source
+
+    Args:
+        names: Attribute names, e.g. ('focused', 'selected')
+
+    Returns:
+        re.Pattern: Pattern matching ' name="value"' for any of the names, or None
+    """
+    names = [name for name in names if name]
+    if not names:
+        return None
+    return re.compile(r'\s(?:%s)="[^"]*"' % "|".join(re.escape(name) for name in names))
+
+
+def fingerprint(source, pattern=None):
+    """Cheap fingerprint of a page source
+
+    Args:
+        source: Page source XML
+        pattern: Optional compiled volatile_pattern()
+
+    Returns:
+        int: CRC32 of the source without volatile attributes
+    """
+    if pattern is not None:
+        source = pattern.sub("", source)
+    return zlib.crc32(source.encode("utf-8"))
+
+
+class ScreenStats:
+    """Stability statistics of one screen"""
+
+    def __init__(self):
+        self.waits = 0
+        self.timeouts = 0
+        self.samples = 0
+        self.total_settle = 0.0
+        self.max_settle = 0.0
+
+    def record(self, settle, samples, stable):
+        self.waits += 1
+        self.samples += samples
+        self.timeouts += 0 if stable else 1
+        self.total_settle += settle
+        self.max_settle = max(self.max_settle, settle)
+
+    @property
+    def mean_settle(self):
+        return self.total_settle / self.waits if self.waits else 0.0
+
+    def summary(self):
+        return {
+            "waits": self.waits,
+            "timeouts": self.timeouts,
+            "mean_settle_ms": round(self.mean_settle * 1000, 1),
+            "max_settle_ms": round(self.max_settle * 1000, 1),
+            "samples_per_wait": round(self.samples / self.waits, 1) if self.waits else 0.0,
+        }
+
+
+def wait_until_stable(sample, stats=None, matches=3, timeout=5.0, min_interval=0.05, max_interval=0.5,
+                      since=None, growth=1.5, clock=time.monotonic, sleep=time.sleep):
+    """Sample a screen until `matches` consecutive fingerprints are equal
+
+    Args:
+        sample: Callable returning the current fingerprint
+        stats: Optional ScreenStats to record the wait in (also seeds the first interval)
+        matches: Consecutive equal samples that count as stable
+        timeout: Give up after this many seconds
+        min_interval: Shortest pause between samples (used after a change)
+        max_interval: Longest pause between samples
+        since: Fingerprint from before the action; samples equal to it do not count
+        growth: Factor the pause grows by after each matching sample
+        clock: Time source (seconds)
+        sleep: Sleep function
+
+    Returns:
+        tuple: (stable, settle seconds until the last change, samples taken)
+    """
+    start = clock()
+    last = sample()
+    samples = 1
+    run = 0 if last == since else 1
+    settled_at = start
+    interval = min_interval
+    if stats is not None and stats.waits:
+        # Skip sampling through the part of the animation this screen usually shows
+        interval = min(max(stats.mean_settle, min_interval), max_interval)
+
+    stable = run >= matches
+    while not stable:
+        remaining = timeout - (clock() - start)
+        if remaining <= 0:
+            break
+        sleep(min(interval, remaining))
+        current = sample()
+        samples += 1
+        if current == last and current != since:
+            run += 1
+            interval = min(interval * growth, max_interval)
+        else:
+            run = 0 if current == since else 1
+            settled_at = clock()
+            interval = min_interval
+        last = current
+        stable = run >= matches
+
+    settle = settled_at - start
+    if stats is not None:
+        stats.record(settle, samples, stable)
+    return stable, settle, samples
@@ -0,0 +1,205 @@
+"""
+Text Entry Strategies
+
+Ways to put text into an input field, from cheapest to most compatible:
+- set_value: 'mobile: replaceElementValue' replaces the field text in one
+  command, without key events
+- type: focus and clear the field, then 'mobile: type' sends the whole text
+  as one key event sequence
+- paste: 'mobile: setClipboard', focus and clear the field, then the PASTE key
+- send_keys: click, clear and send_keys (the classic path; injects the text
+  key by key on the device)
+
+TextEntry picks a strategy per logical field. Each strategy's first use on a
+field is verified by reading the field text back once; a strategy that raises
+or leaves different text is dropped for that field and the next one is tried
+in the same call. Only "unsupported" errors drop a strategy; other driver
+errors (a stale element, a timeout) skip it for the current call only.
+Latency is recorded per field and strategy and modelled as a
+fixed cost plus a cost per character, so once every strategy has been measured
+the fastest one for the length of the text at hand is used.
+"""
+import base64
+import logging
+import time
+from selenium.common.exceptions import InvalidArgumentException, UnknownMethodException, WebDriverException
+
+logger = logging.getLogger(__name__)
+
+KEYCODE_PASTE = 279
+
+
+class TextEntryError(Exception):
+    """Raised when no strategy could enter the text into a field"""
+
+
+def _focus_and_clear(element):
+    element.click()
+    element.clear()
+
+
+def set_value(driver, element, text):
+    driver.execute_script("mobile: replaceElementValue", {"elementId": element.id, "text": text})
+
+
+def type_text(driver, element, text):
+    _focus_and_clear(element)
+    driver.execute_script("mobile: type", {"text": text})
+
+
+def paste(driver, element, text):
+    content = base64.b64encode(text.encode("utf-8")).decode("ascii")
+    driver.execute_script("mobile: setClipboard", {"content": content, "contentType": "plaintext"})
+    _focus_and_clear(element)
+    driver.execute_script("mobile: pressKey", {"keycode": KEYCODE_PASTE})
+
+
+def send_keys(driver, element, text):
+    _focus_and_clear(element)
+    element.send_keys(text)
+
+
+STRATEGIES = {
+    "set_value": set_value,
+    "type": type_text,
+    "paste": paste,
+    "send_keys": send_keys,
+}
+
+
+class StrategyStats:
+    """Latency samples of one strategy on one field (least-squares fit over text length)"""
+
+    def __init__(self):
+        self.count = 0
+        self.verified = False
+        self._sum_x = self._sum_y = self._sum_xx = self._sum_xy = 0.0
+
+    def add(self, length, seconds):
+        self.count += 1
+        self._sum_x += length
+        self._sum_y += seconds
+        self._sum_xx += length * length
+        self._sum_xy += length * seconds
+
+    @property
+    def mean(self):
+        return self._sum_y / self.count if self.count else 0.0
+
+    def predict(self, length):
+        """Expected seconds to enter a text of this length"""
+        if not self.count:
+            return 0.0
+        mean_x = self._sum_x / self.count
+        variance = self._sum_xx / self.count - mean_x * mean_x
+        if variance <= 0:
+            return self.mean
+        slope = (self._sum_xy / self.count - mean_x * self.mean) / variance
+        return max(self.mean + max(slope, 0.0) * (length - mean_x), 0.0)
+
+
+class FieldEntry:
+    """Strategy choice and statistics of one logical field"""
+
+    def __init__(self, order):
+        self.order = list(order)
+        self.stats = {name: StrategyStats() for name in self.order}
+        self.broken = {}  # Strategy name -> reason it was dropped
+
+    def candidates(self, text, probes):
+        """Usable strategies, in the order to try them for this text"""
+        usable = [name for name in self.order if name not in self.broken]
+        unmeasured = [name for name in usable if self.stats[name].count < probes]
+        if unmeasured:
+            # Still measuring: try the next unmeasured strategy, then the rest by preference
+            return unmeasured[:1] + [name for name in usable if name != unmeasured[0]]
+        return sorted(usable, key=lambda name: self.stats[name].predict(len(text)))
+
+    def best(self, length=10):
+        usable = [name for name in self.order if name not in self.broken and self.stats[name].count]
+        return min(usable, key=lambda name: self.stats[name].predict(length)) if usable else None
+
+
+class TextEntry:
+    """Enter text into fields with the fastest strategy that works on each field
+
+    Args:
+        order: Strategy names in order of preference (see STRATEGIES)
+        probes: Timed uses of each strategy on a field before choosing by latency
+        clock: Time source (seconds)
+    """
+
+    def __init__(self, order=tuple(STRATEGIES), probes=1, clock=time.perf_counter):
+        unknown = [name for name in order if name not in STRATEGIES]
+        if unknown:
+            raise ValueError(f"Unknown text entry strategies: {unknown}")
+        self.order = tuple(order)
+        self.probes = probes
+        self.clock = clock
+        self.fields = {}
+
+    def field(self, key):
+        if key not in self.fields:
+            self.fields[key] = FieldEntry(self.order)
+        return self.fields[key]
+
+    def enter(self, driver, key, element, text):
+        """Replace the text of a field
+
+        Args:
+            driver: WebDriver of the session
+            key: Logical field name statistics are kept under (e.g. 'ShoppingListPage.name_field')
+            element: WebElement of the input field
+            text: Text to enter
+
+        Returns:
+            str: Name of the strategy that entered the text
+
+        Raises:
+            TextEntryError: If every strategy failed on this field
+        """
+        text = str(text)
+        field = self.field(key)
+        errors = {}
+        for name in field.candidates(text, self.probes):
+            stats = field.stats[name]
+            start = self.clock()
+            try:
+                STRATEGIES[name](driver, element, text)
+            except (UnknownMethodException, InvalidArgumentException) as e:
+                # The driver does not support the script: never try it on this field again
+                field.broken[name] = e.msg or type(e).__name__
+                logger.info(f"Text entry '{name}' unavailable for {key}: {field.broken[name]}")
+                continue
+            except WebDriverException as e:
+                errors[name] = e.msg or type(e).__name__
+                logger.info(f"Text entry '{name}' failed for {key}, trying the next strategy: {errors[name]}")
+                continue
+            elapsed = self.clock() - start
+            if not stats.verified:
+                actual = element.get_attribute("text")
+                if actual != text:
+                    field.broken[name] = f"field read {actual!r} instead of {text!r}"
+                    logger.info(f"Text entry '{name}' dropped for {key}: {field.broken[name]}")
+                    continue
+                stats.verified = True
+            stats.add(len(text), elapsed)
+            logger.debug(f"Entered {len(text)} characters into {key} with '{name}' in {elapsed * 1000:.1f} ms")
+            return name
+        raise TextEntryError(f"No text entry strategy worked for {key}: {dict(field.broken, **errors)}")
+
+    def stats(self):
+        """Per-field summary
+
+        Returns:
+            dict: Field key -> {'best', 'strategies': {name: {'count', 'mean_ms'}}, 'broken'}
+        """
+        return {
+            key: {
+                "best": field.best(),
+                "strategies": {name: {"count": stats.count, "mean_ms": round(stats.mean * 1000, 2)}
+                               for name, stats in field.stats.items() if stats.count},
+                "broken": dict(field.broken),
+            }
+            for key, field in self.fields.items()
+        }
@@ -0,0 +1,174 @@
+"""
+Visual Check Engine for screenshot-based page verification
+
+This module checks several screen regions with a single screenshot instead of
+one element lookup per region:
+- Screenshots are decoded once into a NumPy grayscale array
+- Every registered region is reduced to an 8x8 average hash in one batch
+  (via an integral image, so the cost does not grow with region size)
+- Hashes are compared against a stored baseline using Hamming distance
+
+Baselines are JSON files holding each region's bounds and hash. They are
+recorded once per device/screen with BasePage.capture_visual_baseline().
+"""
+import io
+import json
+import logging
+import os
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+HASH_SIZE = 8  # Hash grid is HASH_SIZE x HASH_SIZE cells (64 bits)
+
+
+class VisualRegion:
+    """A named screen region with its baseline perceptual hash"""
+
+    __slots__ = ("name", "bounds", "hash_bits")
+
+    def __init__(self, name, bounds, hash_bits=None):
+        """Initialize VisualRegion
+
+        Args:
+            name: Logical region name (e.g. "Web Search")
+            bounds: Tuple (x, y, width, height) in screenshot pixels
+            hash_bits: Optional baseline hash as a flat boolean array
+        """
+        self.name = name
+        self.bounds = tuple(int(v) for v in bounds)
+        self.hash_bits = hash_bits
+
+    def to_dict(self):
+        """Serialize region for a baseline file"""
+        return {
+            "bounds": list(self.bounds),
+            "hash": hash_to_hex(self.hash_bits),
+        }
+
+    @classmethod
+    def from_dict(cls, name, data):
+        """Build region from a baseline file entry"""
+        return cls(name, data["bounds"], hex_to_hash(data["hash"]))
+
+
+def hash_to_hex(hash_bits):
+    """Encode a boolean hash array as a hex string"""
+    return np.packbits(hash_bits.astype(np.uint8)).tobytes().hex()
+
+
+def hex_to_hash(value):
+    """Decode a hex string produced by hash_to_hex()"""
+    packed = np.frombuffer(bytes.fromhex(value), dtype=np.uint8)
+    return np.unpackbits(packed)[:HASH_SIZE * HASH_SIZE].astype(bool)
+
+
+def decode_screenshot(png_bytes):
+    """Decode PNG screenshot bytes into a grayscale float array
+
+    Args:
+        png_bytes: Raw PNG data (e.g. driver.get_screenshot_as_png())
+
+    Returns:
+        numpy.ndarray: Array of shape (height, width), values 0-255
+    """
+    with Image.open(io.BytesIO(png_bytes)) as image:
+        return np.asarray(image.convert("L"), dtype=np.float64)
+
+
+def compute_hashes(image, bounds_list):
+    """Compute average hashes for many regions of one image in a single pass
+
+    Each region is split into an 8x8 grid; a bit is set when the cell mean
+    is above the region mean. Cell sums come from one integral image, so
+    all regions are hashed with a handful of vectorized operations.
+
+    Args:
+        image: Grayscale array from decode_screenshot()
+        bounds_list: Sequence of (x, y, width, height) tuples
+
+    Returns:
+        numpy.ndarray: Boolean array of shape (len(bounds_list), 64)
+    """
+    if not bounds_list:
+        return np.zeros((0, HASH_SIZE * HASH_SIZE), dtype=bool)
+
+    height, width = image.shape
+    integral = np.zeros((height + 1, width + 1), dtype=np.float64)
+    integral[1:, 1:] = image.cumsum(axis=0).cumsum(axis=1)
+
+    bounds = np.asarray(bounds_list, dtype=np.float64)
+    x0 = np.clip(bounds[:, 0], 0, width)
+    y0 = np.clip(bounds[:, 1], 0, height)
+    x1 = np.clip(bounds[:, 0] + bounds[:, 2], 0, width)
+    y1 = np.clip(bounds[:, 1] + bounds[:, 3], 0, height)
+
+    # Cell edges for every region: shape (regions, HASH_SIZE + 1)
+    steps = np.linspace(0.0, 1.0, HASH_SIZE + 1)
+    xs = np.rint(x0[:, None] + (x1 - x0)[:, None] * steps).astype(int)
+    ys = np.rint(y0[:, None] + (y1 - y0)[:, None] * steps).astype(int)
+
+    # Broadcast to (regions, rows, cols) corner lookups
+    top, bottom = ys[:, :-1, None], ys[:, 1:, None]
+    left, right = xs[:, None, :-1], xs[:, None, 1:]
+    sums = (integral[bottom, right] - integral[top, right]
+            - integral[bottom, left] + integral[top, left])
+    areas = np.maximum((bottom - top) * (right - left), 1)
+    means = (sums / areas).reshape(len(bounds_list), -1)
+
+    return means > means.mean(axis=1, keepdims=True)
+
+
+def load_baseline(path):
+    """Load baseline regions from a JSON file
+
+    Args:
+        path: Baseline file path
+
+    Returns:
+        dict: Region name -> VisualRegion, or empty dict if file is missing
+    """
+    if not os.path.exists(path):
+        logger.debug(f"No visual baseline at {path}")
+        return {}
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    return {name: VisualRegion.from_dict(name, entry) for name, entry in data.items()}
+
+
+def save_baseline(path, regions):
+    """Write baseline regions to a JSON file
+
+    Args:
+        path: Baseline file path (parent directories are created)
+        regions: Iterable of VisualRegion with hash_bits set
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    data = {region.name: region.to_dict() for region in regions}
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(data, handle, indent=2, sort_keys=True)
+    logger.info(f"Saved visual baseline with {len(data)} regions to {path}")
+
+
+def compare_regions(image, regions, tolerance):
+    """Compare regions in an image against their baseline hashes
+
+    Args:
+        image: Grayscale array from decode_screenshot()
+        regions: Sequence of VisualRegion with hash_bits set
+        tolerance: Maximum number of differing hash bits (0-64) to accept
+
+    Returns:
+        dict: Region name -> Hamming distance to the baseline hash
+    """
+    if not regions:
+        return {}
+    current = compute_hashes(image, [region.bounds for region in regions])
+    expected = np.stack([region.hash_bits for region in regions])
+    distances = np.count_nonzero(current != expected, axis=1)
+    for region, distance in zip(regions, distances):
+        status = "match" if distance <= tolerance else "MISMATCH"
+        logger.debug(f"  Region '{region.name}': distance={distance} ({status})")
+    return {region.name: int(distance) for region, distance in zip(regions, distances)}
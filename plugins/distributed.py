@@ -0,0 +1,297 @@
+"""
+Multi-Host Distributed Runs
+
+Scales a run out over devices attached to several machines. One coordinator
+collects the test IDs and serves them from a work queue (utils/work_queue.py);
+a worker agent on each host is an ordinary pytest run with --coordinator that
+collects the same tests, then pulls batches of test IDs, runs them against its
+own APPIUM_SERVER / device settings and streams each result back:
+- Batches shrink as the queue drains; an idle worker steals the unstarted half
+  of the largest other batch
+- Workers heartbeat from a background thread; a dead worker's tests are
+  requeued and the test it was running is retried elsewhere
+- The coordinator prints a summary and exits 1 if any test failed
+
+Usage:
+    # Coordinator (reachable by all hosts)
+    python -m plugins.distributed coordinator --host 0.0.0.0 --port 8700 tests/
+    # On each host, with that host's device settings
+    pytest tests/ --coordinator http://coordinator:8700 --appium-profile host.toml
+
+    # Several workers against fake Appium servers on one machine
+    python -m plugins.distributed demo --workers 3 --kill-after 4 tests/
+"""
+import argparse
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+
+import pytest
+
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class DistributedWorker:
+    """Replaces the run loop of a pytest process with tests pulled from a coordinator
+
+    Args:
+        client: CoordinatorClient of the run
+        name: Worker name (defaults to the host name)
+        heartbeat_interval: Seconds between heartbeats
+    """
+
+    def __init__(self, client, name, heartbeat_interval=5.0):
+        self.client = client
+        self.name = name
+        self.heartbeat_interval = heartbeat_interval
+        self._reports = []
+        self._stop = threading.Event()
+
+    def _heartbeat(self):
+        while not self._stop.wait(self.heartbeat_interval):
+            try:
+                if not self.client.heartbeat():
+                    logger.warning(f"Coordinator declared worker {self.client.worker} dead")
+            except OSError as e:
+                logger.debug(f"Heartbeat failed: {e}")
+
+    def _lease(self, queue, block):
+        """Add the next batch to queue; False once the coordinator has nothing left"""
+        while True:
+            reply = self.client.lease()
+            if reply.get("tests"):
+                queue.extend(reply["tests"])
+                return True
+            if reply.get("done"):
+                return False
+            if not block:
+                return True
+            time.sleep(reply["wait"])
+
+    def _result(self, nodeid):
+        failed = [r for r in self._reports if r.failed]
+        if failed:
+            outcome = "error" if failed[0].when != "call" else "failed"
+            longrepr = str(failed[0].longrepr)
+        else:
+            outcome = "skipped" if any(r.skipped for r in self._reports) else "passed"
+            longrepr = None
+        duration = sum(r.duration for r in self._reports)
+        return {"nodeid": nodeid, "outcome": outcome, "duration": round(duration, 3), "longrepr": longrepr}
+
+    def pytest_runtest_logreport(self, report):
+        self._reports.append(report)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        if session.testsfailed and not session.config.option.continue_on_collection_errors:
+            raise session.Interrupted(f"{session.testsfailed} errors during collection")
+        if session.config.option.collectonly:
+            return True
+
+        items = {item.nodeid: item for item in session.items}
+        settings = get_settings()
+        self.client.register(self.name, socket.gethostname(), settings.APPIUM_SERVER)
+        logger.info(f"Worker {self.client.worker} pulling tests from {self.client.url}")
+        heartbeat = threading.Thread(target=self._heartbeat, name="worker-heartbeat", daemon=True)
+        heartbeat.start()
+        queue = deque()
+        try:
+            while queue or self._lease(queue, block=True):
+                nodeid = queue.popleft()
+                if not self.client.start(nodeid):
+                    continue  # Stolen by another worker or requeued
+                item = items.get(nodeid)
+                if item is None:
+                    self.client.report({"nodeid": nodeid, "outcome": "error", "duration": 0.0,
+                                        "longrepr": f"Not collected on worker {self.client.worker}"})
+                    continue
+                if not queue:
+                    # Prefetch so session fixtures are kept for the next test instead of torn down
+                    self._lease(queue, block=False)
+                nextitem = items.get(queue[0]) if queue else None
+                self._reports = []
+                # Through the hook, so logstart/logfinish and plugins wrapping the protocol
+                # (timeline spans, dashboard test events, screen affinity) see every test
+                item.ihook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+                self.client.report(self._result(nodeid))
+                if session.shouldfail or session.shouldstop:
+                    break
+        finally:
+            self._stop.set()
+            try:
+                self.client.leave()
+            except OSError as e:
+                logger.warning(f"Could not leave the coordinator: {e}")
+        return True
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("distributed", "Multi-host distributed runs")
+    group.addoption("--coordinator", default=None, metavar="URL",
+                    help="Run as a worker: pull tests from the coordinator at URL")
+    group.addoption("--worker-name", default=None, help="Worker name shown by the coordinator (default: host name)")
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    # trylast: settings are resolved by conftest.pytest_configure first
+    url = config.getoption("coordinator")
+    if not url:
+        return
+    from utils.work_queue import CoordinatorClient
+
+    worker = DistributedWorker(CoordinatorClient(url), config.getoption("worker_name") or socket.gethostname(),
+                               get_settings().WORKER_HEARTBEAT_INTERVAL)
+    config.pluginmanager.register(worker, "distributed_worker_instance")
+
+
+# --- Coordinator ----------------------------------------------------------
+
+class _Collector:
+    def __init__(self):
+        self.nodeids = []
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_configure(self, config):
+        config.option.htmlpath = None  # Nothing to report for a collection
+
+    def pytest_collection_finish(self, session):
+        self.nodeids = [item.nodeid for item in session.items]
+
+
+def collect(pytest_args):
+    """Test IDs selected by pytest_args (paths, -m, -k ...)
+
+    Returns:
+        list: Node IDs in collection order
+    """
+    collector = _Collector()
+    code = pytest.main(["--collect-only", "-qqq", "-p", "no:cacheprovider", *pytest_args], plugins=[collector])
+    if code not in (pytest.ExitCode.OK, pytest.ExitCode.NO_TESTS_COLLECTED):
+        raise SystemExit(f"Collection failed with exit code {code}")
+    return collector.nodeids
+
+
+def make_coordinator(nodeids, settings=None, **overrides):
+    from utils.work_queue import Coordinator
+
+    settings = settings or get_settings()
+    options = {"lease_size": settings.WORK_LEASE_SIZE, "heartbeat_timeout": settings.WORKER_HEARTBEAT_TIMEOUT,
+               "max_attempts": settings.WORK_MAX_ATTEMPTS}
+    options.update({key: value for key, value in overrides.items() if value is not None})
+    return Coordinator(nodeids, **options)
+
+
+def summarize(coordinator, output=None):
+    """Print the run summary and optionally write all results as JSON
+
+    Returns:
+        int: Exit status (1 if any test failed or did not finish)
+    """
+    status = coordinator.status()
+    counters = status["counters"]
+    print(f"{status['finished']}/{status['total']} tests finished: "
+          + ", ".join(f"{count} {outcome}" for outcome, count in sorted(status["outcomes"].items())))
+    print(f"leases {counters['leases']}, steals {counters['steals']} ({counters['stolen_tests']} tests), "
+          f"requeued {counters['requeued']}, dead workers {counters['dead_workers']}")
+    for worker, info in status["workers"].items():
+        print(f"  {worker:<12} {info['completed']:>4} tests  {info['host']}  {info['appium_server']}")
+    for result in coordinator.results.values():
+        if result["outcome"] in ("failed", "error"):
+            print(f"FAILED {result['nodeid']} on {result['worker']}")
+    if output:
+        with open(output, "w", encoding="utf-8") as handle:
+            json.dump({"status": status, "results": list(coordinator.results.values())}, handle, indent=2)
+    failed = any(r["outcome"] in ("failed", "error") for r in coordinator.results.values())
+    return 1 if failed or not coordinator.done else 0
+
+
+def run_coordinator(args, pytest_args):
+    from utils.work_queue import CoordinatorServer
+
+    coordinator = make_coordinator(collect(pytest_args), lease_size=args.lease_size,
+                                   heartbeat_timeout=args.heartbeat_timeout)
+    with CoordinatorServer(coordinator, args.host, args.port) as server:
+        print(f"Coordinator serving {len(coordinator.nodeids)} tests on {server.url}")
+        if not coordinator.wait(args.timeout):
+            print(f"Timed out after {args.timeout}s")
+    return summarize(coordinator, args.output)
+
+
+def run_demo(args, pytest_args):
+    """Coordinator plus several worker processes, each with its own fake Appium server"""
+    from utils.fake_appium_server import FakeAppiumServer
+    from utils.work_queue import CoordinatorServer
+
+    coordinator = make_coordinator(collect(pytest_args), lease_size=args.lease_size,
+                                   heartbeat_timeout=args.heartbeat_timeout)
+    fakes = [FakeAppiumServer().start() for _ in range(args.workers)]
+    processes = []
+    with tempfile.TemporaryDirectory() as workdir, CoordinatorServer(coordinator) as server:
+        try:
+            for number, fake in enumerate(fakes, start=1):
+                name = f"host{number}"
+                command = [sys.executable, "-m", "pytest", *pytest_args, "-qq", "-p", "no:cacheprovider",
+                           "--coordinator", server.url, "--worker-name", name, "--appium-server", fake.url,
+                           "--config-override", f"WORKER_HEARTBEAT_INTERVAL={coordinator.heartbeat_timeout / 4}",
+                           "--html", os.path.join(workdir, f"{name}.html")]
+                log = open(os.path.join(args.worker_logs or workdir, f"{name}.log"), "w", encoding="utf-8")
+                processes.append((name, subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT), log))
+            print(f"Coordinator {server.url}: {len(coordinator.nodeids)} tests, {args.workers} workers")
+            if args.kill_after:
+                while len(coordinator.results) < args.kill_after and not coordinator.done:
+                    time.sleep(0.1)
+                name, process, _ = processes[0]
+                process.kill()
+                print(f"Killed worker {name} after {len(coordinator.results)} results")
+            coordinator.wait(args.timeout)
+        finally:
+            for _, process, log in processes:
+                try:
+                    process.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                log.close()
+            for fake in fakes:
+                fake.stop()
+    return summarize(coordinator, args.output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Coordinate a test run over workers on several hosts")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("coordinator", "Serve the collected tests to workers"),
+                            ("demo", "Run a coordinator and local workers against fake Appium servers")):
+        sub = subcommands.add_parser(name, help=help_text)
+        sub.add_argument("--lease-size", type=int, default=None, help="Default: WORK_LEASE_SIZE")
+        sub.add_argument("--heartbeat-timeout", type=float, default=None, help="Default: WORKER_HEARTBEAT_TIMEOUT")
+        sub.add_argument("--timeout", type=float, default=None, help="Give up after this many seconds")
+        sub.add_argument("--output", default=None, help="Write all results as JSON")
+    subcommands.choices["coordinator"].add_argument("--host", default="127.0.0.1")
+    subcommands.choices["coordinator"].add_argument("--port", type=int, default=8700)
+    demo = subcommands.choices["demo"]
+    demo.add_argument("--workers", type=int, default=3)
+    demo.add_argument("--kill-after", type=int, default=0, help="Kill the first worker after N results")
+    demo.add_argument("--worker-logs", default=None, help="Directory for worker output (default: discarded)")
+    args, pytest_args = parser.parse_known_args(argv)
+    if pytest_args[:1] == ["--"]:
+        pytest_args = pytest_args[1:]
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    if args.command == "coordinator":
+        return run_coordinator(args, pytest_args)
+    return run_demo(args, pytest_args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
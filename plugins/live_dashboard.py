@@ -0,0 +1,459 @@
+"""
+Live Dashboard Plugin
+
+Serves a small local dashboard while the suite runs, so stuck devices and slow
+workers are visible in real time instead of only through log_cli output:
+- GET /        - HTML page that renders the event stream
+- GET /events  - Server-Sent Events (HTTP streaming, no extra dependency)
+- GET /state   - JSON snapshot of the current state
+
+Events:
+- progress: tests collected, finished and still queued
+- test: a test started or finished on a worker (outcome, duration)
+- command: WebDriver command latency and the command currently in flight
+- worker: per-device utilization (busy time / wall time)
+
+The server is built on the standard library like the fake Appium server.
+Idle clients block on a condition variable (a keep-alive comment every 15 s),
+the HTTP server does not log requests, and nothing is written to disk. With
+pytest-xdist the controller serves the dashboard from the reports of all
+workers (tests and utilization per worker); command latency is only seen in
+the process that sends the commands.
+
+Usage:
+    pytest --dashboard 8765
+    # open http://127.0.0.1:8765
+"""
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+import pytest
+
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+KEEPALIVE_SECONDS = 15
+RECENT_TESTS = 20
+MAX_EVENTS = 1000
+
+
+class DashboardState:
+    """Current run state plus a bounded buffer of recent events
+
+    Every change is published as an event with an increasing sequence number;
+    subscribers wait on a condition variable for events newer than theirs.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.events = deque(maxlen=MAX_EVENTS)
+        self.seq = 0
+        self.collected = 0
+        self.finished = 0
+        self.outcomes = {}
+        self.workers = {}
+        self.recent = deque(maxlen=RECENT_TESTS)
+        self.started = time.time()
+        self.closed = False
+
+    def _worker(self, name, device=None):
+        worker = self.workers.get(name)
+        if worker is None:
+            worker = self.workers[name] = {
+                "name": name, "device": device, "test": None, "test_started": None,
+                "busy_seconds": 0.0, "tests": 0, "command": None, "command_started": None,
+                "last_latency_ms": None, "commands": 0, "first_seen": time.time(),
+            }
+        if device:
+            worker["device"] = device
+        return worker
+
+    def _utilization(self, worker):
+        now = time.time()
+        busy = worker["busy_seconds"] + (now - worker["test_started"] if worker["test_started"] else 0.0)
+        wall = max(now - worker["first_seen"], 1e-9)
+        return round(min(busy / wall, 1.0), 3)
+
+    def publish(self, kind, data):
+        """Append an event and wake up subscribers (call with the condition held)"""
+        self.seq += 1
+        self.events.append((self.seq, kind, data))
+        self.condition.notify_all()
+
+    def _progress(self):
+        self.publish("progress", {"collected": self.collected, "finished": self.finished,
+                                  "queued": max(self.collected - self.finished, 0),
+                                  "outcomes": dict(self.outcomes)})
+
+    # --- Updates --------------------------------------------------------
+
+    def set_collected(self, count):
+        with self.condition:
+            self.collected = count
+            self._progress()
+
+    def test_started(self, worker_name, nodeid, device=None):
+        with self.condition:
+            worker = self._worker(worker_name, device)
+            worker["test"], worker["test_started"] = nodeid, time.time()
+            self.publish("test", {"worker": worker_name, "nodeid": nodeid, "state": "running",
+                                  "started": worker["test_started"]})
+
+    def test_finished(self, worker_name, nodeid, outcome, duration):
+        with self.condition:
+            worker = self._worker(worker_name)
+            if worker["test_started"]:
+                worker["busy_seconds"] += time.time() - worker["test_started"]
+            worker["test"], worker["test_started"] = None, None
+            worker["tests"] += 1
+            self.finished += 1
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+            result = {"worker": worker_name, "nodeid": nodeid, "state": outcome,
+                      "duration": round(duration, 3)}
+            self.recent.append(result)
+            self.publish("test", result)
+            self.publish("worker", {"worker": worker_name, "device": worker["device"],
+                                    "utilization": self._utilization(worker), "tests": worker["tests"]})
+            self._progress()
+
+    def command_started(self, worker_name, command):
+        with self.condition:
+            worker = self._worker(worker_name)
+            worker["command"], worker["command_started"] = command, time.time()
+            self.publish("command", {"worker": worker_name, "command": command, "state": "running",
+                                     "started": worker["command_started"]})
+
+    def command_finished(self, worker_name, command, seconds):
+        with self.condition:
+            worker = self._worker(worker_name)
+            worker["command"], worker["command_started"] = None, None
+            worker["last_latency_ms"] = round(seconds * 1000, 1)
+            worker["commands"] += 1
+            self.publish("command", {"worker": worker_name, "command": command, "state": "done",
+                                     "latency_ms": worker["last_latency_ms"]})
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    # --- Reading --------------------------------------------------------
+
+    def snapshot(self):
+        """JSON-serializable copy of the current state"""
+        with self.condition:
+            workers = []
+            for worker in self.workers.values():
+                workers.append(dict(worker, utilization=self._utilization(worker)))
+            return {
+                "seq": self.seq, "now": time.time(), "started": self.started,
+                "collected": self.collected, "finished": self.finished,
+                "queued": max(self.collected - self.finished, 0), "outcomes": dict(self.outcomes),
+                "workers": workers, "recent": list(self.recent),
+            }
+
+    def wait_for(self, seq, timeout):
+        """Events newer than seq, blocking up to timeout seconds
+
+        Returns:
+            list: (seq, kind, data) tuples, or None if the subscriber fell
+                behind the event buffer and needs a fresh snapshot
+        """
+        with self.condition:
+            if self.seq <= seq and not self.closed:
+                self.condition.wait(timeout)
+            if self.events and self.events[0][0] > seq + 1:
+                return None
+            return [event for event in self.events if event[0] > seq]
+
+
+DASHBOARD_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Test Run Dashboard</title>
+<style>
+body { font-family: sans-serif; margin: 2em; }
+table { border-collapse: collapse; } td, th { padding: 4px 10px; border-bottom: 1px solid #ddd; text-align: left; }
+.stuck { background: #ffebee; } .failed, .error { color: #c62828; } .passed { color: #2e7d32; }
+progress { width: 30em; }
+</style></head><body>
+<h1>Test Run Dashboard</h1>
+<p><progress id="bar" value="0" max="1"></progress> <span id="progress"></span></p>
+<h2>Devices</h2>
+<table><thead><tr><th>Worker</th><th>Device</th><th>Utilization</th><th>Tests</th><th>Current test</th>
+<th>Current command</th><th>Last latency</th></tr></thead><tbody id="workers"></tbody></table>
+<h2>Recent tests</h2><table><tbody id="recent"></tbody></table>
+<script>
+const STUCK_COMMAND_S = 30, STUCK_TEST_S = 300;
+let state = null;
+function esc(text) { const d = document.createElement("div"); d.textContent = text ?? ""; return d.innerHTML; }
+function render() {
+  if (!state) return;
+  const now = Date.now() / 1000;
+  document.getElementById("bar").max = Math.max(state.collected, 1);
+  document.getElementById("bar").value = state.finished;
+  document.getElementById("progress").textContent = `${state.finished} / ${state.collected} finished, ` +
+    `${state.queued} queued, ` + Object.entries(state.outcomes).map(([k, v]) => `${v} ${k}`).join(", ");
+  document.getElementById("workers").innerHTML = state.workers.map(w => {
+    const cmd = w.command ? `${esc(w.command)} (${(now - w.command_started).toFixed(1)} s)` : "";
+    const test = w.test ? `${esc(w.test)} (${(now - w.test_started).toFixed(0)} s)` : "idle";
+    const stuck = (w.command && now - w.command_started > STUCK_COMMAND_S) ||
+                  (w.test && now - w.test_started > STUCK_TEST_S);
+    return `<tr class="${stuck ? "stuck" : ""}"><td>${esc(w.name)}</td><td>${esc(w.device)}</td>` +
+      `<td>${Math.round(w.utilization * 100)}%</td><td>${w.tests}</td><td>${test}</td><td>${cmd}</td>` +
+      `<td>${w.last_latency_ms ?? ""} ms</td></tr>`;
+  }).join("");
+  document.getElementById("recent").innerHTML = state.recent.slice().reverse().map(t =>
+    `<tr><td class="${t.state}">${t.state}</td><td>${esc(t.nodeid)}</td><td>${t.duration} s</td>` +
+    `<td>${esc(t.worker)}</td></tr>`).join("");
+}
+function worker(name) {
+  let w = state.workers.find(w => w.name === name);
+  if (!w) { w = {name, tests: 0, utilization: 0}; state.workers.push(w); }
+  return w;
+}
+const source = new EventSource("/events");
+source.addEventListener("state", e => { state = JSON.parse(e.data); render(); });
+source.addEventListener("progress", e => { Object.assign(state, JSON.parse(e.data)); render(); });
+source.addEventListener("worker", e => { const d = JSON.parse(e.data); Object.assign(worker(d.worker), d); render(); });
+source.addEventListener("test", e => {
+  const d = JSON.parse(e.data), w = worker(d.worker);
+  if (d.state === "running") { w.test = d.nodeid; w.test_started = d.started; }
+  else { w.test = null; state.recent.push(d); state.recent = state.recent.slice(-20); }
+  render();
+});
+source.addEventListener("command", e => {
+  const d = JSON.parse(e.data), w = worker(d.worker);
+  if (d.state === "running") { w.command = d.command; w.command_started = d.started; }
+  else { w.command = null; w.last_latency_ms = d.latency_ms; w.commands = (w.commands || 0) + 1; }
+});
+setInterval(render, 1000);
+</script></body></html>
+"""
+
+
+def _make_handler(state):
+    from http.server import BaseHTTPRequestHandler
+
+    class DashboardHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass  # No request logging: the dashboard must not touch the log file
+
+        def _send(self, content_type, body):
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _write_event(self, kind, data, seq=None):
+            prefix = f"id: {seq}\n" if seq is not None else ""
+            self.wfile.write(f"{prefix}event: {kind}\ndata: {json.dumps(data)}\n\n".encode("utf-8"))
+
+        def _stream_events(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            snapshot = state.snapshot()
+            seq = snapshot["seq"]
+            self._write_event("state", snapshot, seq)
+            self.wfile.flush()
+            while not state.closed:
+                events = state.wait_for(seq, KEEPALIVE_SECONDS)
+                if events is None:
+                    snapshot = state.snapshot()
+                    seq = snapshot["seq"]
+                    self._write_event("state", snapshot, seq)
+                elif not events:
+                    self.wfile.write(b": keep-alive\n\n")
+                for event_seq, kind, data in events or ():
+                    self._write_event(kind, data, event_seq)
+                    seq = event_seq
+                self.wfile.flush()
+
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            try:
+                if path == "/":
+                    self._send("text/html; charset=utf-8", DASHBOARD_PAGE.encode("utf-8"))
+                elif path == "/state":
+                    self._send("application/json", json.dumps(state.snapshot()).encode("utf-8"))
+                elif path == "/events":
+                    self._stream_events()
+                else:
+                    self.send_error(404)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # Browser tab closed
+
+    return DashboardHandler
+
+
+class DashboardServer:
+    """Local HTTP/SSE server publishing a DashboardState
+
+    Args:
+        state: DashboardState to serve
+        host: Interface to bind (local only by default)
+        port: Port (0 picks a free one)
+    """
+
+    def __init__(self, state, host="127.0.0.1", port=0):
+        from http.server import ThreadingHTTPServer  # Only loaded when --dashboard is given
+
+        self.state = state
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(state))
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        # A long poll interval keeps the idle accept loop nearly free; shutdown() waits at most this long
+        self._thread = threading.Thread(target=self._httpd.serve_forever, kwargs={"poll_interval": 1.0},
+                                        name="live-dashboard", daemon=True)
+        self._thread.start()
+        logger.info(f"Live dashboard on {self.url}")
+        return self
+
+    def stop(self):
+        self.state.close()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+
+class LiveDashboard:
+    """Feeds pytest progress and WebDriver command timings into a DashboardState
+
+    Args:
+        state: DashboardState to update
+        worker_name: Name of this process in the dashboard
+        device: Device name of this process
+        distributed: True in an xdist controller (tests are attributed to the
+            worker named in each report)
+    """
+
+    def __init__(self, state, worker_name="main", device=None, distributed=False):
+        self.state = state
+        self.worker_name = worker_name
+        self.device = device
+        self.distributed = distributed
+        self.server = None
+        self._outcomes = {}
+        self._durations = {}
+        self._original_execute = None
+        self._wrapper = None
+
+    def install(self):
+        """Time every WebDriver command of this process"""
+        from selenium.webdriver.remote.webdriver import WebDriver
+
+        original = self._original_execute = WebDriver.execute
+        dashboard = self
+
+        def execute(driver, driver_command, params=None):
+            if dashboard._original_execute is None:
+                return original(driver, driver_command, params)
+            dashboard.state.command_started(dashboard.worker_name, driver_command)
+            start = time.perf_counter()
+            try:
+                return original(driver, driver_command, params)
+            finally:
+                dashboard.state.command_finished(dashboard.worker_name, driver_command,
+                                                 time.perf_counter() - start)
+
+        self._wrapper = WebDriver.execute = execute
+
+    def uninstall(self):
+        """Stop timing commands (the wrapper becomes a pass-through if something patched over it)"""
+        from selenium.webdriver.remote.webdriver import WebDriver
+
+        if WebDriver.execute is self._wrapper and self._original_execute is not None:
+            WebDriver.execute = self._original_execute
+        self._original_execute = None
+
+    def start(self, host="127.0.0.1", port=0):
+        self.install()
+        self.server = DashboardServer(self.state, host, port).start()
+        return self
+
+    def stop(self):
+        self.uninstall()
+        if self.server:
+            self.server.stop()
+            self.server = None
+
+    # --- Pytest hooks ---------------------------------------------------
+
+    def pytest_report_header(self, config):
+        return f"live dashboard: {self.server.url}" if self.server else None
+
+    def pytest_collection_finish(self, session):
+        if not self.distributed:
+            self.state.set_collected(len(session.items))
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_node_collection_finished(self, node, ids):
+        self.state.set_collected(len(ids))
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        if not self.distributed:
+            self.state.test_started(self.worker_name, nodeid, self.device)
+
+    def pytest_runtest_logreport(self, report):
+        node = getattr(report, "node", None)
+        worker = node.gateway.id if node is not None else self.worker_name
+        if report.when == "setup" and self.distributed:
+            self.state.test_started(worker, report.nodeid)
+        self._durations[report.nodeid] = self._durations.get(report.nodeid, 0.0) + report.duration
+        if report.when == "call" or report.failed or report.skipped:
+            if report.failed and report.when != "call":
+                outcome = "error"
+            else:
+                outcome = report.outcome
+            self._outcomes.setdefault(report.nodeid, outcome)
+        if report.when == "teardown":
+            self.state.test_finished(worker, report.nodeid, self._outcomes.pop(report.nodeid, "passed"),
+                                     self._durations.pop(report.nodeid, 0.0))
+
+    def pytest_unconfigure(self, config):
+        self.stop()
+
+
+def _parse_address(value):
+    """'PORT' or 'HOST:PORT' -> (host, port)"""
+    host, _, port = value.rpartition(":")
+    try:
+        return host or "127.0.0.1", int(port)
+    except ValueError:
+        raise pytest.UsageError(f"--dashboard expects PORT or HOST:PORT, got '{value}'")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("live_dashboard", "Live dashboard")
+    group.addoption("--dashboard", default=None, metavar="[HOST:]PORT",
+                    help="Serve a live run dashboard on http://HOST:PORT (default host 127.0.0.1, 0 = any free port)")
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    # trylast: settings are resolved by conftest.pytest_configure first
+    address = config.getoption("dashboard")
+    if address is None or hasattr(config, "workerinput"):
+        return  # xdist workers report through the controller
+    host, port = _parse_address(address)
+    distributed = getattr(config.option, "dist", "no") != "no"
+    dashboard = LiveDashboard(DashboardState(), device=get_settings().DEVICE_NAME, distributed=distributed)
+    config.pluginmanager.register(dashboard.start(host, port), "live_dashboard_instance")
@@ -0,0 +1,248 @@
+"""
+Screen Affinity Plugin
+
+Most shopping list tests start the app, navigate from home to their screen,
+do a few steps and go back again. With --screen-affinity tests that declare
+the same start screen run back to back and share the way there:
+- @pytest.mark.screen("shopping_list") declares the screen a test starts on;
+  the `screen_page` fixture hands the test the page object of that screen
+  (the BasePage subclass whose SCREEN attribute matches)
+- Collection groups tests of one screen together, at the position of the
+  group's first test (unmarked tests keep their place)
+- Inside a group the driver is kept alive after a passing test, and the next
+  test only resets the screen's state (page.reset_screen()) instead of
+  starting a new driver, navigating (page_class.navigate()) and leaving
+  (page.leave()). A failed test always ends its group's streak, so the next
+  test starts from a fresh driver
+- Driver starts, navigations and leaves are timed; the terminal summary
+  reports how many of them were saved and the seconds that saves, estimated
+  from the measured means minus the time spent resetting screens
+
+Without the option the marker only selects the page object: every test
+starts its own driver, navigates and leaves as before.
+
+Usage:
+    pytest tests/test_shopping_list.py --screen-affinity
+"""
+import logging
+import time
+from collections import defaultdict
+
+import pytest
+
+logger = logging.getLogger(__name__)
+
+
+def screen_of(item):
+    """Start screen declared by a test's screen marker, or None"""
+    marker = item.get_closest_marker("screen")
+    if marker is None:
+        return None
+    return marker.args[0] if marker.args else marker.kwargs.get("name")
+
+
+def group_by_screen(items):
+    """Order items so tests of one screen are adjacent
+
+    Each screen's group takes the position of its first test; the order inside
+    a group and of unmarked tests is kept.
+
+    Args:
+        items: Collected test items
+
+    Returns:
+        list: Reordered items
+    """
+    groups = {}
+    ordered = []
+    for item in items:
+        screen = screen_of(item)
+        if screen is None:
+            ordered.append([item])
+        elif screen in groups:
+            groups[screen].append(item)
+        else:
+            groups[screen] = [item]
+            ordered.append(groups[screen])
+    return [item for group in ordered for item in group]
+
+
+def page_class_for(screen):
+    """Page object class declaring SCREEN = screen
+
+    Raises:
+        LookupError: No loaded page object declares the screen
+    """
+    from pages.base_page import BasePage
+
+    pending = list(BasePage.__subclasses__())
+    while pending:
+        cls = pending.pop()
+        if getattr(cls, "SCREEN", None) == screen:
+            return cls
+        pending.extend(cls.__subclasses__())
+    raise LookupError(f"No page object declares SCREEN = '{screen}'")
+
+
+class ScreenAffinity:
+    """Keeps the driver on a screen between consecutive tests of that screen"""
+
+    def __init__(self):
+        self.durations = defaultdict(list)
+        self.saved = defaultdict(int)
+        self.reset_seconds = 0.0
+        self._held = None
+        self._next = {}
+        self._failed = set()
+
+    # --- Scheduling -----------------------------------------------------
+
+    def keeps(self, item):
+        """Whether the driver stays on item's screen for the next test"""
+        screen = screen_of(item)
+        following = self._next.get(item.nodeid)
+        return (screen is not None and following is not None and screen_of(following) == screen
+                and item.nodeid not in self._failed)
+
+    def continues(self, item):
+        """Whether item starts on the screen the previous test left the driver on"""
+        return self._held is not None and self._held[0] == screen_of(item)
+
+    # --- Driver ---------------------------------------------------------
+
+    def acquire(self, item, start):
+        """Driver for a test: the held one when it is on the test's screen, else start()
+
+        Args:
+            item: Test item requesting the driver
+            start: Callable starting a new driver
+        """
+        if self._held is not None:
+            screen, driver, stop = self._held
+            if screen == screen_of(item):
+                self.saved["driver_start"] += 1
+                return driver
+            # The test that would have reused it did not run (e.g. skipped)
+            self._held = None
+            stop(driver)
+        return self.timed("driver_start", start)
+
+    def release(self, item, driver, stop):
+        """Hold the driver for the next test of the same screen, else stop(driver)"""
+        if self.keeps(item):
+            self._held = (screen_of(item), driver, stop)
+            return
+        self._held = None
+        stop(driver)
+
+    def timed(self, action, function, *args):
+        """Call function and record its duration under action"""
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.durations[action].append(time.perf_counter() - start)
+
+    # --- Results --------------------------------------------------------
+
+    def seconds_saved(self):
+        """Estimated seconds saved: saved actions at their measured mean, minus screen resets"""
+        seconds = -self.reset_seconds
+        for action, count in self.saved.items():
+            durations = self.durations.get(action)
+            if durations:
+                seconds += count * sum(durations) / len(durations)
+        return seconds
+
+    def summary(self):
+        return {
+            "navigations_saved": self.saved["navigation"],
+            "leaves_saved": self.saved["leave"],
+            "driver_starts_saved": self.saved["driver_start"],
+            "navigations": len(self.durations["navigation"]),
+            "seconds_saved": round(self.seconds_saved(), 2),
+        }
+
+    # --- Pytest hooks ---------------------------------------------------
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection_modifyitems(self, config, items):
+        # tryfirst: conftest's external-app lane ordering still applies afterwards
+        items[:] = group_by_screen(items)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self._next[item.nodeid] = nextitem
+
+    def pytest_runtest_logreport(self, report):
+        if report.failed and report.when in ("setup", "call"):
+            self._failed.add(report.nodeid)
+
+    def pytest_sessionfinish(self, session):
+        if self._held is not None:
+            _, driver, stop = self._held
+            self._held = None
+            stop(driver)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        summary = self.summary()
+        terminalreporter.write_sep("-", "screen affinity")
+        terminalreporter.write_line(
+            f"Navigations saved: {summary['navigations_saved']} (of {summary['navigations'] + summary['navigations_saved']}), "
+            f"leaves saved: {summary['leaves_saved']}, driver starts saved: {summary['driver_starts_saved']}, "
+            f"~{summary['seconds_saved']:.1f} s saved"
+        )
+        logger.info(f"Screen affinity: {summary}")
+
+
+@pytest.fixture(scope="function")
+def screen_page(request, driver):
+    """Page object of the screen declared by the test's screen marker, already open
+
+    With --screen-affinity a test following one of the same screen finds the
+    screen open and only resets its state; otherwise the page navigates there.
+    The page is left again after the test unless the next test continues on it.
+
+    Yields:
+        BasePage: Page object of the declared screen
+    """
+    screen = screen_of(request.node)
+    if screen is None:
+        pytest.fail("screen_page needs a @pytest.mark.screen('<name>') marker", pytrace=False)
+    page_class = page_class_for(screen)
+    affinity = request.config.pluginmanager.get_plugin("screen_affinity_instance")
+
+    if affinity is not None and affinity.continues(request.node):
+        page = page_class(driver)
+        start = time.perf_counter()
+        assert page.reset_screen(), f"Failed to reset screen '{screen}'"
+        affinity.reset_seconds += time.perf_counter() - start
+        affinity.saved["navigation"] += 1
+    elif affinity is not None:
+        page = affinity.timed("navigation", page_class.navigate, driver)
+    else:
+        page = page_class.navigate(driver)
+    assert page is not None, f"Failed to open screen '{screen}'"
+
+    yield page
+
+    if affinity is None:
+        page.leave()
+    elif affinity.keeps(request.node):
+        affinity.saved["leave"] += 1
+    else:
+        affinity.timed("leave", page.leave)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("screen_affinity", "Screen affinity")
+    group.addoption("--screen-affinity", action="store_true", default=False,
+                    help="Run tests of one start screen back to back and keep the driver on that screen")
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "screen(name): test starts on the named screen (see the screen_page fixture)"
+    )
+    if config.getoption("screen_affinity"):
+        config.pluginmanager.register(ScreenAffinity(), "screen_affinity_instance")
@@ -0,0 +1,451 @@
+"""
+Streaming Report Plugin
+
+pytest-html keeps every result (and every embedded screenshot) in memory and
+writes one large self-contained file at the end of the run. This plugin writes
+each result as soon as its test finishes instead:
+- results.jsonl - one JSON line per test (outcome, phase durations, failure text)
+- junit.xml - JUnit XML, appended test case by test case
+- artifacts/ - files attached to tests (failure screenshots, ...), referenced by
+  relative path from both files instead of being embedded
+
+Only the test currently running is held in memory. With pytest-xdist every
+worker writes its own results.<worker>.jsonl / junit.<worker>.xml.
+
+A separate step renders a paginated HTML report, reading the JSONL files line
+by line so memory stays bounded by the page size:
+
+    pytest --stream-report reports/stream
+    python -m plugins.streaming_report reports/stream --page-size 200
+
+Tests can attach their own artifacts through the report_artifacts fixture:
+
+    def test_x(report_artifacts):
+        report_artifacts.attach("page_source.xml", driver.page_source)
+"""
+import argparse
+import glob
+import html
+import json
+import logging
+import os
+import re
+import time
+
+import pytest
+
+logger = logging.getLogger(__name__)
+
+# Characters that are not allowed in XML 1.0 documents
+_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+_UNSAFE_FILENAME = re.compile(r'[^A-Za-z0-9_.-]+')
+
+# Captured output kept per failing test, to bound the size of one record
+MAX_SECTION_CHARS = 20000
+
+
+def _xml_text(text):
+    from xml.sax.saxutils import escape  # Pulls in urllib.request; only needed with --stream-report
+
+    return escape(_INVALID_XML.sub("?", text or ""))
+
+
+def _xml_attr(text):
+    from xml.sax.saxutils import quoteattr
+
+    return quoteattr(_INVALID_XML.sub("?", text or ""))
+
+
+def safe_filename(text):
+    """File name derived from a test node id or artifact name"""
+    return _UNSAFE_FILENAME.sub("_", text).strip("_")[:150] or "artifact"
+
+
+class ArtifactStore:
+    """Files attached to one test, stored under the report directory
+
+    Args:
+        directory: Report directory
+        nodeid: Test node id
+    """
+
+    def __init__(self, directory, nodeid):
+        self.directory = directory
+        self.folder = os.path.join("artifacts", safe_filename(nodeid))
+        self.references = []
+
+    def path_for(self, name):
+        """Absolute path for a new artifact (the folder is created on demand)
+
+        Returns:
+            str: Path to write the artifact to; it is recorded as attached
+        """
+        os.makedirs(os.path.join(self.directory, self.folder), exist_ok=True)
+        relative = os.path.join(self.folder, safe_filename(name)).replace(os.sep, "/")
+        self.references.append({"name": name, "path": relative})
+        return os.path.join(self.directory, relative)
+
+    def attach(self, name, data):
+        """Write text or bytes as an artifact
+
+        Args:
+            name: Artifact file name (e.g. "page_source.xml")
+            data: str or bytes content
+        """
+        mode = "wb" if isinstance(data, bytes) else "w"
+        with open(self.path_for(name), mode, **({} if mode == "wb" else {"encoding": "utf-8"})) as handle:
+            handle.write(data)
+
+    def reference(self, name, path):
+        """Attach an existing file by reference without copying it"""
+        relative = os.path.relpath(os.path.abspath(path), os.path.abspath(self.directory))
+        self.references.append({"name": name, "path": relative.replace(os.sep, "/")})
+
+
+class JUnitStream:
+    """JUnit XML file written one test case at a time
+
+    Counts are not known up front, so the testsuite element carries none;
+    JUnit consumers (Jenkins, GitLab, Azure) count the testcase elements.
+    The file is complete once close() has written the closing tags.
+
+    Args:
+        path: Output file
+        name: testsuite name
+    """
+
+    def __init__(self, path, name="pytest"):
+        self.path = path
+        self._handle = open(path, "w", encoding="utf-8")
+        self._handle.write('<?xml version="1.0" encoding="utf-8"?>\n<testsuites>\n')
+        self._handle.write(f'<testsuite name={_xml_attr(name)} '
+                           f'timestamp="{time.strftime("%Y-%m-%dT%H:%M:%S")}">\n')
+        self._handle.flush()
+
+    def add(self, record):
+        """Append one result record (as written to results.jsonl)"""
+        module, _, name = record["nodeid"].rpartition("::")
+        classname = module.replace("/", ".").replace(".py::", ".").replace("::", ".").removesuffix(".py")
+        lines = [f'<testcase classname={_xml_attr(classname)} name={_xml_attr(name)} '
+                 f'time="{record["duration"]:.3f}">']
+        outcome = record["outcome"]
+        message = record.get("message", "")
+        if outcome in ("failed", "xpassed"):
+            lines.append(f'<failure message={_xml_attr(message)}>{_xml_text(record.get("longrepr", ""))}</failure>')
+        elif outcome == "error":
+            lines.append(f'<error message={_xml_attr(message)}>{_xml_text(record.get("longrepr", ""))}</error>')
+        elif outcome in ("skipped", "xfailed"):
+            lines.append(f'<skipped message={_xml_attr(message)}/>')
+        if record.get("artifacts") or record.get("properties"):
+            lines.append("<properties>")
+            lines += [f'<property name={_xml_attr(name)} value={_xml_attr(str(value))}/>'
+                      for name, value in record.get("properties", {}).items()]
+            lines += [f'<property name="attachment" value={_xml_attr(artifact["path"])}/>'
+                      for artifact in record.get("artifacts", [])]
+            lines.append("</properties>")
+        lines.append("</testcase>\n")
+        self._handle.write("".join(lines))
+        self._handle.flush()
+
+    def close(self):
+        if not self._handle.closed:
+            self._handle.write("</testsuite>\n</testsuites>\n")
+            self._handle.close()
+
+
+def _outcome(reports):
+    """Single outcome for a test from its setup/call/teardown reports"""
+    for report in reports:
+        if report.failed and report.when != "call":
+            return "error"
+    for report in reports:
+        xfail = hasattr(report, "wasxfail")
+        if report.when == "call" or report.skipped:
+            if xfail:
+                return "xfailed" if report.skipped else "xpassed"
+            if report.failed:
+                return "failed"
+            if report.skipped:
+                return "skipped"
+    return "passed"
+
+
+def _message(reports):
+    """One-line summary of the first unsuccessful report"""
+    for report in reports:
+        if report.failed or report.skipped:
+            if hasattr(report, "wasxfail"):
+                return report.wasxfail
+            if report.skipped and isinstance(report.longrepr, tuple):
+                return report.longrepr[2]
+            text = report.longreprtext.strip().splitlines()
+            return text[-1] if text else ""
+    return ""
+
+
+class StreamingReporter:
+    """Appends one record per finished test to results.jsonl and junit.xml
+
+    Args:
+        directory: Report directory
+        worker_id: xdist worker id, or None for a single-process run
+    """
+
+    def __init__(self, directory, worker_id=None):
+        self.directory = directory
+        self.worker_id = worker_id
+        suffix = f".{worker_id}" if worker_id else ""
+        os.makedirs(directory, exist_ok=True)
+        self.results_path = os.path.join(directory, f"results{suffix}.jsonl")
+        self._results = open(self.results_path, "w", encoding="utf-8")
+        self.junit = JUnitStream(os.path.join(directory, f"junit{suffix}.xml"))
+        self.counts = {}
+        self._reports = {}
+        self._artifacts = {}
+
+    def artifacts(self, nodeid):
+        """ArtifactStore of a test (created on first use)"""
+        if nodeid not in self._artifacts:
+            self._artifacts[nodeid] = ArtifactStore(self.directory, nodeid)
+        return self._artifacts[nodeid]
+
+    def record(self, nodeid, reports, location=None):
+        """Build the JSON record of a finished test"""
+        outcome = _outcome(reports)
+        record = {
+            "nodeid": nodeid,
+            "outcome": outcome,
+            "duration": round(sum(report.duration for report in reports), 6),
+            "phases": {report.when: round(report.duration, 6) for report in reports},
+            "start": min((report.start for report in reports), default=None),
+            "worker": self.worker_id,
+            "message": _message(reports),
+        }
+        if location:
+            record["location"] = location
+        properties = [prop for report in reports for prop in report.user_properties]
+        if properties:
+            record["properties"] = dict(properties)
+        if outcome not in ("passed", "skipped", "xfailed"):
+            record["longrepr"] = "\n\n".join(report.longreprtext for report in reports if report.failed
+                                             or hasattr(report, "wasxfail"))
+            record["sections"] = [[title, content[-MAX_SECTION_CHARS:]]
+                                  for report in reports for title, content in report.sections]
+        store = self._artifacts.pop(nodeid, None)
+        if store and store.references:
+            record["artifacts"] = store.references
+        return record
+
+    def write(self, record):
+        self._results.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._results.flush()
+        self.junit.add(record)
+        self.counts[record["outcome"]] = self.counts.get(record["outcome"], 0) + 1
+
+    def close(self):
+        if not self._results.closed:
+            self._results.close()
+        self.junit.close()
+
+    # --- Pytest hooks ---------------------------------------------------
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if report.when == "call" and report.failed:
+            self._capture_screenshot(item)
+
+    def _capture_screenshot(self, item):
+        """Store a screenshot of a failing test's driver as an artifact"""
+        driver = item.funcargs.get("driver") or item.funcargs.get("fake_driver")
+        if driver is None:
+            return
+        try:
+            png = driver.get_screenshot_as_png()
+        except Exception as exc:
+            logger.warning(f"Could not capture failure screenshot: {exc}")
+            return
+        self.artifacts(item.nodeid).attach("failure.png", png)
+
+    def pytest_runtest_logreport(self, report):
+        self._reports.setdefault(report.nodeid, []).append(report)
+        if report.when == "teardown":
+            reports = self._reports.pop(report.nodeid)
+            self.write(self.record(report.nodeid, reports, report.location[0]))
+
+    def pytest_sessionfinish(self, session):
+        self.close()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.worker_id:
+            return
+        counts = ", ".join(f"{count} {outcome}" for outcome, count in sorted(self.counts.items()))
+        terminalreporter.write_sep("-", "streaming report")
+        terminalreporter.write_line(f"Results: {self.directory} ({counts or 'no tests'})")
+        terminalreporter.write_line(f"Render HTML: python -m plugins.streaming_report {self.directory}")
+
+
+@pytest.fixture
+def report_artifacts(request):
+    """Attach files to the current test's streaming report record
+
+    Yields:
+        ArtifactStore: Store for this test (a throwaway one when --stream-report is off)
+    """
+    reporter = request.config.pluginmanager.get_plugin("streaming_reporter_instance")
+    if reporter is None:
+        import tempfile
+        with tempfile.TemporaryDirectory() as directory:
+            yield ArtifactStore(directory, request.node.nodeid)
+        return
+    yield reporter.artifacts(request.node.nodeid)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("streaming_report", "Streaming report")
+    group.addoption("--stream-report", default=None, metavar="DIR",
+                    help="Stream results to DIR/results.jsonl and DIR/junit.xml as tests finish "
+                         "(replaces the in-memory pytest-html report)")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # tryfirst: switch pytest-html off before it sets up its in-memory report
+    directory = config.getoption("stream_report")
+    if not directory:
+        return
+    if getattr(config.option, "htmlpath", None):
+        logger.info(f"--stream-report given, skipping pytest-html report {config.option.htmlpath}")
+        config.option.htmlpath = None
+    worker_id = getattr(config, "workerinput", {}).get("workerid")
+    if worker_id is None and getattr(config.option, "dist", "no") != "no":
+        return  # xdist controller: the workers write the results
+    config.pluginmanager.register(StreamingReporter(directory, worker_id), "streaming_reporter_instance")
+
+
+# --- HTML rendering -------------------------------------------------------
+
+PAGE_STYLE = """
+body { font-family: sans-serif; margin: 2em; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border-bottom: 1px solid #ddd; padding: 4px 8px; text-align: left; vertical-align: top; }
+.passed { color: #2e7d32; } .failed, .error, .xpassed { color: #c62828; }
+.skipped, .xfailed { color: #9e6a03; }
+pre { white-space: pre-wrap; background: #f6f8fa; padding: 8px; max-height: 30em; overflow: auto; }
+img { max-width: 240px; }
+"""
+
+
+def iter_records(directory):
+    """Yield result records from every results*.jsonl in directory, one line at a time"""
+    for path in sorted(glob.glob(os.path.join(directory, "results*.jsonl"))):
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _page_name(number):
+    return f"page-{number:04d}.html"
+
+
+def _render_record(record):
+    outcome = record["outcome"]
+    cells = [f'<td class="{outcome}">{outcome}</td>',
+             f'<td>{html.escape(record["nodeid"])}</td>',
+             f'<td>{record["duration"]:.2f} s</td>']
+    details = []
+    if record.get("message"):
+        details.append(f'<div>{html.escape(record["message"])}</div>')
+    if record.get("longrepr"):
+        details.append(f'<details><summary>Traceback</summary><pre>{html.escape(record["longrepr"])}</pre></details>')
+    for title, content in record.get("sections", []):
+        details.append(f'<details><summary>{html.escape(title)}</summary><pre>{html.escape(content)}</pre></details>')
+    for artifact in record.get("artifacts", []):
+        href = html.escape("../" + artifact["path"])
+        if artifact["path"].lower().endswith((".png", ".jpg", ".jpeg", ".gif")):
+            details.append(f'<a href="{href}"><img loading="lazy" src="{href}" alt="{html.escape(artifact["name"])}"></a>')
+        else:
+            details.append(f'<a href="{href}">{html.escape(artifact["name"])}</a>')
+    cells.append(f'<td>{"".join(details)}</td>')
+    return f'<tr>{"".join(cells)}</tr>\n'
+
+
+def _write_page(directory, number, pages, rows):
+    links = " ".join(f'<a href="{_page_name(n)}">{n}</a>' if n != number else f"<b>{n}</b>"
+                     for n in range(1, pages + 1)) if pages <= 50 else ""
+    nav = ('<p><a href="index.html">Summary</a> | '
+           + (f'<a href="{_page_name(number - 1)}">&laquo; previous</a> ' if number > 1 else "")
+           + (f'<a href="{_page_name(number + 1)}">next &raquo;</a>' if number < pages else "")
+           + f' | page {number} of {pages} {links}</p>')
+    with open(os.path.join(directory, _page_name(number)), "w", encoding="utf-8") as handle:
+        handle.write(f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>Results page {number}</title>"
+                     f"<style>{PAGE_STYLE}</style></head><body>{nav}<table>"
+                     "<tr><th>Outcome</th><th>Test</th><th>Duration</th><th>Details</th></tr>\n")
+        handle.writelines(rows)
+        handle.write(f"</table>{nav}</body></html>\n")
+
+
+def render_html(directory, page_size=200, output=None):
+    """Render a paginated HTML report from the streamed results
+
+    Records are read one line at a time; only the current page is held in
+    memory, plus the ids of failing tests for the summary page.
+
+    Args:
+        directory: Report directory written by --stream-report
+        page_size: Tests per page
+        output: Output directory (defaults to DIRECTORY/html)
+
+    Returns:
+        str: Path of the summary page (index.html)
+    """
+    output = output or os.path.join(directory, "html")
+    os.makedirs(output, exist_ok=True)
+    # Page count is needed for the navigation bar; counting lines is cheap
+    total = sum(1 for _ in iter_records(directory))
+    pages = max(1, -(-total // page_size))
+    counts, failures, rows, duration = {}, [], [], 0.0
+    number = 1
+    for record in iter_records(directory):
+        counts[record["outcome"]] = counts.get(record["outcome"], 0) + 1
+        duration += record["duration"]
+        if record["outcome"] in ("failed", "error", "xpassed"):
+            failures.append((record["nodeid"], record["outcome"], number))
+        rows.append(_render_record(record))
+        if len(rows) == page_size:
+            _write_page(output, number, pages, rows)
+            rows, number = [], number + 1
+    if rows or total == 0:
+        _write_page(output, number, pages, rows)
+
+    summary = ", ".join(f'<span class="{outcome}">{count} {outcome}</span>'
+                        for outcome, count in sorted(counts.items()))
+    index = os.path.join(output, "index.html")
+    with open(index, "w", encoding="utf-8") as handle:
+        handle.write(f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>Test Report</title>"
+                     f"<style>{PAGE_STYLE}</style></head><body><h1>Test Report</h1>"
+                     f"<p>{total} tests, {summary or 'no results'}, {duration:.1f} s of test time</p>"
+                     f'<p>Pages: {" ".join(f"<a href={_page_name(n)!r}>{n}</a>" for n in range(1, pages + 1))}</p>')
+        if failures:
+            handle.write("<h2>Failures</h2><table>\n")
+            handle.writelines(f'<tr><td class="{outcome}">{outcome}</td><td><a href="{_page_name(page)}">'
+                              f'{html.escape(nodeid)}</a></td></tr>\n' for nodeid, outcome, page in failures)
+            handle.write("</table>")
+        handle.write("</body></html>\n")
+    logger.info(f"Rendered {total} results into {pages} pages: {index}")
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a paginated HTML report from --stream-report results")
+    parser.add_argument("directory", help="Directory given to --stream-report")
+    parser.add_argument("--page-size", type=int, default=200, help="Tests per page")
+    parser.add_argument("--output", default=None, help="Output directory (default: DIRECTORY/html)")
+    args = parser.parse_args(argv)
+    print(render_html(args.directory, page_size=args.page_size, output=args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Timeline Profiler Plugin
+
+Records where suite time goes and exports it in Chrome Trace Event format,
+viewable in chrome://tracing or https://ui.perfetto.dev.
+
+Spans recorded:
+- test: one span per test (setup + call + teardown)
+- phase: setup / call / teardown of each test
+- fixture: setup of each fixture (e.g. driver start-up)
+- sleep: every time.sleep() call
+- page: public page-object methods (BasePage subclasses)
+- element: actions on declared page elements (pages/elements.py)
+- webdriver: every WebDriver command sent to the Appium server
+
+Each pytest process (xdist worker) is one trace process named after its
+worker id and device; each thread is one track inside it. Workers write
+partial files that the controlling process merges at the end of the run.
+
+Usage:
+    pytest --timeline reports/timeline.json
+"""
+import functools
+import glob
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import pytest
+
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class TimelineProfiler:
+    """Collects spans for one pytest process and writes Chrome trace events"""
+
+    def __init__(self, path, worker_id=None, device=None):
+        """Initialize TimelineProfiler
+
+        Args:
+            path: Output path of the merged trace file
+            worker_id: xdist worker id, or None for a single-process run
+            device: Device name shown in the track label
+        """
+        self.path = path
+        self.worker_id = worker_id
+        self.device = device
+        self.pid = int(worker_id[2:]) + 1 if worker_id and worker_id[2:].isdigit() else 0
+        self.events = []
+        self._thread_ids = {}
+        self._patches = []
+        # Wall clock anchor so spans from different processes line up
+        self._wall_anchor = time.time()
+        self._perf_anchor = time.perf_counter()
+        self._sleep = time.sleep
+
+    # --- Recording ------------------------------------------------------
+
+    def _timestamp_us(self, perf_time):
+        return (self._wall_anchor + (perf_time - self._perf_anchor)) * 1_000_000
+
+    def _tid(self):
+        ident = threading.get_ident()
+        if ident not in self._thread_ids:
+            self._thread_ids[ident] = len(self._thread_ids)
+            self.events.append({
+                "ph": "M", "name": "thread_name", "pid": self.pid, "tid": self._thread_ids[ident],
+                "args": {"name": threading.current_thread().name},
+            })
+        return self._thread_ids[ident]
+
+    def record(self, name, category, start, end, args=None):
+        """Record a completed span
+
+        Args:
+            name: Span name
+            category: Span category (test, phase, fixture, sleep, page, webdriver)
+            start: time.perf_counter() at span start
+            end: time.perf_counter() at span end
+            args: Optional dict shown in the trace viewer
+        """
+        event = {
+            "name": name, "cat": category, "ph": "X", "pid": self.pid, "tid": self._tid(),
+            "ts": round(self._timestamp_us(start), 1), "dur": round((end - start) * 1_000_000, 1),
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    @contextmanager
+    def span(self, name, category, args=None):
+        """Context manager recording the enclosed block as a span"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, category, start, time.perf_counter(), args)
+
+    def _traced(self, function, name, category, args_fn=None):
+        """Wrap a callable so every call is recorded"""
+        profiler = self
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler.record(name(args) if callable(name) else name, category, start,
+                                time.perf_counter(), args_fn(args) if args_fn else None)
+
+        return wrapper
+
+    # --- Instrumentation ------------------------------------------------
+
+    def _patch(self, owner, attribute, replacement):
+        self._patches.append((owner, attribute, owner.__dict__.get(attribute, getattr(owner, attribute))))
+        setattr(owner, attribute, replacement)
+
+    def install(self):
+        """Patch time.sleep and WebDriver.execute"""
+        from selenium.webdriver.remote.webdriver import WebDriver
+
+        self._patch(time, "sleep", self._traced(
+            self._sleep, "sleep", "sleep", lambda args: {"seconds": args[0] if args else None}
+        ))
+        self._patch(WebDriver, "execute", self._traced(
+            WebDriver.execute, lambda args: args[1], "webdriver"
+        ))
+
+    def instrument_pages(self):
+        """Wrap public methods of every loaded page object class and of declared elements"""
+        from pages.base_page import BasePage
+        from pages.elements import BoundElement
+
+        for name, member in list(vars(BoundElement).items()):
+            if not name.startswith("_") and inspect.isfunction(member):
+                self._patch(BoundElement, name, self._traced(
+                    member, lambda args, action=name: f"{type(args[0].page).__name__}.{args[0].name}.{action}",
+                    "element"))
+
+        pending, seen = [BasePage], set()
+        while pending:
+            cls = pending.pop()
+            if cls in seen:
+                continue
+            seen.add(cls)
+            pending.extend(cls.__subclasses__())
+            for name, member in list(vars(cls).items()):
+                # Generators only do work while being consumed, so a call span would be empty
+                if (name.startswith("_") or not inspect.isfunction(member)
+                        or inspect.isgeneratorfunction(member)):
+                    continue
+                self._patch(cls, name, self._traced(member, f"{cls.__name__}.{name}", "page"))
+
+    def uninstall(self):
+        """Restore everything patched by install() and instrument_pages()"""
+        while self._patches:
+            owner, attribute, original = self._patches.pop()
+            setattr(owner, attribute, original)
+
+    # --- Export ---------------------------------------------------------
+
+    def _process_label(self):
+        label = self.worker_id or "main"
+        return f"{label} ({self.device})" if self.device else label
+
+    def trace_events(self):
+        """All events of this process, including the process name"""
+        metadata = {"ph": "M", "name": "process_name", "pid": self.pid, "tid": 0,
+                    "args": {"name": self._process_label()}}
+        return [metadata] + self.events
+
+    def partial_path(self):
+        root, extension = os.path.splitext(self.path)
+        return f"{root}.{self.worker_id}.partial{extension or '.json'}"
+
+    def write(self):
+        """Write this worker's partial trace, or merge all partials into the final trace"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        if self.worker_id:
+            with open(self.partial_path(), "w", encoding="utf-8") as handle:
+                json.dump(self.trace_events(), handle)
+            return
+
+        events = self.trace_events()
+        root, extension = os.path.splitext(self.path)
+        for partial in sorted(glob.glob(f"{root}.*.partial{extension or '.json'}")):
+            with open(partial, encoding="utf-8") as handle:
+                events.extend(json.load(handle))
+            os.remove(partial)
+        with open(self.path, "w", encoding="utf-8") as handle:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, handle)
+        logger.info(f"Timeline written to {self.path} ({len(events)} events)")
+
+    def totals(self):
+        """Total seconds per span category for this process"""
+        totals = defaultdict(float)
+        for event in self.events:
+            if event["ph"] == "X":
+                totals[event["cat"]] += event["dur"] / 1_000_000
+        return dict(totals)
+
+    # --- Pytest hooks ---------------------------------------------------
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_finish(self, session):
+        self.instrument_pages()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        with self.span(item.nodeid, "test"):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        with self.span("setup", "phase", {"test": item.nodeid}):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        with self.span("call", "phase", {"test": item.nodeid}):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item, nextitem):
+        with self.span("teardown", "phase", {"test": item.nodeid}):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        with self.span(f"fixture:{fixturedef.argname}", "fixture", {"scope": fixturedef.scope}):
+            yield
+
+    def pytest_sessionfinish(self, session):
+        self.uninstall()
+        self.write()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        totals = self.totals()
+        if not totals:
+            return
+        terminalreporter.write_sep("-", "timeline summary")
+        for category in ("test", "fixture", "sleep", "webdriver", "page", "element"):
+            if category in totals:
+                terminalreporter.write_line(f"{category:>10}: {totals[category]:8.2f} s")
+        terminalreporter.write_line(f"Trace: {self.path}")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("timeline", "Timeline profiler")
+    group.addoption("--timeline", default=None, metavar="PATH",
+                    help="Write a Chrome trace (chrome://tracing / Perfetto) of the run to PATH")
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    # trylast: settings are resolved by conftest.pytest_configure first
+    path = config.getoption("timeline")
+    if not path:
+        return
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER")
+    profiler = TimelineProfiler(path, worker_id=worker_id, device=get_settings().DEVICE_NAME)
+    profiler.install()
+    config.pluginmanager.register(profiler, "timeline_profiler_instance")
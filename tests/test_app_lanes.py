@@ -0,0 +1,120 @@
+"""
+Test Suite for External-App Lanes
+Runs offline against the fake Appium server - no device required
+"""
+import pytest
+import logging
+from config.settings import get_settings
+from pages.home_page import HomePage
+from pages.shopping_items import assert_items
+from pages.shopping_list_page import ShoppingListPage
+from utils.app_lanes import SecondarySession, create_lane
+from utils.fake_flutter_app import APP_PACKAGE, BROWSER_PACKAGE
+from utils.http_transport import create_connection
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+ITEMS = [("Milk", 2), ("Bread", 1)]
+
+
+class TestAppLanes:
+    """Test cases for leaving the app and coming back without losing its state"""
+
+    def _open_list(self, fake_appium_server, fake_driver):
+        """Helper method to open the shopping list with a few items"""
+        HomePage(fake_driver).click_shopping_list_button()
+        app = fake_appium_server.sessions[fake_driver.session_id].app
+        app.seed_items(ITEMS)
+        return app
+
+    def _secondary(self, fake_appium_server):
+        settings = get_settings().with_overrides(APPIUM_SERVER=fake_appium_server.url)
+        return SecondarySession(settings, connection_factory=lambda url: create_connection(url, settings))
+
+    @pytest.mark.regression
+    def test_activation_lane_keeps_app_state(self, fake_appium_server, fake_driver):
+        """Test the activation lane brings the app back on the same route with its items"""
+        app = self._open_list(fake_appium_server, fake_driver)
+        lane = create_lane("activation", fake_driver, get_settings())
+
+        with lane.visit() as visit:
+            fake_driver.activate_app(BROWSER_PACKAGE)
+
+        assert visit.package == BROWSER_PACKAGE
+        assert fake_driver.current_package == APP_PACKAGE
+        assert app.screen == "shopping_list"
+        assert_items(ShoppingListPage(fake_driver).get_shopping_items(), ITEMS)
+        logger.info(f"[PASS] {visit!r}, shopping list untouched")
+
+    @pytest.mark.regression
+    def test_visit_without_leaving_the_app(self, fake_appium_server, fake_driver):
+        """Test a visit where the app never leaves reports no package and changes nothing"""
+        app = self._open_list(fake_appium_server, fake_driver)
+        settings = get_settings().with_overrides(EXTERNAL_APP_TIMEOUT=0.5)
+        lane = create_lane("activation", fake_driver, settings)
+
+        with lane.visit() as visit:
+            pass
+
+        assert visit.package is None
+        assert app.screen == "shopping_list"
+
+    @pytest.mark.regression
+    def test_app_is_restored_when_the_check_fails(self, fake_appium_server, fake_driver):
+        """Test a failing block inside a visit still brings the app back"""
+        app = self._open_list(fake_appium_server, fake_driver)
+        lane = create_lane("activation", fake_driver, get_settings())
+
+        with pytest.raises(AssertionError):
+            with lane.visit():
+                fake_driver.activate_app(BROWSER_PACKAGE)
+                assert False, "check failed in the external app"
+
+        assert fake_driver.current_package == APP_PACKAGE
+        assert app.screen == "shopping_list"
+        assert lane.visits == 1
+
+    @pytest.mark.regression
+    def test_inline_lane_stays_when_the_app_never_left(self, fake_appium_server, fake_driver):
+        """Test a check failing before the app left does not press back out of the screen under test"""
+        app = self._open_list(fake_appium_server, fake_driver)
+        lane = create_lane("inline", fake_driver, get_settings())
+
+        with pytest.raises(AssertionError):
+            with lane.visit():
+                assert False, "check failed before the external app opened"
+
+        assert fake_driver.current_package == APP_PACKAGE
+        assert app.screen == "shopping_list"
+        assert_items(ShoppingListPage(fake_driver).get_shopping_items(), ITEMS)
+
+    @pytest.mark.regression
+    def test_session_lane_shares_device_with_main_session(self, fake_appium_server, fake_driver):
+        """Test the secondary session is started once, attaches without a reset and restores the app"""
+        app = self._open_list(fake_appium_server, fake_driver)
+        secondary = self._secondary(fake_appium_server)
+        try:
+            for _ in range(2):
+                lane = create_lane("session", fake_driver, get_settings(), secondary=secondary)
+                with lane.visit() as visit:
+                    fake_driver.activate_app(BROWSER_PACKAGE)
+                assert visit.package == BROWSER_PACKAGE
+
+            assert len(fake_appium_server.sessions) == 2
+            secondary_app = fake_appium_server.sessions[secondary.driver.session_id].app
+            assert secondary_app is app
+            assert fake_driver.current_package == APP_PACKAGE
+            assert_items(ShoppingListPage(fake_driver).get_shopping_items(), ITEMS)
+        finally:
+            secondary.close()
+        assert len(fake_appium_server.sessions) == 1
+
+    @pytest.mark.regression
+    def test_unknown_or_incomplete_lane(self, fake_driver):
+        """Test invalid lane modes are rejected"""
+        with pytest.raises(ValueError):
+            create_lane("parallel", fake_driver, get_settings())
+        with pytest.raises(ValueError):
+            create_lane("session", fake_driver, get_settings())
@@ -0,0 +1,113 @@
+"""
+Test Suite for Batch Element Queries
+Runs offline against the fake Appium server - no device required
+"""
+import pytest
+import logging
+from pages.locators import AppiumBy
+from pages.home_page import HomePage
+from pages.shopping_list_page import ShoppingListPage
+from utils.batch_query import QUERY_SCRIPT, QueryError, execute_query
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class TestBatchQuery:
+    """Test cases for the batch query helper and its reference implementation"""
+
+    def _open_shopping_list(self, fake_driver):
+        """Helper method to navigate to Shopping List page on the fake app"""
+        assert HomePage(fake_driver).click_shopping_list_button(), "Failed to open Shopping List"
+        return ShoppingListPage(fake_driver)
+
+    @pytest.mark.smoke
+    def test_query_returns_elements_and_attributes(self, fake_driver):
+        """Test one query returns every matching element with its attributes"""
+        home_page = HomePage(fake_driver)
+        results = home_page.query_elements(
+            AppiumBy.CLASS_NAME, "android.widget.Button", ("content-desc", "clickable")
+        )
+
+        descs = [attributes["content-desc"] for _, attributes in results]
+        assert descs == ["Web Search", "Open Gmail", "Shopping List"]
+        assert all(attributes["clickable"] == "true" for _, attributes in results)
+
+        # Returned elements are regular WebElements
+        results[2][0].click()
+        assert ShoppingListPage(fake_driver).verify_page_loaded(timeout=1)
+        logger.info("[PASS] Batch query returned usable elements")
+
+    @pytest.mark.regression
+    def test_get_items_uses_single_round_trip(self, fake_driver, fake_appium_server):
+        """Test get_items reads all item descriptions without per-element calls"""
+        shopping_list_page = self._open_shopping_list(fake_driver)
+        for name, quantity in [("Bread", 1), ("Eggs", 12), ("Butter", 2)]:
+            assert shopping_list_page.add_item(name, quantity), f"Failed to add {name}"
+
+        fake_appium_server.command_counts.clear()
+        items = shopping_list_page.get_items()
+
+        assert items == ["Bread\nx1", "Eggs\nx12", "Butter\nx2"]
+        assert fake_appium_server.command_counts["execute_script"] == 1
+        assert fake_appium_server.command_counts["get_attribute"] == 0
+        logger.info(f"[PASS] Commands used: {dict(fake_appium_server.command_counts)}")
+
+    @pytest.mark.regression
+    def test_fallback_without_plugin(self, fake_driver, fake_appium_server, monkeypatch):
+        """Test per-element lookups are used when the server lacks the plugin"""
+        from utils import fake_appium_server as server_module
+        monkeypatch.setattr(server_module, "QUERY_SCRIPT", "plugin: not installed")
+
+        home_page = HomePage(fake_driver)
+        first = home_page.query_elements(AppiumBy.CLASS_NAME, "android.widget.Button")
+        fake_appium_server.command_counts.clear()
+        second = home_page.query_elements(AppiumBy.CLASS_NAME, "android.widget.Button")
+
+        assert [attributes for _, attributes in first] == [attributes for _, attributes in second]
+        assert QUERY_SCRIPT in fake_driver._absent_extensions
+        assert fake_appium_server.command_counts["execute_script"] == 0
+        assert fake_appium_server.command_counts["get_attribute"] == 3
+
+    @pytest.mark.regression
+    def test_transient_failure_falls_back_once(self, fake_driver, fake_appium_server, monkeypatch):
+        """Test a stale element during the batch query falls back for that call and keeps the plugin"""
+        from utils import fake_appium_server as server_module
+        failures = [server_module.WebDriverError("stale element reference", "element is no longer attached")]
+
+        def flaky_query(server, params):
+            if failures:
+                raise failures.pop()
+            return execute_query(server, params)
+
+        monkeypatch.setattr(server_module, "execute_query", flaky_query)
+        home_page = HomePage(fake_driver)
+
+        first = home_page.query_elements(AppiumBy.CLASS_NAME, "android.widget.Button")
+        assert QUERY_SCRIPT not in fake_driver._absent_extensions
+        fake_appium_server.command_counts.clear()
+        second = home_page.query_elements(AppiumBy.CLASS_NAME, "android.widget.Button")
+
+        assert [attributes for _, attributes in first] == [attributes for _, attributes in second]
+        assert fake_appium_server.command_counts["execute_script"] == 1
+        assert fake_appium_server.command_counts["get_attribute"] == 0
+
+    @pytest.mark.regression
+    def test_reference_implementation_validates_query(self):
+        """Test malformed queries are rejected by the reference implementation"""
+        class Backend:
+            def find_elements(self, using, value):
+                return ["a", "b", "c"]
+
+            def get_attribute(self, element_id, name):
+                return f"{element_id}:{name}"
+
+        results = execute_query(Backend(), {"using": "class name", "value": "x",
+                                            "attributes": ["text"], "limit": 2})
+        assert [entry["attributes"]["text"] for entry in results] == ["a:text", "b:text"]
+
+        for bad in [{}, {"using": "class name"}, {"using": "class name", "value": "x", "attributes": "text"},
+                    {"using": "class name", "value": "x", "limit": -1}]:
+            with pytest.raises(QueryError):
+                execute_query(Backend(), bad)
@@ -0,0 +1,128 @@
+"""
+Test Suite for Multi-Host Distributed Runs
+Runs offline against the fake Appium server - no device required
+"""
+import json
+import pytest
+import logging
+import subprocess
+import sys
+from utils.work_queue import Coordinator, CoordinatorServer
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+ITEM_TESTS = [
+    "tests/test_shopping_items.py::TestShoppingItems::test_parse_item",
+    "tests/test_shopping_items.py::TestShoppingItems::test_index_matches_exact_names",
+    "tests/test_shopping_items.py::TestShoppingItems::test_delete_item_uses_exact_name",
+]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDistributed:
+    """Test cases for the coordinator work queue and worker agents"""
+
+    def _run(self, coordinator, worker):
+        """Helper method that runs every test a worker can lease, passing"""
+        finished = []
+        while True:
+            reply = coordinator.lease(worker)
+            if not reply.get("tests"):
+                return finished
+            for nodeid in reply["tests"]:
+                if coordinator.start(worker, nodeid):
+                    coordinator.report(worker, {"nodeid": nodeid, "outcome": "passed", "duration": 0.1})
+                    finished.append(nodeid)
+
+    @pytest.mark.regression
+    def test_idle_worker_steals_unstarted_tests(self):
+        """Test an idle worker takes half of another worker's unstarted batch, which is then not run twice"""
+        coordinator = Coordinator([f"t{i}" for i in range(8)], lease_size=4)
+        slow = coordinator.register("slow")
+        fast = coordinator.register("fast")
+
+        assert coordinator.lease(slow)["tests"] == ["t0", "t1", "t2", "t3"]
+        assert coordinator.start(slow, "t0")
+        assert self._run(coordinator, fast) == ["t4", "t5", "t6", "t7", "t3", "t2", "t1"]
+
+        assert not coordinator.start(slow, "t1")
+        assert coordinator.lease(slow) == {"wait": pytest.approx(1.0)}
+        assert coordinator.counters["steals"] == 3
+        assert coordinator.report(slow, {"nodeid": "t0", "outcome": "passed", "duration": 1.0})
+        assert coordinator.done
+        assert coordinator.lease(fast) == {"done": True}
+
+    @pytest.mark.regression
+    def test_dead_worker_tests_are_requeued(self):
+        """Test missed heartbeats requeue a worker's batch and retry its running test up to the limit"""
+        clock = FakeClock()
+        coordinator = Coordinator(["a", "b", "c"], lease_size=3, heartbeat_timeout=10.0, max_attempts=2, clock=clock)
+        first = coordinator.register("host")
+        second = coordinator.register("host")
+        assert second == "host-2"
+
+        assert coordinator.lease(first)["tests"] == ["a", "b"]
+        coordinator.start(first, "a")
+        clock.now = 8.0
+        coordinator.heartbeat(second)
+        clock.now = 11.0
+        assert coordinator.lease(second)["tests"] == ["a", "b", "c"]
+        assert (coordinator.counters["dead_workers"], coordinator.counters["requeued"]) == (1, 2)
+        assert not coordinator.heartbeat(first)
+        assert not coordinator.report(first, {"nodeid": "a", "outcome": "passed", "duration": 1.0})
+
+        coordinator.start(second, "a")
+        clock.now = 30.0
+        coordinator.reap()
+        result = coordinator.results["a"]
+        assert (result["outcome"], result["attempts"]) == ("failed", 2)
+        assert "died" in result["longrepr"]
+        assert list(coordinator.pending) == ["b", "c"]
+
+    @pytest.mark.regression
+    def test_worker_processes_share_the_run(self, fake_appium_server, tmp_path):
+        """Test two pytest workers pull, run and report every test exactly once"""
+        coordinator = Coordinator(ITEM_TESTS + ["tests/test_missing.py::test_gone"], lease_size=1)
+        with CoordinatorServer(coordinator) as server:
+            workers = [
+                subprocess.Popen([sys.executable, "-m", "pytest", "tests/test_shopping_items.py", "-qq",
+                                  "-p", "no:cacheprovider", "--coordinator", server.url, "--worker-name", name,
+                                  "--appium-server", fake_appium_server.url, "--html", str(tmp_path / f"{name}.html"),
+                                  "--config-override", "WORKER_HEARTBEAT_INTERVAL=0.5"],
+                                 stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+                for name in ("worker-a", "worker-b")
+            ]
+            outputs = [worker.communicate(timeout=120)[0] for worker in workers]
+            assert coordinator.wait(timeout=5), outputs
+
+        outcomes = {nodeid: result["outcome"] for nodeid, result in coordinator.results.items()}
+        assert outcomes == {**{nodeid: "passed" for nodeid in ITEM_TESTS}, "tests/test_missing.py::test_gone": "error"}
+        assert sum(info["completed"] for info in coordinator.workers.values()) == 4
+        assert all(not info["alive"] for info in coordinator.workers.values())
+        logger.info(f"[PASS] {coordinator.status()['counters']}")
+
+    @pytest.mark.regression
+    def test_worker_runs_tests_through_protocol_hooks(self, fake_appium_server, tmp_path):
+        """Test plugins wrapping pytest_runtest_protocol (e.g. --timeline) see every test a worker runs"""
+        coordinator = Coordinator(ITEM_TESTS, lease_size=2)
+        timeline = tmp_path / "timeline.json"
+        with CoordinatorServer(coordinator) as server:
+            output = subprocess.run([sys.executable, "-m", "pytest", "tests/test_shopping_items.py", "-qq",
+                                     "-p", "no:cacheprovider", "--coordinator", server.url,
+                                     "--appium-server", fake_appium_server.url, "--html", str(tmp_path / "w.html"),
+                                     "--timeline", str(timeline)],
+                                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, timeout=120).stdout
+            assert coordinator.wait(timeout=5), output
+
+        events = json.loads(timeline.read_text(encoding="utf-8"))["traceEvents"]
+        test_spans = sorted(event["name"] for event in events if event.get("cat") == "test")
+        assert test_spans == sorted(ITEM_TESTS), output
@@ -0,0 +1,83 @@
+"""
+Test Suite for the Shared HTTP Transport
+Runs offline against the fake Appium server - no device required
+"""
+import pytest
+import logging
+from config.settings import get_settings
+from utils.fake_appium_server import FakeAppiumServer
+from utils.http_transport import close_shared_pools, create_connection, parse_pool_limits
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class TestHttpTransport:
+    """Test cases for connection sharing, compression and connection limits"""
+
+    def _session_page_sources(self, server, settings, sessions=2):
+        """Helper method to start sessions on the shopping list and read their page sources"""
+        from appium import webdriver
+        from appium.options.android import UiAutomator2Options
+
+        options = UiAutomator2Options().load_capabilities(settings.desired_capabilities)
+        sources = []
+        for _ in range(sessions):
+            driver = webdriver.Remote(create_connection(server.url, settings), options=options)
+            try:
+                driver.find_element("accessibility id", "Shopping List").click()
+                server.sessions[driver.session_id].app.seed_items([(f"Item {i}", i) for i in range(20)])
+                sources.append(driver.page_source)
+            finally:
+                driver.quit()
+        return sources
+
+    @pytest.mark.regression
+    def test_sessions_share_one_connection(self):
+        """Test consecutive sessions reuse the same keep-alive connection"""
+        close_shared_pools()
+        with FakeAppiumServer() as server:
+            self._session_page_sources(server, get_settings(), sessions=3)
+            assert server.connections == 1
+        close_shared_pools()
+
+    @pytest.mark.regression
+    def test_gzip_responses_are_decoded(self):
+        """Test compressed page sources are identical and smaller on the wire"""
+        settings = get_settings()
+        with FakeAppiumServer() as server:
+            plain = self._session_page_sources(server, settings.with_overrides(HTTP_COMPRESSION=False), 1)
+            plain_bytes, server.bytes_sent = server.bytes_sent, 0
+            compressed = self._session_page_sources(server, settings.with_overrides(HTTP_COMPRESSION=True), 1)
+
+            assert plain == compressed
+            assert server.bytes_sent < plain_bytes / 2
+            logger.info(f"[PASS] {plain_bytes} bytes plain, {server.bytes_sent} bytes with gzip")
+        close_shared_pools()
+
+    @pytest.mark.regression
+    def test_keep_alive_off_uses_stock_connection(self):
+        """Test HTTP_KEEP_ALIVE=False falls back to the per-request stock executor"""
+        from utils.http_transport import PooledAppiumConnection
+
+        connection = create_connection("http://127.0.0.1:4723", get_settings().with_overrides(HTTP_KEEP_ALIVE=False))
+        assert not isinstance(connection, PooledAppiumConnection)
+        assert not connection.keep_alive
+
+    @pytest.mark.regression
+    def test_per_endpoint_limits(self):
+        """Test connection limits are parsed and applied per endpoint"""
+        from utils.http_transport import EndpointPoolManager
+
+        limits = parse_pool_limits("farm.example.com:4723=2, localhost=8")
+        assert limits == {"farm.example.com:4723": 2, "localhost": 8}
+
+        manager = EndpointPoolManager(limits=limits, maxsize=4)
+        assert manager.connection_from_host("farm.example.com", 4723).pool.maxsize == 2
+        assert manager.connection_from_host("localhost", 4723).pool.maxsize == 8
+        assert manager.connection_from_host("other.example.com", 4723).pool.maxsize == 4
+
+        for bad in ["farm.example.com", "=3", "host=0", "host=x"]:
+            with pytest.raises(ValueError):
+                parse_pool_limits(bad)
@@ -0,0 +1,65 @@
+"""
+Test Suite for Lazy Imports and Fast Collection
+Runs offline against the fake Appium server - no device required
+"""
+import pytest
+import logging
+import json
+import os
+import subprocess
+import sys
+from pages.locators import AppiumBy
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, os, sys
+logs = set(os.listdir("logs"))
+import conftest, pages.home_page, pages.shopping_list_page, utils.http_transport, utils.session_keepalive
+heavy = [name for name in ("appium.webdriver", "selenium.webdriver", "urllib3", "numpy", "PIL") if name in sys.modules]
+print(json.dumps({"heavy": heavy, "new_logs": sorted(set(os.listdir("logs")) - logs)}))
+"""
+
+
+class TestLazyImports:
+    """Test cases for import-time cost of the framework modules"""
+
+    @pytest.mark.regression
+    def test_locator_constants_match_appium(self):
+        """Test the local AppiumBy has the same strategy values as the Appium client"""
+        from appium.webdriver.common.appiumby import AppiumBy as ClientAppiumBy
+
+        names = [name for name in vars(AppiumBy) if name.isupper()]
+        assert names
+        for name in names:
+            assert getattr(AppiumBy, name) == getattr(ClientAppiumBy, name), name
+
+    @pytest.mark.regression
+    def test_framework_import_loads_no_client(self):
+        """Test importing conftest and page objects loads no Appium/Selenium client and creates no log"""
+        result = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, capture_output=True, text=True, check=True)
+        loaded = json.loads(result.stdout.strip().splitlines()[-1])
+        assert loaded == {"heavy": [], "new_logs": []}
+
+    @pytest.mark.regression
+    def test_log_tool_loads_no_webdriver_package(self):
+        """Test the offline log analytics imports nothing from Selenium or Appium"""
+        probe = ("import sys, utils.log_analytics; "
+                 "print([name for name in sys.modules if name.split('.')[0] in ('selenium', 'appium')])")
+        result = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+        assert result.stdout.strip().splitlines()[-1] == "[]"
+
+    @pytest.mark.regression
+    def test_lazy_reexports_still_resolve(self):
+        """Test classes moved out of utils.http_transport are still importable from it"""
+        from utils import http_transport, pooled_connection
+
+        assert http_transport.PooledAppiumConnection is pooled_connection.PooledAppiumConnection
+        assert http_transport.EndpointPoolManager is pooled_connection.EndpointPoolManager
+        with pytest.raises(AttributeError):
+            http_transport.NoSuchThing
+        logger.info("[PASS] Lazy re-exports resolve")
@@ -0,0 +1,99 @@
+"""
+Test Suite for the Live Dashboard Plugin
+Runs offline against the fake Appium server - no device required
+"""
+import json
+import queue
+import threading
+import time
+import urllib.request
+import pytest
+import logging
+from pages.home_page import HomePage
+from plugins.live_dashboard import DashboardState, LiveDashboard
+
+pytest_plugins = ["pytester"]
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def _read_events(url, events, stop):
+    """Collect (event, data) pairs from a Server-Sent Events stream"""
+    with urllib.request.urlopen(url + "/events", timeout=30) as response:
+        kind = None
+        for raw in response:
+            line = raw.decode("utf-8").rstrip("\n")
+            if line.startswith("event: "):
+                kind = line[7:]
+            elif line.startswith("data: "):
+                events.put((kind, json.loads(line[6:])))
+            if stop.is_set():
+                return
+
+
+class TestLiveDashboard:
+    """Test cases for the dashboard event stream and its idle cost"""
+
+    @pytest.mark.regression
+    def test_streams_progress_and_command_latency(self, fake_driver):
+        """Test test progress, command latency and utilization reach a connected client"""
+        dashboard = LiveDashboard(DashboardState(), device="fake").start(port=0)
+        events, stop = queue.Queue(), threading.Event()
+        reader = threading.Thread(target=_read_events, args=(dashboard.server.url, events, stop), daemon=True)
+        try:
+            # A second copy of selenium (e.g. re-imported after a pytester run) would leave
+            # the driver's commands untimed and the wait for 'command' events below hanging
+            assert type(fake_driver).execute is dashboard._wrapper, (
+                f"Dashboard patched a WebDriver class that {type(fake_driver).__module__}."
+                f"{type(fake_driver).__name__} does not inherit from (selenium imported twice?)")
+            reader.start()
+            assert events.get(timeout=5)[0] == "state"
+
+            dashboard.state.set_collected(3)
+            dashboard.state.test_started("main", "tests/test_x.py::test_one", "fake")
+            HomePage(fake_driver).click_shopping_list_button()
+            dashboard.state.test_finished("main", "tests/test_x.py::test_one", "passed", 0.2)
+
+            seen = []
+            while ("progress", 1) not in [(kind, data.get("finished")) for kind, data in seen]:
+                seen.append(events.get(timeout=5))
+            kinds = {kind for kind, _ in seen}
+            assert {"progress", "test", "command", "worker"} <= kinds
+
+            with urllib.request.urlopen(dashboard.server.url + "/state", timeout=5) as response:
+                state = json.load(response)
+            worker = state["workers"][0]
+            assert state["queued"] == 2
+            assert worker["device"] == "fake" and worker["commands"] > 0
+            assert worker["last_latency_ms"] is not None and 0 < worker["utilization"] <= 1
+            logger.info(f"[PASS] {len(seen)} events, last latency {worker['last_latency_ms']} ms")
+        finally:
+            stop.set()
+            dashboard.stop()
+
+    @pytest.mark.regression
+    def test_idle_dashboard_uses_little_cpu(self):
+        """Test an idle dashboard with a connected client costs almost no CPU"""
+        dashboard = LiveDashboard(DashboardState()).start(port=0)
+        events, stop = queue.Queue(), threading.Event()
+        threading.Thread(target=_read_events, args=(dashboard.server.url, events, stop), daemon=True).start()
+        try:
+            events.get(timeout=5)
+            cpu_start, wall_start = time.process_time(), time.perf_counter()
+            time.sleep(1.0)
+            cpu = time.process_time() - cpu_start
+            assert cpu < 0.1, f"Idle dashboard used {cpu:.3f} s CPU in {time.perf_counter() - wall_start:.1f} s"
+            logger.info(f"[PASS] Idle CPU: {cpu * 1000:.1f} ms per second")
+        finally:
+            stop.set()
+            dashboard.stop()
+
+    @pytest.mark.regression
+    def test_plugin_runs_with_pytest(self, pytester):
+        """Test --dashboard starts the server for a run and stops it afterwards"""
+        pytester.makepyfile(test_sample="def test_a():\n    pass\n\ndef test_b():\n    assert False\n")
+        result = pytester.runpytest("-p", "plugins.live_dashboard", "--dashboard", "0")
+        result.assert_outcomes(passed=1, failed=1)
+        result.stdout.fnmatch_lines(["live dashboard: http://127.0.0.1:*"])
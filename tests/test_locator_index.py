@@ -0,0 +1,111 @@
+"""
+Test Suite for the Self-Healing Locator Index
+Runs offline against the fake Appium server - no device required
+"""
+import glob
+import os
+import pytest
+import logging
+from config import settings as settings_module
+from config.settings import get_settings
+from pages.home_page import HomePage
+from pages.locator_index import Candidate, LocatorIndex, build_index, main, snapshot_nodes
+from pages.shopping_list_page import ShoppingListPage
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+SNAPSHOT_TEMPLATE = (
+    '<hierarchy><android.widget.FrameLayout class="android.widget.FrameLayout">'
+    '<android.widget.Button class="android.widget.Button" content-desc="Back" />'
+    '<android.widget.Button class="android.widget.Button" content-desc="{add_desc}" />'
+    '</android.widget.FrameLayout></hierarchy>'
+)
+
+
+def _recorded_sources():
+    directory = os.path.join(get_settings().LOCATOR_SNAPSHOT_DIR, "ShoppingListPage")
+    sources = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.xml"))):
+        with open(path, encoding="utf-8") as handle:
+            sources.append(handle.read())
+    return sources
+
+
+class TestLocatorIndex:
+    """Test cases for building, ranking and healing indexed locators"""
+
+    @pytest.mark.regression
+    def test_index_from_recorded_snapshots(self):
+        """Test the best candidate of every target picks the right element in every snapshot"""
+        sources = _recorded_sources()
+        assert sources, "No recorded ShoppingListPage snapshots"
+        index = build_index(sources, ShoppingListPage.HEALING_TARGETS)
+
+        for name, identify in ShoppingListPage.HEALING_TARGETS.items():
+            best = index[name][0]
+            assert best.score == 1.0, f"{name}: {index[name]}"
+            for source in sources:
+                nodes = snapshot_nodes(source)
+                assert best.select(nodes) is identify(nodes)
+            logger.info(f"[PASS] {name}: {best!r}")
+
+    @pytest.mark.regression
+    def test_stable_candidates_rank_first(self):
+        """Test candidates are ranked by hit rate, then cost, and weak ones are dropped"""
+        sources = [SNAPSHOT_TEMPLATE.format(add_desc=desc) for desc in ("Add", "Add", "")]
+        targets = {"add_button": lambda nodes: [n for n in nodes if n.get("class") == "android.widget.Button"][1]}
+
+        ranked = build_index(sources, targets)["add_button"]
+        assert [(c.kind, round(c.score, 2)) for c in ranked] == [("instance", 1.0), ("accessibility_id", 0.67)]
+        assert [c.kind for c in build_index(sources, targets, min_score=0.8)["add_button"]] == ["instance"]
+
+    @pytest.mark.regression
+    def test_build_leaves_positional_targets_to_fallback(self, tmp_path, monkeypatch, capsys):
+        """Test targets found only by class + instance are not indexed unless asked for"""
+        monkeypatch.setattr(settings_module, "_settings",
+                            get_settings().with_overrides(LOCATOR_INDEX_DIR=str(tmp_path)))
+        index_path = tmp_path / "ShoppingListPage.json"
+
+        assert main(["build", "ShoppingListPage"]) == 1
+        assert not index_path.exists()
+        assert "add_button: only positional candidates" in capsys.readouterr().out
+
+        assert main(["build", "ShoppingListPage", "--keep-positional"]) == 0
+        entries = LocatorIndex.load(str(index_path)).entries
+        assert sorted(entries) == sorted(ShoppingListPage.HEALING_TARGETS)
+
+    @pytest.mark.regression
+    def test_falls_back_and_learns_winner(self, fake_driver, tmp_path):
+        """Test a stale first candidate falls back to the next one, which is then tried first"""
+        HomePage(fake_driver).click_shopping_list_button()
+        page = ShoppingListPage(fake_driver)
+        stale = Candidate("accessibility_id", "android.widget.Button", "Add item", 0.9)
+        working = Candidate("instance", "android.widget.Button", 1, 0.8)
+        index = LocatorIndex(str(tmp_path / "ShoppingListPage.json"), {"add_button": [stale, working]})
+        page.locator_index = lambda: index
+
+        element = page.locate("add_button")
+        assert element is not None and element.id == "list-add"
+        assert index.entries["add_button"][0] is working and index.fallbacks == 1
+
+        page.locate("add_button")
+        assert index.fallbacks == 1, "Learned candidate should win without a fallback"
+        index.save()
+        assert LocatorIndex.load(index.path).entries["add_button"][0].key == working.key
+
+    @pytest.mark.regression
+    def test_unindexed_element_uses_fallback(self, fake_driver, tmp_path, caplog):
+        """Test pages keep working with the old heuristics, quietly, when no index exists"""
+        HomePage(fake_driver).click_shopping_list_button()
+        page = ShoppingListPage(fake_driver)
+        empty = LocatorIndex(str(tmp_path / "missing.json"))
+        page.locator_index = lambda: empty
+        page.settings = page.settings.with_overrides(ADD_ITEM_DELAY=0)
+
+        with caplog.at_level(logging.INFO, logger="pages.base_page"):
+            assert page.locate("add_button", page._add_button_by_elimination) is not None
+            assert page.add_item("Milk", 2)
+        assert page.get_items() == ["Milk\nx2"]
+        assert not [r for r in caplog.records if "locator index" in r.getMessage()]
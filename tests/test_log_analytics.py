@@ -0,0 +1,102 @@
+"""
+Test Suite for the Log Analytics Tool
+Runs offline - no device required
+"""
+import os
+import shutil
+import pytest
+import logging
+from utils.log_analytics import LogIndex, main, parse_log
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+SAMPLE_LOG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "sample_test_run.log")
+
+
+def copy_log(directory, name, day=None):
+    """Copy the sample log into directory, optionally moved to another day"""
+    path = os.path.join(directory, name)
+    with open(SAMPLE_LOG, encoding="utf-8") as handle:
+        text = handle.read()
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(text.replace("2025-12-08", day) if day else text)
+    return path
+
+
+class TestLogAnalytics:
+    """Test cases for utils/log_analytics.py on copies of logs/sample_test_run.log"""
+
+    @pytest.mark.regression
+    def test_parse_derives_timed_events(self, tmp_path):
+        """Test driver starts, tests and page actions are timed, tracebacks and CRLF lines tolerated"""
+        path = copy_log(tmp_path, "test_run_1.log")
+        with open(path, "a", encoding="utf-8", newline="") as handle:
+            handle.write("2025-12-08 18:55:49,000 - pages.base_page - ERROR - Lookup failed 'x'\r\n"
+                         "Traceback (most recent call last):\r\n  File \"a.py\", line 1\r\n"
+                         "2025-12-08 18:55:50,500 - pages.base_page - INFO - Retried 3 times\r\n")
+
+        parsed = parse_log(path)
+
+        durations = {key: list(values) for key, values in parsed.durations.items()}
+        assert durations["driver_start", "driver_start", b"2025-12-08"] == pytest.approx([12.1, 10.899])
+        assert durations["app_init", "app_init", b"2025-12-08"] == pytest.approx([5.001, 5.001])
+        assert durations["test", "test_delete_item", b"2025-12-08"] == pytest.approx([25.187])
+        assert durations["page_action", "base_page: Retried # times", b"2025-12-08"] == pytest.approx([1.5])
+        assert ("page_action", "shopping_list_page: Clicking delete button at index # for item #",
+                b"2025-12-08") in durations
+        seconds, name, at, detail = parsed.slowest["page_action"][0]
+        assert (seconds, at) == (pytest.approx(6.166), "2025-12-08 18:54:26,639")
+        assert detail == "pages.home_page: Shopping List button clicked successfully"
+        assert parsed.slowest["test"][0][3] == "tests.test_shopping_list"
+
+    @pytest.mark.regression
+    def test_index_skips_unchanged_files(self, tmp_path):
+        """Test only new or changed logs are parsed and deleted logs leave the index"""
+        logs = tmp_path / "logs"
+        logs.mkdir()
+        first = copy_log(logs, "test_run_1.log")
+        copy_log(logs, "test_run_2.log", day="2025-12-09")
+        copy_log(logs, "other.log")
+        index = LogIndex(str(tmp_path / "index.sqlite3"))
+        try:
+            assert index.update(str(logs), jobs=1)["indexed"] == 2
+            assert index.update(str(logs), jobs=1)["skipped"] == 2
+
+            with open(first, "a", encoding="utf-8") as handle:
+                handle.write("2025-12-08 19:00:00,000 - conftest - INFO - [Setup] Starting Appium driver...\n"
+                             "2025-12-08 19:00:20,000 - conftest - INFO - Appium driver started successfully\n")
+            result = index.update(str(logs), jobs=1)
+            assert (result["indexed"], result["skipped"]) == (1, 1)
+
+            by_day = {group["group"]: group for group in index.stats("driver_start", by="day")}
+            assert {day: group["count"] for day, group in by_day.items()} == {"2025-12-08": 3, "2025-12-09": 2}
+            assert by_day["2025-12-08"]["p95"] == pytest.approx(20.0)
+            assert index.slowest("driver_start", limit=1)[0]["file"] == "test_run_1.log"
+
+            os.remove(first)
+            assert index.update(str(logs), jobs=1)["removed"] == 1
+            assert [group["group"] for group in index.stats("driver_start")] == ["2025-12-09"]
+        finally:
+            index.close()
+
+    @pytest.mark.regression
+    def test_cli_answers_slowest_page_action(self, tmp_path, capsys):
+        """Test the command line indexes with worker processes and ranks page actions"""
+        logs = tmp_path / "logs"
+        logs.mkdir()
+        for number in range(3):
+            copy_log(logs, f"test_run_{number}.log")
+        shutil.copy(SAMPLE_LOG, logs / "sample_test_run.log")
+
+        assert main(["--logs", str(logs), "--jobs", "2", "stats", "page_action", "--by", "name", "--limit", "1"]) == 0
+        output = capsys.readouterr()
+        assert "Indexed 3 logs" in output.err
+        assert output.out.splitlines()[1].startswith("home_page: Shopping List button clicked successfully")
+
+        assert main(["--logs", str(logs), "slowest", "page_action", "--limit", "2"]) == 0
+        output = capsys.readouterr()
+        assert "skipped 3 unchanged" in output.err
+        assert len(output.out.splitlines()) == 2
+        logger.info(f"[PASS] {output.out.splitlines()[0]}")
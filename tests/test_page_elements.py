@@ -0,0 +1,106 @@
+"""
+Test Suite for Declarative Page Elements
+Runs offline against the fake Appium server - no device required
+"""
+import pytest
+import logging
+import threading
+from pages.locators import AppiumBy
+from pages.base_page import BasePage
+from pages.elements import ELEMENT_TIMINGS, AccessibilityId, ClassName, Element, Text
+from pages.home_page import HomePage
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class QuickHomePage(BasePage):
+    """Home page elements with short timeouts, for negative checks"""
+    web_search = Element(AccessibilityId("Web Search"), timeout=1)
+    back = Element(AccessibilityId("Back"), timeout=1)
+
+
+class TestPageElements:
+    """Test cases for Element descriptors and compiled lookup plans"""
+
+    @pytest.mark.smoke
+    def test_lookup_plan_merges_accessibility_ids(self):
+        """Test the three home buttons compile into one UiSelector query"""
+        assert list(HomePage.ELEMENTS) == ["web_search", "open_gmail", "shopping_list"]
+
+        queries = HomePage.LOOKUP_PLAN.queries()
+        assert len(queries) == 1
+        assert queries[0].by == AppiumBy.ANDROID_UIAUTOMATOR
+        assert queries[0].value == (
+            'new UiSelector().descriptionMatches("^(Open Gmail|Shopping List|Web Search)$")'
+        )
+        assert HomePage.LOOKUP_PLAN.queries() is queries, "Plans should be compiled once"
+
+    @pytest.mark.regression
+    def test_plan_escapes_and_keeps_unmergeable_locators(self):
+        """Test regex/quote escaping and separate queries for unmergeable locators"""
+        class Page(BasePage):
+            price = Element(Text('Total: $5 "approx."'))
+            note = Element(Text("a|b"))
+            field = Element(ClassName("android.widget.EditText"))
+
+        queries = {query.by: query for query in Page.LOOKUP_PLAN.queries()}
+        assert queries[AppiumBy.CLASS_NAME].members == {None: "field"}
+        merged = queries[AppiumBy.ANDROID_UIAUTOMATOR]
+        assert merged.value == 'new UiSelector().textMatches("^(a\\\\|b|Total: \\\\$5 \\"approx\\\\.\\")$")'
+        assert merged.members == {"a|b": "note", 'Total: $5 "approx."': "price"}
+
+    @pytest.mark.regression
+    def test_all_buttons_visible_in_one_round_trip(self, fake_driver, fake_appium_server):
+        """Test the merged plan checks all buttons with a single command"""
+        home_page = HomePage(fake_driver)
+        fake_appium_server.command_counts.clear()
+
+        assert home_page.are_all_buttons_visible()
+        assert fake_appium_server.command_counts["execute_script"] == 1
+        assert fake_appium_server.command_counts["find_element"] == 0
+
+        # Located elements are cached on the page, so the click needs no lookup
+        fake_appium_server.command_counts.clear()
+        assert home_page.click_shopping_list_button()
+        assert fake_appium_server.command_counts["find_element"] == 0
+        logger.info(f"[PASS] Commands used: {dict(fake_appium_server.command_counts)}")
+
+    @pytest.mark.regression
+    def test_all_buttons_check_waits_for_home_screen(self, fake_driver, fake_appium_server):
+        """Test the merged button check waits for buttons that appear shortly after navigation"""
+        app = fake_appium_server.sessions[fake_driver.session_id].app
+        app.open_shopping_list()
+        returning = threading.Timer(0.5, app.back)
+        returning.start()
+        try:
+            assert HomePage(fake_driver).are_all_buttons_visible()
+        finally:
+            returning.cancel()
+
+    @pytest.mark.regression
+    def test_elements_resolve_lazily_and_once(self, fake_driver, fake_appium_server):
+        """Test an element is looked up on first use only, and actions are timed"""
+        home_page = HomePage(fake_driver)
+        fake_appium_server.command_counts.clear()
+        calls_before = ELEMENT_TIMINGS[("HomePage", "web_search", "is_visible")][0]
+
+        assert fake_appium_server.command_counts["find_element"] == 0
+        assert home_page.is_web_search_button_visible()
+        assert home_page.is_web_search_button_visible()
+
+        assert fake_appium_server.command_counts["find_element"] == 1
+        assert ELEMENT_TIMINGS[("HomePage", "web_search", "is_visible")][0] == calls_before + 2
+
+    @pytest.mark.regression
+    def test_stale_element_is_located_again(self, fake_driver):
+        """Test a cached element that left the screen is re-resolved, not reused"""
+        page = QuickHomePage(fake_driver)
+        assert page.web_search.is_visible()
+        assert not page.back.is_visible()
+
+        assert HomePage(fake_driver).click_shopping_list_button()
+        assert not page.web_search.is_visible()
+        assert page.back.is_visible()
+
@@ -0,0 +1,122 @@
+"""
+Test Suite for the App Performance Sampler
+Runs offline against the fake Appium server - no device required
+"""
+import pytest
+import logging
+import time
+from array import array
+from utils import perf_sampler
+from utils.perf_sampler import PerfSampler, result_properties
+from utils.stats import percentile
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+APP_PACKAGE = "com.example.my_app"
+
+
+class FakeClock:
+    """Clock that only moves when advanced, so sampling cost and waits are exact"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakeStopEvent:
+    """Stop event whose waits advance the fake clock instead of sleeping
+
+    It is set by the sampler's own thread after `rounds` waits; stop() only joins it.
+    """
+
+    def __init__(self, clock, rounds):
+        self.clock = clock
+        self.rounds = rounds
+        self.waits = []
+
+    def is_set(self):
+        return len(self.waits) >= self.rounds
+
+    def set(self):
+        pass
+
+    def wait(self, timeout):
+        self.waits.append(timeout)
+        self.clock.advance(timeout)
+        return self.is_set()
+
+
+class TestPerfSampler:
+    """Test cases for utils/perf_sampler.py against stub performance data"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_support(self, monkeypatch, fake_appium_server):
+        """Forget which data types earlier tests found (un)supported"""
+        monkeypatch.setattr(perf_sampler, "_UNSUPPORTED", {})
+        monkeypatch.setattr(perf_sampler, "_SUPPORTED", set())
+        monkeypatch.setattr(fake_appium_server, "disabled_scripts", set())
+
+    @pytest.mark.regression
+    def test_samples_are_columnar_with_percentiles(self, fake_driver):
+        """Test every data type is sampled into aligned arrays and summarized as percentiles"""
+        sampler = PerfSampler(fake_driver, APP_PACKAGE, interval=0.02, max_overhead=1.0).start()
+        time.sleep(0.3)
+        summary = sampler.stop()
+
+        assert all(isinstance(values, array) for values in sampler.columns.values())
+        assert {len(values) for values in sampler.columns.values()} == {len(sampler.times)}
+        assert len(sampler.times) >= 5
+        assert 8 <= summary["cpu_percent"]["p50"] <= summary["cpu_percent"]["p95"] <= 14
+        assert summary["total_pss_kb"]["max"] == 80000
+        assert summary["frame_p90_ms"]["p95"] == 12
+        assert 0 < summary["frames"]["rendered"] <= 60 * 0.5
+        properties = dict(result_properties(summary))
+        assert properties["perf.cpu_percent.p95"] == summary["cpu_percent"]["p95"]
+        assert properties["perf.sampler.samples"] == len(sampler.times)
+        logger.info(f"[PASS] {summary}")
+
+    @pytest.mark.regression
+    @pytest.mark.parametrize("cost, waits, stretched", [(0.01, 0.04, 5), (0.001, 0.009, 0)])
+    def test_overhead_is_bounded(self, fake_driver, monkeypatch, cost, waits, stretched):
+        """Test slow sampling rounds stretch the interval to stay within the overhead budget"""
+        clock = FakeClock()
+        sampler = PerfSampler(fake_driver, APP_PACKAGE, interval=0.01, data_types=("cpuinfo",),
+                              max_overhead=0.2, clock=clock)
+        monkeypatch.setattr(sampler, "_read", lambda data_type: clock.advance(cost) or {"cpu_percent": 10.0})
+        sampler._stop = FakeStopEvent(clock, rounds=5)
+
+        summary = sampler.start().stop()["sampler"]
+
+        assert sampler._stop.waits == pytest.approx([waits] * 5)
+        assert (summary["rounds"], summary["samples"], summary["stretched"]) == (5, 5, stretched)
+        assert summary["overhead"] == pytest.approx(min(cost / 0.01, 0.2), abs=1e-4)
+
+    @pytest.mark.regression
+    def test_unavailable_data_type_is_dropped(self, fake_driver, fake_appium_server):
+        """Test a data type the driver refuses is dropped for the process while the others keep sampling"""
+        fake_appium_server.disabled_scripts.add("mobile: shell")
+        sampler = PerfSampler(fake_driver, APP_PACKAGE, interval=0.02, max_overhead=1.0).start()
+        time.sleep(0.1)
+        summary = sampler.stop()
+
+        assert "frames" not in summary and "frame_p90_ms" not in summary
+        assert "cpu_percent" in summary
+        assert "gfxinfo" in perf_sampler._UNSUPPORTED
+        assert PerfSampler(fake_driver, APP_PACKAGE).data_types == ["cpuinfo", "memoryinfo"]
+
+    @pytest.mark.regression
+    def test_percentile_nearest_rank(self):
+        """Test the nearest-rank percentile on small samples"""
+        values = array("d", [5, 1, 4, 2, 3])
+        assert (percentile(values, 0.5), percentile(values, 0.95), percentile(values, 0.0)) == (3, 5, 1)
+        assert (percentile([1, 2], 0.5), percentile(range(1, 7), 0.5), percentile(range(1, 11), 0.5)) == (1, 3, 5)
+        assert (percentile(range(1, 21), 0.95), percentile(range(1, 101), 0.07), percentile(range(1, 11), 1.0)) == \
+            (19, 7, 10)
+        assert percentile(array("d"), 0.5) is None
@@ -0,0 +1,131 @@
+"""
+Test Suite for the Screen Affinity Plugin
+Runs offline against the fake Appium server - no device required
+"""
+import pytest
+import logging
+# Imported here, not first inside the in-process pytester runs below: pytester drops
+# modules first imported by an inner run, and later tests would get a second
+# WebDriver class that plugins patching WebDriver.execute never see
+import appium.webdriver  # noqa: F401
+from config import settings as settings_module
+from config.settings import get_settings
+from plugins.screen_affinity import group_by_screen, page_class_for
+from pages.shopping_list_page import ShoppingListPage
+
+pytest_plugins = ["pytester"]
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+DRIVER_CONFTEST = '''
+import pytest
+from appium import webdriver
+from appium.options.android import UiAutomator2Options
+from config.settings import get_settings
+
+
+def _start():
+    return webdriver.Remote("{url}", options=UiAutomator2Options().load_capabilities(
+        get_settings().desired_capabilities))
+
+
+@pytest.fixture
+def driver(request):
+    affinity = request.config.pluginmanager.get_plugin("screen_affinity_instance")
+    if affinity is None:
+        appium_driver = _start()
+        yield appium_driver
+        appium_driver.quit()
+        return
+    appium_driver = affinity.acquire(request.node, _start)
+    yield appium_driver
+    affinity.release(request.node, appium_driver, lambda d: d.quit())
+'''
+
+SAMPLE_TESTS = '''
+import pytest
+
+
+@pytest.mark.screen("shopping_list")
+def test_add(screen_page):
+    assert screen_page.get_item_count() == 0
+    assert screen_page.add_item("Milk", 2)
+
+
+def test_unmarked():
+    pass
+
+
+@pytest.mark.screen("shopping_list")
+def test_add_again(screen_page):
+    assert screen_page.get_item_count() == 0
+    assert screen_page.add_item("Bread", 1)
+
+
+@pytest.mark.screen("shopping_list")
+def test_fails(screen_page):
+    assert screen_page.add_item("Eggs", 12)
+    assert False, "leaves the screen dirty"
+
+
+@pytest.mark.screen("shopping_list")
+def test_after_failure(screen_page):
+    assert screen_page.get_item_count() == 0
+'''
+
+
+class FakeItem:
+    def __init__(self, name, screen=None):
+        self.name = name
+        self.screen = screen
+
+    def get_closest_marker(self, name):
+        return pytest.mark.screen(self.screen).mark if self.screen else None
+
+
+class TestScreenAffinity:
+    """Test cases for plugins/screen_affinity.py"""
+
+    @pytest.fixture
+    def fast_navigation(self, monkeypatch):
+        monkeypatch.setattr(settings_module, "_settings", get_settings().with_overrides(NAVIGATION_DELAY=0.1))
+
+    @pytest.mark.regression
+    def test_groups_keep_first_position(self):
+        """Test tests of one screen become adjacent at their first test's position"""
+        items = [FakeItem("a", "list"), FakeItem("b"), FakeItem("c", "home"), FakeItem("d", "list"),
+                 FakeItem("e"), FakeItem("f", "home")]
+        assert [item.name for item in group_by_screen(items)] == ["a", "d", "b", "c", "f", "e"]
+        assert page_class_for("shopping_list") is ShoppingListPage
+        with pytest.raises(LookupError):
+            page_class_for("settings")
+
+    @pytest.mark.regression
+    def test_navigation_is_shared_within_group(self, pytester, fake_appium_server, fast_navigation):
+        """Test a group reuses the driver and screen until a test fails, and reports what it saved"""
+        pytester.makeconftest(DRIVER_CONFTEST.format(url=fake_appium_server.url))
+        pytester.makepyfile(test_sample=SAMPLE_TESTS)
+
+        result = pytester.runpytest("-p", "plugins.screen_affinity", "--screen-affinity", "-v")
+
+        result.assert_outcomes(passed=4, failed=1)
+        result.stdout.fnmatch_lines([
+            "*test_add PASSED*", "*test_add_again PASSED*", "*test_fails FAILED*",
+            "*test_after_failure PASSED*", "*test_unmarked PASSED*",
+            "*Navigations saved: 2 (of 4), leaves saved: 2, driver starts saved: 2, ~* s saved",
+        ])
+        assert not fake_appium_server.sessions, "held driver was not quit"
+
+    @pytest.mark.regression
+    def test_without_option_every_test_navigates(self, pytester, fake_appium_server, fast_navigation):
+        """Test the marker alone keeps the order and opens the screen from a fresh driver per test"""
+        pytester.makeconftest(DRIVER_CONFTEST.format(url=fake_appium_server.url))
+        pytester.makepyfile(test_sample=SAMPLE_TESTS)
+
+        result = pytester.runpytest("-p", "plugins.screen_affinity", "-v")
+
+        result.assert_outcomes(passed=4, failed=1)
+        result.stdout.fnmatch_lines(["*test_add PASSED*", "*test_unmarked PASSED*", "*test_add_again PASSED*"])
+        result.stdout.no_fnmatch_line("*screen affinity*")
@@ -0,0 +1,94 @@
+"""
+Test Suite for Screen Stability Detection
+Runs offline against the fake Appium server - no device required
+"""
+import pytest
+import logging
+import time
+from pages import base_page
+from pages.home_page import HomePage
+from pages.shopping_list_page import ShoppingListPage
+from pages.stability import ScreenStats, fingerprint, volatile_pattern, wait_until_stable
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 4))
+        self.now += seconds
+
+
+class TestScreenStability:
+    """Test cases for fingerprint sampling and BasePage.wait_until_stable()"""
+
+    @pytest.mark.regression
+    def test_interval_adapts_to_changes(self):
+        """Test the pause grows while samples match, resets on a change, and the pre-action state never counts"""
+        clock = FakeClock()
+        samples = iter(["before", "before", "moving", "final", "final", "final"])
+        stats = ScreenStats()
+
+        stable, settle, count = wait_until_stable(lambda: next(samples), stats, matches=3, since="before",
+                                                  min_interval=0.1, max_interval=0.2, clock=clock, sleep=clock.sleep)
+
+        assert (stable, count) == (True, 6)
+        assert clock.sleeps == [0.1, 0.1, 0.1, 0.1, 0.15]
+        assert settle == pytest.approx(0.3)
+        # The next wait on this screen skips its usual settle time before sampling again
+        clock.sleeps.clear()
+        wait_until_stable(lambda: "same", stats, matches=2, min_interval=0.1, max_interval=0.5,
+                          clock=clock, sleep=clock.sleep)
+        assert clock.sleeps == [pytest.approx(0.3)]
+
+    @pytest.mark.regression
+    def test_timeout_is_recorded(self):
+        """Test a screen that never settles times out and counts as a timeout for its screen"""
+        clock = FakeClock()
+        counter = iter(range(1000))
+        stats = ScreenStats()
+
+        stable, _, _ = wait_until_stable(lambda: next(counter), stats, timeout=1.0, min_interval=0.1,
+                                         clock=clock, sleep=clock.sleep)
+
+        assert not stable
+        assert clock.now == pytest.approx(1.0)
+        assert stats.summary()["timeouts"] == 1
+
+    @pytest.mark.regression
+    def test_fingerprint_ignores_volatile_attributes(self):
+        """Test focus changes do not change the fingerprint but moved bounds do"""
+        pattern = volatile_pattern(["focused", "selected"])
+        source = '<node focused="false" bounds="[0,600][900,740]" />'
+        assert fingerprint(source, pattern) == fingerprint(source.replace('focused="false"', 'focused="true"'), pattern)
+        assert fingerprint(source, pattern) != fingerprint(source.replace("600", "640"), pattern)
+
+    @pytest.mark.regression
+    def test_add_item_waits_for_animation(self, fake_driver, fake_appium_server, monkeypatch):
+        """Test add_item returns once the row stopped moving, well before the old fixed delay"""
+        monkeypatch.setattr(base_page, "_SCREEN_STATS", {})
+        assert HomePage(fake_driver).click_shopping_list_button(), "Failed to open Shopping List"
+        fake_appium_server.sessions[fake_driver.session_id].app.animation_seconds = 0.4
+        page = ShoppingListPage(fake_driver)
+        page.settings = page.settings.with_overrides(ADD_ITEM_DELAY=3.0)
+
+        start = time.monotonic()
+        assert page.add_item("Milk", 2)
+        elapsed = time.monotonic() - start
+
+        assert 0.4 <= elapsed < 1.5
+        items = page.get_shopping_items()
+        assert [(item.name, item.bounds[1]) for item in items] == [("Milk", 600)]
+        stats = base_page.stability_stats()["ShoppingListPage"]
+        assert (stats["waits"], stats["timeouts"]) == (1, 0)
+        assert stats["mean_settle_ms"] >= 300
+        logger.info(f"[PASS] add_item settled in {elapsed:.2f}s: {stats}")
@@ -0,0 +1,174 @@
+"""
+Test Suite for the Session Keepalive Manager
+Runs offline against the fake Appium server - no device required
+"""
+import pytest
+import logging
+import threading
+import time
+from config.settings import get_settings
+from utils.http_transport import create_connection
+from utils.session_keepalive import KeepaliveManager
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class TestSessionKeepalive:
+    """Test cases for keeping idle sessions alive, releasing them and rebuilding them"""
+
+    def _factory(self, fake_appium_server, settings):
+        """Helper method returning a factory of sessions on the fake server"""
+        from appium import webdriver
+        from appium.options.android import UiAutomator2Options
+
+        def start():
+            return webdriver.Remote(
+                create_connection(fake_appium_server.url, settings),
+                options=UiAutomator2Options().load_capabilities(settings.desired_capabilities),
+            )
+        return start
+
+    @pytest.fixture
+    def clock(self, fake_appium_server, monkeypatch):
+        """Fake time shared by the manager and the fake server's session expiry"""
+        now = [1000.0]
+        monkeypatch.setattr(fake_appium_server, "clock", lambda: now[0])
+        return now
+
+    @pytest.mark.regression
+    def test_pings_keep_idle_session_alive(self, fake_appium_server, clock):
+        """Test an idle session outlives newCommandTimeout thanks to pings, without a rebuild"""
+        settings = get_settings().with_overrides(NEW_COMMAND_TIMEOUT=60, KEEPALIVE_MARGIN=10.0)
+        manager = KeepaliveManager(settings, clock=lambda: clock[0])
+        try:
+            handle = manager.register(self._factory(fake_appium_server, settings), name="idle")
+            session_id = handle.driver.session_id
+            assert manager.tick() == pytest.approx(50.0)
+
+            for _ in range(3):
+                clock[0] += 50.0
+                assert manager.tick() == pytest.approx(50.0)
+
+            assert handle.driver.session_id == session_id
+            assert handle.driver.current_package
+            stats = manager.stats()
+            assert (stats["pings"], stats["rebuilds_avoided"], stats["rebuilds"]) == (3, 1, 0)
+            logger.info(f"[PASS] Session kept alive: {stats}")
+        finally:
+            manager.close()
+        assert session_id not in fake_appium_server.sessions
+
+    @pytest.mark.regression
+    def test_expired_session_is_rebuilt_on_next_use(self, fake_appium_server, clock):
+        """Test a session that expired without pings is replaced transparently"""
+        settings = get_settings().with_overrides(NEW_COMMAND_TIMEOUT=60)
+        manager = KeepaliveManager(settings, clock=lambda: clock[0])  # Nothing ticks: no pings
+        try:
+            handle = manager.register(self._factory(fake_appium_server, settings))
+            old_id = handle.driver.session_id
+            clock[0] += 61.0
+            assert fake_appium_server.sessions[old_id].expired(clock[0])
+
+            assert handle.driver.current_package
+            assert handle.driver.session_id != old_id
+            stats = manager.stats()
+            assert (stats["expired"], stats["rebuilds"], stats["pings"]) == (1, 1, 0)
+        finally:
+            manager.close()
+
+    @pytest.mark.regression
+    def test_keepalive_thread_pings(self, fake_appium_server):
+        """Test the background thread pings a session before the server would drop it"""
+        settings = get_settings().with_overrides(NEW_COMMAND_TIMEOUT=1, KEEPALIVE_MARGIN=0.5)
+        manager = KeepaliveManager(settings).start()
+        try:
+            handle = manager.register(self._factory(fake_appium_server, settings), name="idle")
+            handle.driver.session_id
+            deadline = time.monotonic() + 5
+            while manager.stats()["pings"] < 1 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert manager.stats()["pings"] >= 1
+        finally:
+            manager.close()
+
+    @pytest.mark.regression
+    def test_session_start_does_not_block_other_sessions(self, fake_appium_server):
+        """Test ticks and other sessions are served while a new session is being created"""
+        settings = get_settings().with_overrides(NEW_COMMAND_TIMEOUT=60)
+        manager = KeepaliveManager(settings)
+        factory = self._factory(fake_appium_server, settings)
+        starting, proceed = threading.Event(), threading.Event()
+
+        def slow_factory():
+            starting.set()
+            proceed.wait(5)
+            return factory()
+
+        try:
+            ready = manager.register(factory, name="ready")
+            ready.driver.session_id
+            slow = manager.register(slow_factory, name="slow")
+            opener = threading.Thread(target=lambda: slow.driver)
+            opener.start()
+            assert starting.wait(5)
+
+            served = threading.Thread(target=lambda: (manager.tick(), ready.driver.current_package))
+            served.start()
+            served.join(2)
+            assert not served.is_alive(), "manager lock held while the slow session starts"
+
+            proceed.set()
+            opener.join(5)
+            assert slow.live and manager.stats()["live"] == 2
+        finally:
+            proceed.set()
+            manager.close()
+
+    @pytest.mark.regression
+    def test_pressure_releases_longest_idle_session(self, fake_appium_server):
+        """Test the longest-idle session is quit when a new one would exceed KEEPALIVE_MAX_SESSIONS"""
+        settings = get_settings().with_overrides(KEEPALIVE_MAX_SESSIONS=1)
+        manager = KeepaliveManager(settings)
+        try:
+            first = manager.register(self._factory(fake_appium_server, settings), name="first")
+            second = manager.register(self._factory(fake_appium_server, settings), name="second")
+            first_id = first.driver.session_id
+            second.driver.current_package
+
+            assert list(fake_appium_server.sessions) == [second.driver.session_id]
+            assert first.driver.session_id != first_id
+            assert len(fake_appium_server.sessions) == 1
+            stats = manager.stats()
+            assert (stats["releases"], stats["rebuilds"], stats["live"]) == (2, 1, 1)
+        finally:
+            manager.close()
+
+    @pytest.mark.regression
+    def test_long_idle_session_is_released_instead_of_pinged(self, fake_appium_server):
+        """Test pings stop once a session has been idle longer than KEEPALIVE_MAX_IDLE"""
+        now = [0.0]
+        settings = get_settings().with_overrides(NEW_COMMAND_TIMEOUT=300, KEEPALIVE_MARGIN=30.0,
+                                                 KEEPALIVE_MAX_IDLE=600.0)
+        manager = KeepaliveManager(settings, clock=lambda: now[0])
+        try:
+            handle = manager.register(self._factory(fake_appium_server, settings))
+            handle.driver.current_package
+
+            now[0] = 100.0
+            assert manager.tick() == pytest.approx(170.0)
+            now[0] = 275.0
+            manager.tick()
+            now[0] = 545.0
+            manager.tick()
+            assert manager.stats()["pings"] == 2
+            now[0] = 700.0
+            assert manager.tick() is None
+
+            assert fake_appium_server.sessions == {}
+            assert manager.stats()["releases"] == 1
+            assert handle.driver.current_package
+            assert manager.stats()["rebuilds"] == 1
+        finally:
+            manager.close()
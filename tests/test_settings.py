@@ -0,0 +1,96 @@
+"""
+Test Suite for the Layered Settings Loader
+Runs offline - no Appium server or device required
+"""
+import sys
+import pytest
+import logging
+from config.config import Config
+from config.settings import ConfigError, resolve_settings
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class TestSettings:
+    """Test cases for settings layering, validation and immutability"""
+
+    @pytest.mark.smoke
+    def test_defaults_match_config(self):
+        """Test that with no overrides the settings equal the Config defaults"""
+        settings = resolve_settings(environ={})
+        assert settings.APPIUM_SERVER == Config.APPIUM_SERVER
+        assert settings.DEVICE_NAME == Config.DEVICE_NAME
+        assert settings.desired_capabilities['newCommandTimeout'] == Config.NEW_COMMAND_TIMEOUT
+
+    @pytest.mark.regression
+    def test_layer_precedence(self, tmp_path):
+        """Test profile < worker section < environment < command line"""
+        profile = tmp_path / "farm.toml"
+        profile.write_text(
+            'EXPLICIT_WAIT = 30\n'
+            'DEVICE_NAME = "profile-device"\n'
+            'PLATFORM_VERSION = "14"\n'
+            '[workers.gw1]\n'
+            'DEVICE_NAME = "worker-device"\n'
+            'APPIUM_SERVER = "http://farm:4725"\n'
+        )
+        settings = resolve_settings(
+            profile=str(profile),
+            environ={"PYTEST_XDIST_WORKER": "gw1", "APPIUM_EXPLICIT_WAIT": "45", "APPIUM_NO_RESET": "true"},
+            cli_overrides={"PLATFORM_VERSION": "15"},
+        )
+        assert settings.APPIUM_SERVER == "http://farm:4725"
+        assert settings.DEVICE_NAME == "worker-device"
+        assert settings.EXPLICIT_WAIT == 45
+        assert settings.NO_RESET is True
+        assert settings.PLATFORM_VERSION == "15"
+        logger.info(f"[PASS] Resolved sources: {dict(settings.sources)}")
+
+    @pytest.mark.regression
+    def test_yaml_profile(self, tmp_path):
+        """Test that YAML profiles are supported"""
+        profile = tmp_path / "local.yaml"
+        profile.write_text("DEVICE_NAME: yaml-device\nIMPLICIT_WAIT: 5\n")
+        settings = resolve_settings(profile=str(profile), environ={})
+        assert settings.DEVICE_NAME == "yaml-device"
+        assert settings.IMPLICIT_WAIT == 5
+
+    @pytest.mark.regression
+    def test_toml_profile_without_parser(self, tmp_path, monkeypatch):
+        """Test a TOML profile without tomllib or tomli fails with an error naming the package"""
+        profile = tmp_path / "farm.toml"
+        profile.write_text('DEVICE_NAME = "farm-device"\n')
+        monkeypatch.setitem(sys.modules, "tomllib", None)  # As on Python < 3.11
+        monkeypatch.setitem(sys.modules, "tomli", None)
+
+        with pytest.raises(ConfigError, match="tomli"):
+            resolve_settings(profile=str(profile), environ={})
+
+    @pytest.mark.regression
+    @pytest.mark.parametrize("overrides", [
+        {"UNKNOWN_SETTING": "1"},
+        {"EXPLICIT_WAIT": "soon"},
+        {"NO_RESET": "maybe"},
+        {"VISUAL_TOLERANCE": "65"},
+        {"APPIUM_SERVER": "localhost:4723"},
+    ])
+    def test_invalid_values_rejected(self, overrides):
+        """Test that schema validation rejects bad settings"""
+        with pytest.raises(ConfigError):
+            resolve_settings(environ={}, cli_overrides=overrides)
+
+    @pytest.mark.regression
+    def test_settings_are_immutable_and_cached(self):
+        """Test that settings cannot be changed and capabilities are built once"""
+        settings = resolve_settings(environ={})
+        with pytest.raises(AttributeError):
+            settings.DEVICE_NAME = "other"
+        with pytest.raises(TypeError):
+            settings.desired_capabilities['deviceName'] = "other"
+        assert settings.desired_capabilities is settings.desired_capabilities
+
+        derived = settings.with_overrides(DEVICE_NAME="other")
+        assert derived.DEVICE_NAME == "other"
+        assert settings.DEVICE_NAME == Config.DEVICE_NAME
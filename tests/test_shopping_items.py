@@ -0,0 +1,66 @@
+"""
+Test Suite for the Typed Shopping Item Model
+Parser tests run without a driver; delete tests run offline against the fake Appium server
+"""
+import pytest
+import logging
+from pages.home_page import HomePage
+from pages.shopping_list_page import ShoppingListPage
+from pages.shopping_items import (
+    ShoppingItems, assert_has_item, assert_items, assert_no_item, parse_item
+)
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class TestShoppingItems:
+    """Test cases for parsing, exact-name indexing and exact deletes"""
+
+    @pytest.mark.smoke
+    def test_parse_item(self):
+        """Test names with newlines and "x" parse into the right name and quantity"""
+        item = parse_item("Tax 3x\nLine\nx9\nx12", index=4, bounds="[0,600][1080,760]")
+        assert (item.name, item.quantity, item.index, item.bounds) == ("Tax 3x\nLine\nx9", 12, 4, (0, 600, 1080, 760))
+        assert item.desc == "Tax 3x\nLine\nx9\nx12"
+        assert parse_item("日本茶\nx1") == ("日本茶", 1)
+
+        for not_an_item in ["Shopping List", "Box", "Milk\nx", "Milk\nxl", "\nx1", "Total: 3\nx3", "", None]:
+            assert parse_item(not_an_item) is None, repr(not_an_item)
+
+        with pytest.raises(AttributeError):
+            item.note = "no __dict__ on slotted records"
+
+    @pytest.mark.regression
+    def test_index_matches_exact_names(self):
+        """Test lookups are exact and keep duplicates in display order"""
+        items = ShoppingItems.from_descs(["Milkshake\nx2", "Shopping List", "Milk\nx1", "Milk\nx3"])
+
+        assert items.names() == ["Milkshake", "Milk", "Milk"]
+        assert items.get("Milk").index == 1 and items.get("Milk").quantity == 1
+        assert items.count("Milk") == 2
+        assert "Mil" not in items and items.get("Mil") is None
+
+        assert_items(items, [("Milkshake", 2), ("Milk", 1), ("Milk", 3)])
+        assert_has_item(items, "Milk", 3)
+        assert_no_item(items, "Mil")
+        with pytest.raises(AssertionError, match="'Milk' has quantity"):
+            assert_has_item(items, "Milk", 5)
+        with pytest.raises(AssertionError, match="still in shopping list"):
+            assert_no_item(items, "Milkshake")
+
+    @pytest.mark.regression
+    def test_delete_item_uses_exact_name(self, fake_driver, fake_appium_server):
+        """Test deleting "Milk" leaves "Milkshake" and only removes one duplicate"""
+        assert HomePage(fake_driver).click_shopping_list_button(), "Failed to open Shopping List"
+        fake_appium_server.sessions[fake_driver.session_id].app.seed_items(
+            [("Milkshake", 2), ("Milk", 1), ("Milk", 3)]
+        )
+        page = ShoppingListPage(fake_driver)
+        page.settings = page.settings.with_overrides(DELETE_ITEM_DELAY=0)
+
+        assert not page.delete_item("Mil")
+        assert page.delete_item("Milk")
+        assert_items(page.get_shopping_items(), [("Milkshake", 2), ("Milk", 3)])
+        logger.info("[PASS] Exact-name delete kept Milkshake and the second Milk")
@@ -1,11 +1,16 @@
 """
 Test Suite for Shopping List Page Functionality
+
+Tests marked @pytest.mark.screen("shopping_list") start on the Shopping List
+through the screen_page fixture; run with --screen-affinity to keep the
+driver on that screen between them (see plugins/screen_affinity.py).
 """
 import pytest
 import time
 import logging
 from pages.home_page import HomePage
 from pages.shopping_list_page import ShoppingListPage
+from pages.shopping_items import assert_has_item, assert_no_item
 
 # Configure logger for this test module
 logger = logging.getLogger(__name__)
@@ -40,11 +45,12 @@ class TestShoppingList:
         logger.info("Test completed: test_navigate_to_shopping_list")
     
     @pytest.mark.smoke
-    def test_shopping_list_empty_state(self, driver):
+    @pytest.mark.screen("shopping_list")
+    def test_shopping_list_empty_state(self, screen_page):
         """Test Shopping List page shows empty state when no items"""
         logger.info("Starting test: test_shopping_list_empty_state")
         
-        shopping_list_page = self._navigate_to_shopping_list(driver)
+        shopping_list_page = screen_page
         
         # Check if empty state is shown (or if there are existing items)
         items = shopping_list_page.get_items()
@@ -56,17 +62,15 @@ class TestShoppingList:
         else:
             logger.info(f"[INFO] Shopping list has {len(items)} existing items")
         
-        # Navigate back
-        driver.back()
-        time.sleep(2)
         logger.info("Test completed: test_shopping_list_empty_state")
     
     @pytest.mark.regression
-    def test_add_single_item(self, driver):
+    @pytest.mark.screen("shopping_list")
+    def test_add_single_item(self, screen_page):
         """Test adding a single item to shopping list"""
         logger.info("Starting test: test_add_single_item")
         
-        shopping_list_page = self._navigate_to_shopping_list(driver)
+        shopping_list_page = screen_page
         
         # Add item
         test_item = "Milk"
@@ -76,22 +80,19 @@ class TestShoppingList:
         
         # Verify item was added
         time.sleep(2)
-        items = shopping_list_page.get_items()
-        item_found = any(test_item.lower() in str(item).lower() for item in items)
-        assert item_found, f"{test_item} not found in shopping list"
+        items = shopping_list_page.get_shopping_items()
+        assert_has_item(items, test_item, test_quantity)
         logger.info(f"[PASS] Verified {test_item} is in shopping list")
         
-        # Navigate back
-        driver.back()
-        time.sleep(2)
         logger.info("Test completed: test_add_single_item")
     
     @pytest.mark.regression
-    def test_add_multiple_items(self, driver):
+    @pytest.mark.screen("shopping_list")
+    def test_add_multiple_items(self, screen_page):
         """Test adding multiple items to shopping list"""
         logger.info("Starting test: test_add_multiple_items")
         
-        shopping_list_page = self._navigate_to_shopping_list(driver)
+        shopping_list_page = screen_page
         
         # Add multiple items
         items_to_add = [
@@ -109,25 +110,22 @@ class TestShoppingList:
         
         # Verify items were added
         time.sleep(2)
-        all_items = shopping_list_page.get_items()
+        all_items = shopping_list_page.get_shopping_items()
         logger.info(f"Shopping list now has {len(all_items)} items")
         
-        for item_name, _ in items_to_add:
-            item_found = any(item_name.lower() in str(item).lower() for item in all_items)
-            assert item_found, f"{item_name} not found in shopping list"
+        for item_name, quantity in items_to_add:
+            assert_has_item(all_items, item_name, quantity)
             logger.info(f"[PASS] Verified {item_name} is in shopping list")
         
-        # Navigate back
-        driver.back()
-        time.sleep(2)
         logger.info("Test completed: test_add_multiple_items")
     
     @pytest.mark.regression
-    def test_add_item_with_default_quantity(self, driver):
+    @pytest.mark.screen("shopping_list")
+    def test_add_item_with_default_quantity(self, screen_page):
         """Test adding item with default quantity of 1"""
         logger.info("Starting test: test_add_item_with_default_quantity")
         
-        shopping_list_page = self._navigate_to_shopping_list(driver)
+        shopping_list_page = screen_page
         
         # Add item with default quantity
         test_item = "Apple"
@@ -136,22 +134,19 @@ class TestShoppingList:
         
         # Verify item was added
         time.sleep(2)
-        items = shopping_list_page.get_items()
-        item_found = any(test_item.lower() in str(item).lower() for item in items)
-        assert item_found, f"{test_item} not found in shopping list"
+        items = shopping_list_page.get_shopping_items()
+        assert_has_item(items, test_item, 1)
         logger.info(f"[PASS] Verified {test_item} is in shopping list")
         
-        # Navigate back
-        driver.back()
-        time.sleep(2)
         logger.info("Test completed: test_add_item_with_default_quantity")
     
     @pytest.mark.regression
-    def test_delete_item(self, driver):
+    @pytest.mark.screen("shopping_list")
+    def test_delete_item(self, screen_page):
         """Test deleting an item from shopping list"""
         logger.info("Starting test: test_delete_item")
         
-        shopping_list_page = self._navigate_to_shopping_list(driver)
+        shopping_list_page = screen_page
         
         # Add an item first
         test_item = "Orange"
@@ -172,23 +167,20 @@ class TestShoppingList:
         new_count = shopping_list_page.get_item_count()
         logger.info(f"New item count: {new_count}")
         
-        items = shopping_list_page.get_items()
-        item_still_exists = any(test_item.lower() in str(item).lower() for item in items)
-        assert not item_still_exists, f"{test_item} still exists after deletion"
+        items = shopping_list_page.get_shopping_items()
+        assert_no_item(items, test_item)
         assert new_count < initial_count, "Item count did not decrease"
         logger.info(f"[PASS] Verified {test_item} was deleted")
         
-        # Navigate back
-        driver.back()
-        time.sleep(2)
         logger.info("Test completed: test_delete_item")
     
     @pytest.mark.regression
-    def test_add_and_delete_multiple_items(self, driver):
+    @pytest.mark.screen("shopping_list")
+    def test_add_and_delete_multiple_items(self, screen_page):
         """Test adding multiple items and deleting one"""
         logger.info("Starting test: test_add_and_delete_multiple_items")
         
-        shopping_list_page = self._navigate_to_shopping_list(driver)
+        shopping_list_page = screen_page
         
         # Add multiple items
         items_to_add = [
@@ -213,18 +205,13 @@ class TestShoppingList:
         
         # Verify deletion
         time.sleep(2)
-        remaining_items = shopping_list_page.get_items()
-        deleted_item_exists = any(item_to_delete.lower() in str(item).lower() for item in remaining_items)
-        assert not deleted_item_exists, f"{item_to_delete} still exists"
+        remaining_items = shopping_list_page.get_shopping_items()
+        assert_no_item(remaining_items, item_to_delete)
         
         # Verify other items still exist
-        for item_name, _ in items_to_add:
+        for item_name, quantity in items_to_add:
             if item_name != item_to_delete:
-                item_exists = any(item_name.lower() in str(item).lower() for item in remaining_items)
-                assert item_exists, f"{item_name} should still exist but was not found"
+                assert_has_item(remaining_items, item_name, quantity)
                 logger.info(f"[PASS] Verified {item_name} still exists")
         
-        # Navigate back
-        driver.back()
-        time.sleep(2)
         logger.info("Test completed: test_add_and_delete_multiple_items")
@@ -0,0 +1,88 @@
+"""
+Test Suite for Long Shopping Lists (scrolling)
+Runs offline against the fake Appium server - no device required
+"""
+import pytest
+import itertools
+import logging
+from pages.home_page import HomePage
+from pages.shopping_list_page import ShoppingListPage, SCROLL_GESTURE
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+LONG_LIST = [(f"Item {i}", i + 1) for i in range(30)] + [("Milk", 1)] * 4 + [("Bread", 2)]
+
+
+class TestShoppingListScroll:
+    """Test cases for ShoppingListPage.iter_items() on lists longer than the screen"""
+
+    def _open_long_list(self, fake_driver, fake_appium_server):
+        """Helper method to open the Shopping List page with LONG_LIST already added"""
+        assert HomePage(fake_driver).click_shopping_list_button(), "Failed to open Shopping List"
+        fake_appium_server.sessions[fake_driver.session_id].app.seed_items(LONG_LIST)
+        return ShoppingListPage(fake_driver)
+
+    @pytest.mark.regression
+    def test_iter_items_returns_whole_list(self, fake_driver, fake_appium_server):
+        """Test iter_items sees rows beyond the viewport exactly once, in order"""
+        shopping_list_page = self._open_long_list(fake_driver, fake_appium_server)
+
+        visible = shopping_list_page.get_items()
+        assert len(visible) < len(LONG_LIST), "List should be longer than the screen"
+
+        items = list(shopping_list_page.iter_items())
+        assert items == [f"{name}\nx{quantity}" for name, quantity in LONG_LIST]
+        logger.info(f"[PASS] {len(items)} items streamed, {len(visible)} visible at once")
+
+    @pytest.mark.regression
+    def test_iter_items_is_lazy(self, fake_driver, fake_appium_server):
+        """Test stopping early does not scroll or read further viewports"""
+        shopping_list_page = self._open_long_list(fake_driver, fake_appium_server)
+        fake_appium_server.command_counts.clear()
+
+        first_three = list(itertools.islice(shopping_list_page.iter_items(), 3))
+
+        assert first_three == ["Item 0\nx1", "Item 1\nx2", "Item 2\nx3"]
+        assert fake_appium_server.command_counts["page_source"] == 1
+        assert fake_appium_server.command_counts["execute_script"] == 0
+
+    @pytest.mark.regression
+    def test_iter_items_falls_back_to_swipe(self, fake_driver, fake_appium_server):
+        """Test W3C swipes are used when mobile: scrollGesture is unavailable"""
+        shopping_list_page = self._open_long_list(fake_driver, fake_appium_server)
+        fake_driver.mark_extension_absence(SCROLL_GESTURE)
+
+        items = list(shopping_list_page.iter_items())
+
+        assert len(items) == len(LONG_LIST)
+        assert fake_appium_server.command_counts["perform_actions"] > 0
+
+    @pytest.mark.regression
+    @pytest.mark.parametrize("scroll_percent", [0.37, 0.75, 0.9])
+    def test_iter_items_with_clipped_edge_rows(self, fake_driver, fake_appium_server, scroll_percent):
+        """Test rows cut by the viewport edges, whose bounds do not shift with the list, are yielded once"""
+        shopping_list_page = self._open_long_list(fake_driver, fake_appium_server)
+        shopping_list_page._scroll_item_list(
+            shopping_list_page._list_area(shopping_list_page._viewport_items(fake_driver.page_source)), 0.3)
+        heights = {y2 - y1 for _, (_, y1, _, y2) in shopping_list_page._viewport_items(fake_driver.page_source)}
+        assert len(heights) > 1, "Edge rows should be clipped"
+
+        items = list(shopping_list_page.iter_items(scroll_percent=scroll_percent))
+
+        # Iteration starts from the scrolled position, so it yields the rest of the list
+        expected = [f"{name}\nx{quantity}" for name, quantity in LONG_LIST]
+        assert len(items) > len(LONG_LIST) - 5 and items == expected[-len(items):]
+
+    @pytest.mark.regression
+    def test_overlap_ignores_clipped_rows(self):
+        """Test the overlap shift is taken from unclipped rows, and an all-clipped overlap still matches"""
+        page = ShoppingListPage.__new__(ShoppingListPage)
+        previous = [("A", (40, 600, 900, 740)), ("B", (40, 2200, 900, 2340)), ("C", (40, 2360, 900, 2400))]
+        current = [("B", (40, 600, 900, 640)), ("C", (40, 660, 900, 800)), ("D", (40, 820, 900, 960))]
+        assert page._new_viewport_items(previous, current, expected_shift=1700) == [("D", (40, 820, 900, 960))]
+
+        previous = [("A", (40, 2260, 900, 2400))]
+        current = [("A", (40, 600, 900, 700)), ("B", (40, 720, 900, 860))]
+        assert page._new_viewport_items(previous, current, expected_shift=1700) == [("B", (40, 720, 900, 860))]
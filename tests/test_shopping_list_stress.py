@@ -0,0 +1,80 @@
+"""
+Test Suite for Generative Shopping List Stress Testing
+Runs offline against the fake Appium server - no device required
+
+Scale a run with the settings layers, e.g.:
+    pytest tests/test_shopping_list_stress.py --config-override STRESS_EXAMPLES=500
+"""
+import random
+import pytest
+import logging
+from pages.shopping_list_page import ShoppingListPage
+from utils.shopping_list_stress import (
+    Failure, Operation, ShoppingListModel, StressRunner, generate_program, shrink
+)
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class TestShoppingListStress:
+    """Test cases for generated add/delete sequences compared with an in-memory model"""
+
+    @pytest.fixture
+    def open_empty_list(self, fake_driver, fake_appium_server):
+        """Factory opening an empty Shopping List page with UI settle delays disabled"""
+        app = fake_appium_server.sessions[fake_driver.session_id].app
+
+        def factory():
+            app.open_shopping_list()
+            page = ShoppingListPage(fake_driver)
+            page.settings = page.settings.with_overrides(ADD_ITEM_DELAY=0, DELETE_ITEM_DELAY=0)
+            return page
+
+        return factory
+
+    @pytest.mark.regression
+    def test_generated_programs_match_model(self, open_empty_list):
+        """Test random add/delete sequences leave the page identical to the model"""
+        settings = open_empty_list().settings
+        runner = StressRunner(open_empty_list, seed=settings.STRESS_SEED)
+
+        failure = runner.run(examples=settings.STRESS_EXAMPLES, max_operations=settings.STRESS_MAX_OPERATIONS)
+
+        logger.info(f"{runner.runs} runs, {runner.operations} operations")
+        assert failure is None, failure.report()
+
+    @pytest.mark.regression
+    def test_generation_is_reproducible(self):
+        """Test the same seed generates the same programs"""
+        first = [generate_program(random.Random(7), 12) for _ in range(5)]
+        second = [generate_program(random.Random(7), 12) for _ in range(5)]
+        assert first == second
+
+        model = ShoppingListModel()
+        model.add("Milkshake", 2)
+        model.add(" Milk ", 1)
+        assert not model.delete("Mil")
+        assert model.delete("Milk")
+        assert model.rendered() == ["Milkshake\nx2"]
+
+    @pytest.mark.regression
+    def test_shrink_finds_minimal_program(self):
+        """Test shrinking removes irrelevant steps and simplifies names and quantities"""
+        def fails(program):
+            # Synthetic bug: adding an item whose name contains "x" after any other add
+            for step, operation in enumerate(program):
+                if operation.kind == "add" and "x" in operation.name and step > 0:
+                    return Failure(program, step, "synthetic")
+            return None
+
+        program = [Operation("add", "Bread", 3), Operation("delete", "Bread"),
+                   Operation("add", "Eggs", 12), Operation("add", "Tax 3x", 10),
+                   Operation("add", "Milk", 2)]
+        failure = shrink(program, fails)
+
+        assert len(failure.program) == 2
+        assert failure.program[1] == Operation("add", "x", 1)
+        assert failure.program[0].quantity == 1 and len(failure.program[0].name) == 1
+        logger.info(failure.report())
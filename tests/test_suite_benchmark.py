@@ -0,0 +1,79 @@
+"""
+Test Suite for the End-to-End Suite Benchmark
+Runs offline against the fake Appium server - no device required
+"""
+import pytest
+import json
+import logging
+from benchmarks.suite_benchmark import analyze_trace, compare, run_suite, shared_throughput, summarize
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def _span(name, category, ts, dur, tid=0):
+    return {"name": name, "cat": category, "ph": "X", "pid": 0, "tid": tid, "ts": ts, "dur": dur}
+
+
+class TestSuiteBenchmark:
+    """Test cases for splitting suite time and gating on throughput"""
+
+    @pytest.mark.regression
+    def test_trace_split_per_test(self, tmp_path):
+        """Test sleep and command spans are attributed to the enclosing test of the same thread"""
+        trace = tmp_path / "timeline.json"
+        trace.write_text(json.dumps({"traceEvents": [
+            {"ph": "M", "name": "thread_name", "pid": 0, "tid": 0, "args": {"name": "MainThread"}},
+            _span("tests/a.py::test_one", "test", 0, 4_000_000),
+            _span("sleep", "sleep", 100_000, 2_000_000),
+            _span("findElement", "webdriver", 2_500_000, 500_000),
+            _span("click", "webdriver", 3_100_000, 250_000),
+            _span("sleep", "sleep", 200_000, 3_000_000, tid=1),  # Fake server thread
+            _span("tests/a.py::test_two", "test", 5_000_000, 1_000_000),
+        ]}))
+
+        per_test = analyze_trace(str(trace))
+
+        assert per_test["tests/a.py::test_one"] == {
+            "seconds": 4.0, "sleep": 2.0, "commands": 2, "command_seconds": 0.75, "python": 1.25,
+        }
+        assert per_test["tests/a.py::test_two"]["commands"] == 0
+        result = summarize(per_test, wall_seconds=6.0, profile="lan", exit_code=0)
+        assert (result["tests"], result["commands_per_test"], result["tests_per_minute"]) == (2, 1.0, 20.0)
+        assert result["python_seconds"] == pytest.approx(3.25)
+
+    @pytest.mark.regression
+    def test_throughput_gate(self):
+        """Test a throughput drop beyond the threshold or a failing run is reported"""
+        baseline = {"per_test": {"a": {"seconds": 0.6}, "b": {"seconds": 0.6}}, "exit_code": 0}
+
+        def run(seconds, exit_code=0):
+            return {"per_test": {"a": {"seconds": seconds}, "b": {"seconds": seconds}}, "exit_code": exit_code}
+
+        assert compare(run(0.63), baseline, 0.10) == []
+        assert len(compare(run(0.75), baseline, 0.10)) == 1
+        assert len(compare(run(0.5, exit_code=1), baseline, 0.10)) == 1
+
+    @pytest.mark.regression
+    def test_throughput_compares_shared_tests_only(self):
+        """Test added and removed tests change neither run's throughput"""
+        baseline = {"per_test": {"a": {"seconds": 1.0}, "gone": {"seconds": 0.1}}, "exit_code": 0}
+        result = {"per_test": {"a": {"seconds": 1.0}, "slow_new": {"seconds": 30.0}}, "exit_code": 0}
+
+        assert shared_throughput(result, baseline) == (1, 60.0, 60.0)
+        assert compare(result, baseline, 0.10) == []
+        assert compare({"per_test": {"new": {"seconds": 1.0}}, "exit_code": 0}, baseline, 0.10) == [
+            "no tests in common with the baseline; save a new baseline"]
+
+    @pytest.mark.regression
+    def test_run_suite_against_latency_profile(self):
+        """Test a real pytest run is measured end to end"""
+        result = run_suite(["tests/test_shopping_items.py"], "lan", ["-k", "delete_item"])
+
+        assert result["exit_code"] == 0
+        assert result["tests"] == 1
+        assert result["commands"] > 0
+        assert result["wall_seconds"] >= result["sleep_seconds"] + result["command_seconds"]
+        logger.info(f"[PASS] {result['tests']} test, {result['commands']} commands, "
+                    f"{result['wall_seconds']:.2f} s wall")
@@ -0,0 +1,143 @@
+"""
+Test Suite for Text Entry Strategies
+Runs offline against the fake Appium server - no device required
+"""
+import pytest
+import logging
+from selenium.common.exceptions import StaleElementReferenceException
+from pages import base_page, text_entry
+from pages.home_page import HomePage
+from pages.shopping_list_page import ShoppingListPage
+from pages.text_entry import TextEntry, TextEntryError
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+LONG_NAME = "Extra virgin olive oil, cold pressed, 500 ml"
+
+# Modelled latency of each strategy: (fixed seconds, seconds per character)
+STRATEGY_COSTS = {
+    "set_value": (0.02, 0.0),
+    "type": (0.04, 0.0005),
+    "paste": (0.06, 0.0),
+    "send_keys": (0.03, 0.005),
+}
+
+
+class FakeClock:
+    """Clock that only moves by the modelled cost of each text entry strategy"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def costing(self, name, strategy):
+        fixed, per_character = STRATEGY_COSTS[name]
+
+        def timed(driver, element, text):
+            strategy(driver, element, text)
+            self.now += fixed + per_character * len(text)
+        return timed
+
+
+class TestTextEntry:
+    """Test cases for BasePage.enter_text() and ShoppingListPage.add_item()"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_text_entry(self, monkeypatch, fake_appium_server):
+        """Start every test without learned strategies and with all scripts available"""
+        monkeypatch.setattr(base_page, "_TEXT_ENTRIES", {})
+        monkeypatch.setattr(fake_appium_server, "disabled_scripts", set())
+
+    def _open_page(self, fake_driver):
+        """Helper method to open the Shopping List page without the post-add delay"""
+        assert HomePage(fake_driver).click_shopping_list_button(), "Failed to open Shopping List"
+        page = ShoppingListPage(fake_driver)
+        page.settings = page.settings.with_overrides(ADD_ITEM_DELAY=0)
+        return page
+
+    @pytest.mark.regression
+    def test_fastest_strategy_is_picked_per_field(self, fake_driver, fake_appium_server, monkeypatch):
+        """Test every strategy is measured once, then the fastest one is used and verified only once"""
+        clock = FakeClock()
+        for name, strategy in list(text_entry.STRATEGIES.items()):
+            monkeypatch.setitem(text_entry.STRATEGIES, name, clock.costing(name, strategy))
+        monkeypatch.setattr(base_page, "TextEntry",
+                            lambda order, probes: TextEntry(order, probes=probes, clock=clock))
+        page = self._open_page(fake_driver)
+
+        for number in range(6):
+            assert page.add_item(f"{LONG_NAME} #{number}", number + 1)
+        items = page.get_shopping_items()
+        assert [item.name for item in items] == [f"{LONG_NAME} #{number}" for number in range(6)]
+        assert [item.quantity for item in items] == [1, 2, 3, 4, 5, 6]
+
+        stats = base_page.text_entry_stats()["ShoppingListPage.name_field"]
+        assert {name: s["count"] for name, s in stats["strategies"].items()} == \
+            {"set_value": 3, "type": 1, "paste": 1, "send_keys": 1}
+        assert stats["best"] == "set_value"
+
+        fake_appium_server.command_counts.clear()
+        page.add_item("Milk", 2)
+        # Fields are set directly: only the Add button is clicked, no clears, key injection or read-back
+        assert fake_appium_server.command_counts["click"] == 1
+        assert fake_appium_server.command_counts["clear"] == 0
+        assert fake_appium_server.command_counts["get_attribute"] == 0
+        assert fake_appium_server.command_counts["send_keys"] == 0
+        logger.info(f"[PASS] {stats}")
+
+    @pytest.mark.regression
+    def test_unavailable_strategy_falls_back(self, fake_driver, fake_appium_server):
+        """Test a strategy the driver does not support is dropped and the next one enters the text"""
+        fake_appium_server.disabled_scripts.update({"mobile: replaceElementValue", "mobile: type"})
+        page = self._open_page(fake_driver)
+
+        assert page.add_item("Bread", 3)
+        assert page.get_items() == ["Bread\nx3"]
+        stats = base_page.text_entry_stats()["ShoppingListPage.quantity_field"]
+        assert sorted(stats["broken"]) == ["set_value", "type"]
+        assert list(stats["strategies"]) == ["paste"]
+
+    @pytest.mark.regression
+    def test_wrong_field_text_drops_strategy(self, fake_driver, fake_appium_server):
+        """Test a strategy that leaves different text is caught by the read-back and not used again"""
+        page = self._open_page(fake_driver)
+        field = page._edit_text(0)
+        app = fake_appium_server.sessions[fake_driver.session_id].app
+        app.type_text = lambda text: None  # Key events get lost, e.g. no input focus
+        entry = TextEntry(("type", "send_keys"))
+
+        assert entry.enter(fake_driver, "name", field, "Apples") == "send_keys"
+        assert app.name_text == "Apples"
+        assert "type" in entry.stats()["name"]["broken"]
+        assert entry.enter(fake_driver, "name", field, "Pears") == "send_keys"
+
+        with pytest.raises(TextEntryError):
+            TextEntry(("type",)).enter(fake_driver, "name", field, "Plums")
+
+    @pytest.mark.regression
+    def test_transient_error_skips_strategy_for_one_call(self, fake_driver, monkeypatch):
+        """Test a stale element moves on to the next strategy without dropping the failing one"""
+        page = self._open_page(fake_driver)
+        field = page._edit_text(0)
+        failures = [StaleElementReferenceException("stale element reference")]
+
+        def flaky_set_value(driver, element, text):
+            if failures:
+                raise failures.pop()
+            text_entry.set_value(driver, element, text)
+
+        monkeypatch.setitem(text_entry.STRATEGIES, "set_value", flaky_set_value)
+        entry = TextEntry(("set_value", "send_keys"))
+
+        assert entry.enter(fake_driver, "name", field, "Apples") == "send_keys"
+        assert entry.stats()["name"]["broken"] == {}
+        assert entry.enter(fake_driver, "name", field, "Pears") == "set_value"
+        assert field.get_attribute("text") == "Pears"
+
+        failures.append(StaleElementReferenceException("stale element reference"))
+        with pytest.raises(TextEntryError, match="stale element"):
+            TextEntry(("set_value",)).enter(fake_driver, "name", field, "Plums")
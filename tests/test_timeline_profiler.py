@@ -0,0 +1,57 @@
+"""
+Test Suite for the Timeline Profiler Plugin
+Runs offline against the fake Appium server - no device required
+"""
+import json
+import time
+import pytest
+import logging
+from pages.home_page import HomePage
+from plugins.timeline_profiler import TimelineProfiler
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class TestTimelineProfiler:
+    """Test cases for span recording and Chrome trace export"""
+
+    @pytest.mark.regression
+    def test_records_sleep_webdriver_and_page_spans(self, fake_driver, tmp_path):
+        """Test installed profiler records sleeps, driver commands and page methods"""
+        original_sleep = time.sleep
+        profiler = TimelineProfiler(str(tmp_path / "timeline.json"), device="fake")
+        profiler.install()
+        profiler.instrument_pages()
+        try:
+            time.sleep(0.01)
+            HomePage(fake_driver).click_shopping_list_button()
+        finally:
+            profiler.uninstall()
+        assert time.sleep is original_sleep, "uninstall() must restore time.sleep"
+
+        spans = [event for event in profiler.events if event["ph"] == "X"]
+        categories = {event["cat"] for event in spans}
+        assert {"sleep", "webdriver", "page"} <= categories
+        assert "HomePage.click_shopping_list_button" in {event["name"] for event in spans}
+        assert profiler.totals()["sleep"] >= 0.01
+
+    @pytest.mark.regression
+    def test_controller_merges_worker_partials(self, tmp_path):
+        """Test worker partial traces are merged into one file with one process per worker"""
+        path = str(tmp_path / "timeline.json")
+        for worker_id in ("gw0", "gw1"):
+            worker = TimelineProfiler(path, worker_id=worker_id, device="emulator-5554")
+            with worker.span("test_x", "test"):
+                pass
+            worker.write()
+
+        TimelineProfiler(path).write()
+
+        with open(path, encoding="utf-8") as handle:
+            trace = json.load(handle)
+        names = {event["args"]["name"] for event in trace["traceEvents"] if event["name"] == "process_name"}
+        assert names == {"main", "gw0 (emulator-5554)", "gw1 (emulator-5554)"}
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["timeline.json"]
+        logger.info(f"[PASS] Merged {len(trace['traceEvents'])} events")
@@ -0,0 +1,112 @@
+"""
+Test Suite for Screenshot-Based Visual Checks
+Runs offline against the fake Appium server - no device required
+"""
+import os
+import numpy as np
+import pytest
+import logging
+from config import settings as settings_module
+from config.settings import get_settings
+from pages.home_page import HomePage
+from pages.visual_check import (
+    VisualRegion, compare_regions, compute_hashes, hash_to_hex, hex_to_hash, load_baseline, save_baseline,
+)
+
+# Configure logger for this test module
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def synthetic_screen():
+    """Grayscale 200x100 image: a left-to-right gradient box on a flat background"""
+    image = np.full((100, 200), 240.0)
+    image[20:60, 40:120] = np.linspace(0, 255, 80)
+    return image
+
+
+class TestVisualCheck:
+    """Test cases for pages/visual_check.py and the BasePage visual baseline methods"""
+
+    @pytest.fixture
+    def baseline_dir(self, tmp_path, monkeypatch):
+        """Record visual baselines under tmp_path instead of baselines/visual"""
+        monkeypatch.setattr(settings_module, "_settings",
+                            get_settings().with_overrides(VISUAL_BASELINE_DIR=str(tmp_path)))
+        return tmp_path
+
+    @pytest.mark.regression
+    def test_hashes_are_computed_per_region(self):
+        """Test a gradient sets the bright half of every hash row and a flat region sets no bit"""
+        hashes = compute_hashes(synthetic_screen(), [(40, 20, 80, 40), (150, 70, 40, 20), (40, 20, 80, 40)])
+
+        assert hashes.shape == (3, 64)
+        assert hashes[0].reshape(8, 8).tolist() == [[False] * 4 + [True] * 4] * 8
+        assert not hashes[1].any()
+        assert (hashes[0] == hashes[2]).all()
+        assert compute_hashes(synthetic_screen(), []).shape == (0, 64)
+
+    @pytest.mark.regression
+    def test_regions_compare_by_hamming_distance(self):
+        """Test distances count differing bits and stay usable for regions clipped by the screen edge"""
+        image = synthetic_screen()
+        box = VisualRegion("box", (40, 20, 80, 40), compute_hashes(image, [(40, 20, 80, 40)])[0])
+        flipped = box.hash_bits.copy()
+        flipped[:3] = ~flipped[:3]
+        nudged = VisualRegion("nudged", box.bounds, flipped)
+        edge = VisualRegion("edge", (180, 80, 50, 50), compute_hashes(image, [(180, 80, 50, 50)])[0])
+
+        assert compare_regions(image, [box, nudged, edge], tolerance=2) == {"box": 0, "nudged": 3, "edge": 0}
+
+        mirrored = image.copy()
+        mirrored[20:60, 40:120] = mirrored[20:60, 40:120][:, ::-1]
+        assert compare_regions(mirrored, [box], tolerance=6) == {"box": 64}
+        assert compare_regions(image, [], tolerance=6) == {}
+
+    @pytest.mark.regression
+    def test_baseline_file_round_trip(self, tmp_path):
+        """Test hashes survive the hex encoding and baselines survive a save and load"""
+        hash_bits = compute_hashes(synthetic_screen(), [(40, 20, 80, 40)])[0]
+        assert len(hash_to_hex(hash_bits)) == 16
+        assert (hex_to_hash(hash_to_hex(hash_bits)) == hash_bits).all()
+
+        path = str(tmp_path / "nested" / "Page.json")
+        assert load_baseline(path) == {}
+        save_baseline(path, [VisualRegion("box", (40, 20, 80, 40), hash_bits)])
+
+        loaded = load_baseline(path)
+        assert list(loaded) == ["box"]
+        assert loaded["box"].bounds == (40, 20, 80, 40)
+        assert (loaded["box"].hash_bits == hash_bits).all()
+
+    @pytest.mark.regression
+    def test_without_baseline_buttons_are_located(self, fake_driver, fake_appium_server, baseline_dir):
+        """Test the button check falls back to one merged lookup and takes no screenshot"""
+        home_page = HomePage(fake_driver)
+        fake_appium_server.command_counts.clear()
+
+        assert not home_page.has_visual_baseline()
+        assert home_page.are_all_buttons_visible()
+        assert home_page.check_visual_regions(["Web Search"]) == {"Web Search": False}
+        assert fake_appium_server.command_counts["screenshot"] == 0
+        assert fake_appium_server.command_counts["execute_script"] == 1
+
+    @pytest.mark.regression
+    def test_captured_baseline_checks_screenshot(self, fake_driver, fake_appium_server, baseline_dir):
+        """Test a baseline captured from the fake screen passes with one screenshot and fails elsewhere"""
+        regions = HomePage(fake_driver).capture_visual_baseline()
+        assert sorted(regions) == sorted(HomePage.VISUAL_REGIONS)
+        assert os.path.exists(baseline_dir / "HomePage.json")
+
+        home_page = HomePage(fake_driver)
+        fake_appium_server.command_counts.clear()
+        assert home_page.are_all_buttons_visible(tolerance=0)
+        assert fake_appium_server.command_counts["screenshot"] == 1
+        assert fake_appium_server.command_counts["execute_script"] == 0
+
+        assert home_page.check_visual_regions(["Web Search", "Settings"]) == {"Web Search": True, "Settings": False}
+
+        home_page.click_shopping_list_button()
+        results = HomePage(fake_driver).check_visual_regions()
+        logger.info(f"[PASS] Regions on the shopping list screen: {results}")
+        assert not any(results.values())
@@ -0,0 +1,241 @@
+"""
+External-App Lanes
+
+Some checks leave the Flutter app for another package (Web Search opens the
+browser, Open Gmail opens Gmail). A lane decides how such a check is observed
+and how the device gets back to the app afterwards:
+- inline - the original behaviour: back presses and HomePage.return_from_webview()
+- activation - the main session waits for the external package and restores the
+  app with a single mobile: activateApp, which brings the existing task back
+  without popping Flutter routes
+- session - a dedicated secondary session (noReset, no app launch, its own
+  systemPort), started once per run, observes the external app and restores
+  the Flutter app, so the main session's state (element cache, timeouts,
+  context) is untouched
+
+Usage:
+    lane = create_lane(settings.EXTERNAL_APP_LANE, driver, settings)
+    with lane.visit() as visit:
+        home_page.click_web_search_button()
+    assert visit.package != settings.APP_PACKAGE
+"""
+import abc
+import logging
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+LANE_MODES = ("inline", "activation", "session")
+
+
+class ExternalVisit:
+    """Outcome of one trip to an external app
+
+    Attributes:
+        package: Foreground package seen after the trigger (None if the app never left)
+        seconds: Time spent in the external app including recovery
+    """
+
+    __slots__ = ("package", "seconds")
+
+    def __init__(self):
+        self.package = None
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return f"ExternalVisit(package={self.package!r}, seconds={self.seconds:.2f})"
+
+
+class AppLane(abc.ABC):
+    """Base lane: wait for the external app, then restore the Flutter app
+
+    Args:
+        driver: Main Appium session
+        settings: Resolved settings (APP_PACKAGE, EXTERNAL_APP_TIMEOUT)
+    """
+
+    mode = None
+
+    def __init__(self, driver, settings):
+        self.driver = driver
+        self.settings = settings
+        self.app_package = settings.APP_PACKAGE
+        self.visits = 0
+
+    @property
+    def observer(self):
+        """Session used to watch the foreground package and restore the app"""
+        return self.driver
+
+    def _wait_for_package(self, predicate, timeout):
+        """Poll the foreground package until predicate(package) holds"""
+        deadline = time.monotonic() + timeout
+        while True:
+            package = self.observer.current_package
+            if predicate(package) or time.monotonic() >= deadline:
+                return package
+            time.sleep(0.25)
+
+    @abc.abstractmethod
+    def restore(self, visit):
+        """Bring the Flutter app back to the foreground
+
+        Args:
+            visit: ExternalVisit of the trip (package is None if the app was not seen leaving)
+        """
+
+    @contextmanager
+    def visit(self):
+        """Context manager around the action that opens the external app
+
+        The app is restored even when the block raises (e.g. a failed click or
+        assert), so the main session is never left in the external app.
+
+        Yields:
+            ExternalVisit: Filled in once the block exits
+        """
+        visit = ExternalVisit()
+        start = time.perf_counter()
+        try:
+            yield visit
+            package = self._wait_for_package(lambda p: p != self.app_package,
+                                             self.settings.EXTERNAL_APP_TIMEOUT)
+            visit.package = package if package != self.app_package else None
+            logger.info(f"[{self.mode} lane] External app: {visit.package}")
+        finally:
+            self.restore(visit)
+            self.visits += 1
+            visit.seconds = time.perf_counter() - start
+
+    def close(self):
+        """Release lane resources"""
+
+
+class InlineLane(AppLane):
+    """Back presses in the main session (HomePage.return_from_webview)"""
+
+    mode = "inline"
+
+    def restore(self, visit):
+        # Back presses while the app is still in front would leave the screen under test
+        if visit.package is None and self.driver.current_package == self.app_package:
+            return
+        from pages.home_page import HomePage
+        HomePage(self.driver).return_from_webview(wait_time=2)
+
+
+class ActivationLane(AppLane):
+    """Restore the app with one mobile: activateApp, keeping its navigation state"""
+
+    mode = "activation"
+
+    def restore(self, visit):
+        if self.observer.current_package == self.app_package:
+            return
+        self.observer.activate_app(self.app_package)
+        package = self._wait_for_package(lambda p: p == self.app_package, self.settings.EXTERNAL_APP_TIMEOUT)
+        if package != self.app_package:
+            logger.warning(f"App did not come back to the foreground (still {package})")
+
+
+class SecondarySession:
+    """Secondary Appium session on the same device, started on first use
+
+    It attaches without reinstalling or relaunching anything (noReset,
+    autoLaunch off) and uses its own UiAutomator2 systemPort, so it can live
+    next to the main session for the whole run.
+
+    Args:
+        settings: Resolved settings
+        server_url: Appium server URL (defaults to APPIUM_SERVER)
+        connection_factory: Optional callable(server_url) -> command executor
+        keepalive: Optional KeepaliveManager (utils/session_keepalive.py) that
+            keeps the session alive between checks and rebuilds it if it expired
+    """
+
+    def __init__(self, settings, server_url=None, connection_factory=None, keepalive=None):
+        self.settings = settings
+        self.server_url = server_url or settings.APPIUM_SERVER
+        self.connection_factory = connection_factory
+        self._driver = None
+        self._handle = keepalive.register(self._start, name="secondary") if keepalive else None
+
+    def capabilities(self):
+        """Capabilities of the secondary session"""
+        capabilities = dict(self.settings.desired_capabilities)
+        capabilities.pop("app", None)
+        capabilities.update({
+            "noReset": True,
+            "fullReset": False,
+            "autoLaunch": False,
+            "skipDeviceInitialization": True,
+            "systemPort": self.settings.SECONDARY_SYSTEM_PORT,
+        })
+        return capabilities
+
+    def _start(self):
+        from appium import webdriver
+        from appium.options.android import UiAutomator2Options
+
+        executor = self.connection_factory(self.server_url) if self.connection_factory else self.server_url
+        logger.info("Starting secondary session for external-app checks")
+        return webdriver.Remote(executor, options=UiAutomator2Options().load_capabilities(self.capabilities()))
+
+    @property
+    def driver(self):
+        if self._handle is not None:
+            return self._handle.driver
+        if self._driver is None:
+            self._driver = self._start()
+        return self._driver
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.release()
+        elif self._driver is not None:
+            self._driver.quit()
+            self._driver = None
+
+
+class SessionLane(ActivationLane):
+    """Observe and restore from a SecondarySession instead of the main session
+
+    Args:
+        driver: Main Appium session
+        settings: Resolved settings
+        secondary: SecondarySession shared by all tests of the run
+    """
+
+    mode = "session"
+
+    def __init__(self, driver, settings, secondary):
+        super().__init__(driver, settings)
+        self.secondary = secondary
+
+    @property
+    def observer(self):
+        return self.secondary.driver
+
+
+def create_lane(mode, driver, settings, secondary=None):
+    """Build the lane for a mode
+
+    Args:
+        mode: One of LANE_MODES
+        driver: Main Appium session
+        settings: Resolved settings
+        secondary: SecondarySession, required for the "session" mode
+
+    Returns:
+        AppLane: Lane instance
+    """
+    if mode == "inline":
+        return InlineLane(driver, settings)
+    if mode == "activation":
+        return ActivationLane(driver, settings)
+    if mode == "session":
+        if secondary is None:
+            raise ValueError("The 'session' lane needs a SecondarySession")
+        return SessionLane(driver, settings, secondary)
+    raise ValueError(f"Unknown external-app lane '{mode}', expected one of {LANE_MODES}")
@@ -0,0 +1,98 @@
+"""
+Batch Element Query - protocol and reference implementation
+
+A batch query asks the server for every element matching one selector
+together with the attributes the caller needs, in a single execute-script
+round trip instead of one get_attribute call per element.
+
+Request (driver.execute_script(QUERY_SCRIPT, query)):
+    {"using": "class name", "value": "android.widget.Button",
+     "attributes": ["content-desc", "clickable"], "limit": 50}
+
+Response:
+    [{"element": {<W3C element reference>}, "attributes": {"content-desc": "Back", ...}}, ...]
+
+The server side is an Appium plugin (see docs/BATCH_QUERY_PLUGIN.md).
+execute_query() below is the pure-Python reference of that plugin; the fake
+Appium server runs it so the protocol can be tested offline.
+"""
+
+QUERY_SCRIPT = "query: elements"
+W3C_ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+DEFAULT_ATTRIBUTES = ("content-desc",)
+
+
+class QueryError(ValueError):
+    """Raised for malformed batch query requests"""
+
+
+def build_query(using, value, attributes=DEFAULT_ATTRIBUTES, limit=None):
+    """Build a batch query request
+
+    Args:
+        using: Locator strategy (e.g. AppiumBy.CLASS_NAME)
+        value: Locator value
+        attributes: Attribute names to return for each element
+        limit: Optional maximum number of elements
+
+    Returns:
+        dict: Request payload for QUERY_SCRIPT
+    """
+    query = {"using": using, "value": value, "attributes": list(attributes)}
+    if limit is not None:
+        query["limit"] = limit
+    return query
+
+
+def validate_query(query):
+    """Validate a batch query request and fill in defaults
+
+    Args:
+        query: Request payload
+
+    Returns:
+        dict: Normalized request
+    """
+    if not isinstance(query, dict):
+        raise QueryError("Query must be an object")
+    for key in ("using", "value"):
+        if not isinstance(query.get(key), str) or not query[key]:
+            raise QueryError(f"Query '{key}' must be a non-empty string")
+
+    attributes = query.get("attributes", list(DEFAULT_ATTRIBUTES))
+    if not isinstance(attributes, list) or not all(isinstance(name, str) for name in attributes):
+        raise QueryError("Query 'attributes' must be a list of strings")
+
+    limit = query.get("limit")
+    if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool) or limit < 0):
+        raise QueryError("Query 'limit' must be a non-negative integer")
+
+    return {"using": query["using"], "value": query["value"], "attributes": attributes, "limit": limit}
+
+
+def execute_query(backend, query):
+    """Run a batch query against a driver backend (reference implementation)
+
+    The backend is whatever the plugin runs inside; it must provide
+    find_elements(using, value) -> list of element ids and
+    get_attribute(element_id, name) -> str or None. All lookups happen
+    server-side, so the client pays for one round trip.
+
+    Args:
+        backend: Object with find_elements() and get_attribute()
+        query: Request payload
+
+    Returns:
+        list: One {"element": ..., "attributes": {...}} entry per match
+    """
+    query = validate_query(query)
+    element_ids = backend.find_elements(query["using"], query["value"])
+    if query["limit"] is not None:
+        element_ids = element_ids[:query["limit"]]
+    return [
+        {
+            "element": {W3C_ELEMENT_KEY: element_id},
+            "attributes": {name: backend.get_attribute(element_id, name) for name in query["attributes"]},
+        }
+        for element_id in element_ids
+    ]
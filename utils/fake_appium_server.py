@@ -0,0 +1,587 @@
+"""
+Fake Appium Server for offline testing
+
+A small W3C WebDriver server (standard library only) backed by the
+simulated Flutter app in utils/fake_flutter_app.py. It implements the
+subset of the Appium/UiAutomator2 protocol used by the page objects:
+- Sessions, timeouts, status; sessions created with noReset on the same
+  device name share that device's app state (like a second session on a phone);
+  sessions idle longer than appium:newCommandTimeout are terminated
+- Element lookup by accessibility id, class name, UiSelector and XPath
+- Element attribute/text/rect/displayed, click, clear, send keys
+- Back navigation, page source, screenshots
+- W3C pointer actions (swipes scroll the item list, taps click)
+- execute-script: mobile: getCurrentPackage, mobile: activateApp,
+  mobile: scrollGesture, the text entry scripts (mobile: replaceElementValue,
+  mobile: type, mobile: setClipboard/getClipboard, mobile: pressKey), stub
+  performance data (mobile: getPerformanceData cpuinfo/memoryinfo and
+  mobile: shell dumpsys gfxinfo) and the batch query plugin script
+  (utils/batch_query.py)
+
+Implicit waits are accepted but not honoured: lookups answer immediately.
+
+Network conditions can be simulated for transport benchmarks: a fixed
+per-command latency, a one-off cost per new TCP connection (handshake to a
+remote device farm), a bandwidth cap, and gzip responses for clients that
+send Accept-Encoding: gzip. Key injection (send keys, mobile: type) can cost
+a delay per character, scripts can be disabled to mimic an older driver, and
+list changes can animate for a while like the real app.
+
+Usage:
+    python -m utils.fake_appium_server --port 4723
+    pytest --appium-server http://127.0.0.1:4723
+"""
+import argparse
+import base64
+import gzip
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.batch_query import QUERY_SCRIPT, W3C_ELEMENT_KEY, QueryError, execute_query
+from utils.fake_flutter_app import FakeFlutterApp
+
+logger = logging.getLogger(__name__)
+
+_UISELECTOR_CALL = re.compile(r'\.(\w+)\((?:"((?:[^"\\]|\\.)*)"|(true|false|\d+))\)')
+
+
+class WebDriverError(Exception):
+    """W3C error response raised by command handlers"""
+
+    STATUS = {
+        "invalid argument": 400,
+        "invalid selector": 400,
+        "invalid session id": 404,
+        "no such element": 404,
+        "stale element reference": 404,
+        "unknown command": 404,
+        "unknown method": 405,
+    }
+
+    def __init__(self, error, message):
+        super().__init__(message)
+        self.error = error
+        self.message = message
+        self.status = self.STATUS.get(error, 500)
+
+
+class FakeSession:
+    """One WebDriver session driving a simulated device/app instance"""
+
+    def __init__(self, session_id, capabilities, app=None):
+        self.id = session_id
+        self.capabilities = capabilities
+        self.app = app if app is not None else FakeFlutterApp()
+        self.implicit_wait = 0.0
+        self.new_command_timeout = capabilities.get("appium:newCommandTimeout")
+        self.last_command = time.monotonic()
+        self.perf_reads = 0
+        self.frames_reset_at = time.monotonic()
+
+    def expired(self, now):
+        """True once the session has been idle longer than its newCommandTimeout"""
+        return bool(self.new_command_timeout) and now - self.last_command > self.new_command_timeout
+
+    # --- Lookup backend (also used by the batch query reference) ---------
+
+    def find_elements(self, using, value):
+        """Return ids of nodes matching a locator, in document order"""
+        nodes = self.app.nodes()
+        if using == "accessibility id":
+            return [node.id for node in nodes if node.content_desc == value]
+        if using == "class name":
+            return [node.id for node in nodes if node.class_name == value]
+        if using == "id":
+            return []
+        if using == "-android uiautomator":
+            # instance(n) picks the n-th match of the other criteria
+            instance = re.search(r'\.instance\((\d+)\)', value)
+            selector = value.replace(instance.group(0), "") if instance else value
+            matches = [node.id for node in nodes if self._matches_uiselector(node, selector)]
+            if instance:
+                index = int(instance.group(1))
+                return matches[index:index + 1]
+            return matches
+        if using == "xpath":
+            return self._find_by_xpath(value)
+        raise WebDriverError("invalid selector", f"Locator strategy '{using}' is not supported")
+
+    def get_node(self, element_id):
+        for node in self.app.nodes():
+            if node.id == element_id:
+                return node
+        raise WebDriverError("stale element reference", f"Element '{element_id}' is no longer on screen")
+
+    def get_attribute(self, element_id, name):
+        return self.get_node(element_id).attribute(name)
+
+    def _matches_uiselector(self, node, selector):
+        calls = _UISELECTOR_CALL.findall(selector)
+        if not selector.startswith("new UiSelector()") or not calls:
+            raise WebDriverError("invalid selector", f"Unsupported UiSelector: {selector}")
+        for method, text, literal in calls:
+            expected = re.sub(r'\\(.)', r'\1', text) if literal == "" else literal
+            if method == "className":
+                matched = node.class_name == expected
+            elif method == "description":
+                matched = node.content_desc == expected
+            elif method == "descriptionContains":
+                matched = expected in (node.content_desc or "")
+            elif method == "descriptionMatches":
+                matched = re.fullmatch(expected, node.content_desc or "") is not None
+            elif method == "text":
+                matched = node.text == expected
+            elif method == "textMatches":
+                matched = re.fullmatch(expected, node.text or "") is not None
+            elif method == "resourceId":
+                matched = node.attribute("resource-id") == expected
+            elif method == "clickable":
+                matched = node.clickable == (expected == "true")
+            else:
+                raise WebDriverError("invalid selector", f"Unsupported UiSelector method: {method}")
+            if not matched:
+                return False
+        return True
+
+    def _find_by_xpath(self, xpath):
+        # ElementTree supports the XPath subset used here ('//Class[@attr="value"]')
+        root, element_ids = self.app.hierarchy()
+        path = "." + xpath if xpath.startswith("//") else xpath
+        try:
+            matches = root.findall(path)
+        except SyntaxError as error:
+            raise WebDriverError("invalid selector", f"Unsupported XPath '{xpath}': {error}")
+        return [element_ids[element] for element in matches if element in element_ids]
+
+    # --- Scripts --------------------------------------------------------
+
+    def execute_script(self, script, args):
+        """Run an execute-script command"""
+        params = args[0] if args and isinstance(args[0], dict) else {}
+        if script == "mobile: getCurrentPackage":
+            return self.app.package
+        if script == "mobile: activateApp":
+            self.app.activate(params.get("appId"))
+            return None
+        if script == "mobile: scrollGesture":
+            return self._scroll_gesture(params)
+        if script == "mobile: replaceElementValue":
+            self.get_node(params.get("elementId"))
+            self.app.set_text(params["elementId"], params.get("text", ""))
+            return None
+        if script == "mobile: type":
+            self.app.type_text(params.get("text", ""))
+            return None
+        if script == "mobile: setClipboard":
+            self.app.clipboard = base64.b64decode(params.get("content", "")).decode("utf-8")
+            return None
+        if script == "mobile: getClipboard":
+            return base64.b64encode(self.app.clipboard.encode("utf-8")).decode("ascii")
+        if script == "mobile: pressKey":
+            self.app.press_key(int(params.get("keycode", 0)))
+            return None
+        if script == "mobile: getPerformanceData":
+            return self._performance_data(params)
+        if script == "mobile: shell":
+            return self._shell(params)
+        if script == QUERY_SCRIPT:
+            try:
+                return execute_query(self, params)
+            except QueryError as error:
+                raise WebDriverError("invalid argument", str(error))
+        raise WebDriverError("unknown method", f"Script '{script}' is not supported")
+
+
+    def _performance_data(self, params):
+        """Stub cpuinfo/memoryinfo tables in UiAutomator2's [[names], [values]] shape"""
+        if params.get("packageName") != self.app.package:
+            raise WebDriverError("invalid argument", f"Package '{params.get('packageName')}' is not running")
+        self.perf_reads += 1
+        data_type = params.get("dataType")
+        if data_type == "cpuinfo":
+            return [["user", "kernel"], [str(8 + self.perf_reads % 5), "2"]]
+        if data_type == "memoryinfo":
+            pss = 80000 + 512 * len(self.app.items)
+            return [["totalPss", "nativeHeapAllocatedSize", "nativePss"], [str(pss), "24000", "30000"]]
+        raise WebDriverError("invalid argument", f"Unsupported performance data type: {data_type}")
+
+    def _shell(self, params):
+        """mobile: shell - only 'dumpsys gfxinfo <package> [reset]' (stub frame statistics at 60 fps)"""
+        args = list(params.get("args", []))
+        if params.get("command") != "dumpsys" or args[:1] != ["gfxinfo"]:
+            raise WebDriverError("unknown method", f"Shell command not supported: {params.get('command')} {args}")
+        if args[2:3] == ["reset"]:
+            self.frames_reset_at = time.monotonic()
+            return ""
+        frames = int((time.monotonic() - self.frames_reset_at) * 60)
+        janky = frames // 50
+        return (f"Applications Graphics Acceleration Info:\n** Graphics info for pid 4242 [{self.app.package}] **\n\n"
+                f"Total frames rendered: {frames}\nJanky frames: {janky} ({100.0 * janky / max(frames, 1):.2f}%)\n"
+                f"50th percentile: 7ms\n90th percentile: 12ms\n95th percentile: 16ms\n99th percentile: 32ms\n")
+
+    def _scroll_gesture(self, params):
+        """mobile: scrollGesture - returns True if the area can scroll more"""
+        direction = params.get("direction")
+        if direction not in ("up", "down"):
+            raise WebDriverError("invalid argument", f"Unsupported scroll direction: {direction}")
+        if "elementId" in params:
+            height = self.get_node(params["elementId"]).rect["height"]
+        elif "height" in params:
+            height = params["height"]
+        else:
+            raise WebDriverError("invalid argument", "Either elementId or left/top/width/height is required")
+        distance = float(height) * float(params.get("percent", 1.0))
+        return self.app.scroll(distance if direction == "down" else -distance)
+
+    def perform_actions(self, actions):
+        """Replay W3C pointer actions: a moving touch scrolls, a still touch taps"""
+        for source in actions:
+            if source.get("type") != "pointer":
+                continue
+            x = y = start = None
+            for action in source.get("actions", []):
+                kind = action.get("type")
+                if kind == "pointerMove":
+                    x, y = action.get("x", x), action.get("y", y)
+                elif kind == "pointerDown":
+                    start = (x, y)
+                elif kind == "pointerUp" and start is not None:
+                    if abs(start[1] - y) > 10 or abs(start[0] - x) > 10:
+                        self.app.scroll(start[1] - y)
+                    else:
+                        node = self.app.node_at(x, y)
+                        if node is not None and node.action:
+                            node.action()
+                    start = None
+
+
+class FakeAppiumServer:
+    """Threaded HTTP server speaking the W3C WebDriver protocol
+
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+        latency: Artificial delay in seconds added to every command
+        connect_latency: Artificial delay in seconds for every new TCP connection
+        bandwidth: Response bandwidth cap in bytes per second (None = unlimited)
+        compress_min_bytes: Gzip responses at least this large when the client
+            accepts gzip (None disables compression)
+        key_latency: Artificial delay in seconds per character of injected keys
+        disabled_scripts: execute-script names answered with 'unknown method'
+        animation_seconds: How long list changes animate in the simulated app
+        clock: Time source for newCommandTimeout expiry (for tests)
+    """
+
+    ROUTES = [
+        ("GET", r"/status", "status"),
+        ("POST", r"/session", "new_session"),
+        ("DELETE", r"/session/(?P<sid>[^/]+)", "delete_session"),
+        ("POST", r"/session/(?P<sid>[^/]+)/timeouts", "set_timeouts"),
+        ("GET", r"/session/(?P<sid>[^/]+)/timeouts", "get_timeouts"),
+        ("POST", r"/session/(?P<sid>[^/]+)/element", "find_element"),
+        ("POST", r"/session/(?P<sid>[^/]+)/elements", "find_elements"),
+        ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/attribute/(?P<name>[^/]+)", "get_attribute"),
+        ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/text", "get_text"),
+        ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/displayed", "is_displayed"),
+        ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/enabled", "is_enabled"),
+        ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/rect", "get_rect"),
+        ("POST", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/click", "click"),
+        ("POST", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/clear", "clear"),
+        ("POST", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/value", "send_keys"),
+        ("POST", r"/session/(?P<sid>[^/]+)/back", "back"),
+        ("GET", r"/session/(?P<sid>[^/]+)/source", "page_source"),
+        ("GET", r"/session/(?P<sid>[^/]+)/screenshot", "screenshot"),
+        ("POST", r"/session/(?P<sid>[^/]+)/execute/sync", "execute_script"),
+        ("POST", r"/session/(?P<sid>[^/]+)/actions", "perform_actions"),
+        ("DELETE", r"/session/(?P<sid>[^/]+)/actions", "release_actions"),
+    ]
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, connect_latency=0.0,
+                 bandwidth=None, compress_min_bytes=1024, key_latency=0.0, disabled_scripts=(),
+                 animation_seconds=0.0, clock=time.monotonic):
+        self.latency = latency
+        self.clock = clock
+        self.animation_seconds = animation_seconds
+        self.key_latency = key_latency
+        self.disabled_scripts = set(disabled_scripts)
+        self.connect_latency = connect_latency
+        self.bandwidth = bandwidth
+        self.compress_min_bytes = compress_min_bytes
+        self.sessions = {}
+        self.devices = {}
+        self.command_counts = Counter()
+        self.connections = 0
+        self.bytes_sent = 0
+        self._routes = [(method, re.compile(pattern + "$"), name) for method, pattern, name in self.ROUTES]
+        self._lock = threading.Lock()
+        self._thread = None
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve requests on a background thread"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-appium", daemon=True)
+        self._thread.start()
+        logger.info(f"Fake Appium server listening on {self.url}")
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # --- Dispatch -------------------------------------------------------
+
+    def dispatch(self, method, path, body):
+        """Route one request
+
+        Returns:
+            tuple: (HTTP status, JSON-serializable payload)
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+        for route_method, pattern, name in self._routes:
+            match = pattern.match(path)
+            if match and route_method == method:
+                break
+        else:
+            return 404, _error_payload("unknown command", f"{method} {path} is not implemented")
+
+        try:
+            with self._lock:
+                self.command_counts[name] += 1
+                value = getattr(self, f"_cmd_{name}")(body, **match.groupdict())
+            return 200, value if name == "new_session" else {"value": value}
+        except WebDriverError as error:
+            return error.status, _error_payload(error.error, error.message)
+
+    def _session(self, sid):
+        if sid not in self.sessions:
+            raise WebDriverError("invalid session id", f"Session '{sid}' does not exist")
+        session = self.sessions[sid]
+        now = self.clock()
+        if session.expired(now):
+            # Appium deletes sessions that received no command within newCommandTimeout
+            del self.sessions[sid]
+            raise WebDriverError("invalid session id",
+                                 f"Session '{sid}' was terminated after {session.new_command_timeout}s idle")
+        session.last_command = now
+        return session
+
+    def _element_response(self, element_id):
+        return {W3C_ELEMENT_KEY: element_id}
+
+    # --- Commands -------------------------------------------------------
+
+    def _cmd_status(self, body):
+        return {"ready": True, "message": "Fake Appium server", "build": {"version": "fake"}}
+
+    def _cmd_new_session(self, body):
+        capabilities = dict(body.get("capabilities", {}).get("alwaysMatch", {}))
+        for first_match in body.get("capabilities", {}).get("firstMatch", [])[:1]:
+            capabilities.update(first_match)
+        # Sessions on the same device share its app; without noReset the app is reset
+        device = capabilities.get("appium:udid") or capabilities.get("appium:deviceName") or "default"
+        if device not in self.devices:
+            self.devices[device] = FakeFlutterApp(self.animation_seconds)
+        elif not capabilities.get("appium:noReset"):
+            self.devices[device].reset()
+        now = self.clock()
+        for sid in [sid for sid, other in self.sessions.items() if other.expired(now)]:
+            del self.sessions[sid]
+        session = FakeSession(uuid.uuid4().hex, capabilities, self.devices[device])
+        session.last_command = now
+        self.sessions[session.id] = session
+        return {"value": {"sessionId": session.id, "capabilities": capabilities}}
+
+    def _cmd_delete_session(self, body, sid):
+        self.sessions.pop(sid, None)
+        return None
+
+    def _cmd_set_timeouts(self, body, sid):
+        if "implicit" in body:
+            self._session(sid).implicit_wait = body["implicit"] / 1000.0
+        return None
+
+    def _cmd_get_timeouts(self, body, sid):
+        implicit = int(self._session(sid).implicit_wait * 1000)
+        return {"implicit": implicit, "pageLoad": 300000, "script": 30000}
+
+    def _cmd_find_element(self, body, sid):
+        element_ids = self._session(sid).find_elements(body.get("using"), body.get("value"))
+        if not element_ids:
+            raise WebDriverError("no such element",
+                                 f"No element found using '{body.get('using')}': {body.get('value')}")
+        return self._element_response(element_ids[0])
+
+    def _cmd_find_elements(self, body, sid):
+        element_ids = self._session(sid).find_elements(body.get("using"), body.get("value"))
+        return [self._element_response(element_id) for element_id in element_ids]
+
+    def _cmd_get_attribute(self, body, sid, eid, name):
+        return self._session(sid).get_attribute(eid, name)
+
+    def _cmd_get_text(self, body, sid, eid):
+        node = self._session(sid).get_node(eid)
+        return node.text or (node.content_desc or "")
+
+    def _cmd_is_displayed(self, body, sid, eid):
+        self._session(sid).get_node(eid)
+        return True
+
+    def _cmd_is_enabled(self, body, sid, eid):
+        self._session(sid).get_node(eid)
+        return True
+
+    def _cmd_get_rect(self, body, sid, eid):
+        return self._session(sid).get_node(eid).rect
+
+    def _cmd_click(self, body, sid, eid):
+        node = self._session(sid).get_node(eid)
+        if node.action:
+            node.action()
+        return None
+
+    def _cmd_clear(self, body, sid, eid):
+        session = self._session(sid)
+        session.get_node(eid)
+        session.app.set_text(eid, "")
+        return None
+
+    def _cmd_send_keys(self, body, sid, eid):
+        session = self._session(sid)
+        node = session.get_node(eid)
+        text = body.get("text")
+        if text is None:
+            text = "".join(body.get("value", []))
+        if self.key_latency:
+            time.sleep(self.key_latency * len(text))
+        session.app.set_text(eid, node.text + text)
+        return None
+
+    def _cmd_back(self, body, sid):
+        self._session(sid).app.back()
+        return None
+
+    def _cmd_page_source(self, body, sid):
+        return self._session(sid).app.page_source()
+
+    def _cmd_screenshot(self, body, sid):
+        return base64.b64encode(self._session(sid).app.screenshot_png()).decode("ascii")
+
+    def _cmd_execute_script(self, body, sid):
+        session = self._session(sid)
+        script, args = body.get("script", ""), body.get("args", [])
+        if script in self.disabled_scripts:
+            raise WebDriverError("unknown method", f"Script '{script}' is not supported")
+        if script == "mobile: type" and self.key_latency and args and isinstance(args[0], dict):
+            time.sleep(self.key_latency * len(args[0].get("text", "")))
+        return session.execute_script(script, args)
+
+
+    def _cmd_perform_actions(self, body, sid):
+        self._session(sid).perform_actions(body.get("actions", []))
+        return None
+
+    def _cmd_release_actions(self, body, sid):
+        self._session(sid)
+        return None
+
+
+def _error_payload(error, message):
+    return {"value": {"error": error, "message": message, "stacktrace": ""}}
+
+
+def _make_handler(server):
+    """Build a request handler class bound to a FakeAppiumServer"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real server
+        # Headers and body are separate writes; with Nagle on, delayed ACKs add ~40 ms per command
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            with server._lock:
+                server.connections += 1
+            if server.connect_latency:
+                time.sleep(server.connect_latency)
+
+        def _handle(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            try:
+                body = json.loads(raw) if raw else {}
+            except ValueError:
+                body = {}
+            status, payload = server.dispatch(self.command, self.path, body if isinstance(body, dict) else {})
+            data = json.dumps(payload).encode("utf-8")
+            compress = (server.compress_min_bytes is not None and len(data) >= server.compress_min_bytes
+                        and "gzip" in self.headers.get("Accept-Encoding", ""))
+            if compress:
+                data = gzip.compress(data, compresslevel=5)
+            if server.bandwidth:
+                time.sleep(len(data) / server.bandwidth)
+            with server._lock:
+                server.bytes_sent += len(data)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            if compress:
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_DELETE = _handle
+
+        def log_message(self, format, *args):
+            logger.debug("%s - %s", self.address_string(), format % args)
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the fake Appium server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4723)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every command")
+    parser.add_argument("--connect-latency", type=float, default=0.0, help="Seconds added to every new connection")
+    parser.add_argument("--bandwidth", type=int, default=None, help="Response bandwidth cap in bytes/second")
+    parser.add_argument("--key-latency", type=float, default=0.0, help="Seconds per injected key character")
+    parser.add_argument("--animation", type=float, default=0.0, help="Seconds list changes keep animating")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    server = FakeAppiumServer(args.host, args.port, latency=args.latency,
+                              connect_latency=args.connect_latency, bandwidth=args.bandwidth,
+                              key_latency=args.key_latency, animation_seconds=args.animation)
+    logger.info(f"Fake Appium server listening on {server.url} (Ctrl+C to stop)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
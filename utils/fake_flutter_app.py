@@ -0,0 +1,381 @@
+"""
+Simulated Flutter App for offline testing
+
+Models the app under test closely enough for the page objects to run
+without a device:
+- Home screen with Web Search, Open Gmail and Shopping List buttons
+- Shopping list screen with name/quantity fields, Add button and item rows
+- External apps (browser, Gmail) and the launcher as package switches
+- A scrollable item list: only rows inside the viewport are reported, and
+  rows cut by its edges with clipped bounds, like a real device
+- Input focus (a clicked field receives typed keys) and a clipboard
+- Optional list animation: for animation_seconds after the list changes,
+  item rows slide into place (page sources keep changing until they settle)
+
+The app exposes its current screen as a flat list of FakeNode objects, the
+same shape UiAutomator2 reports for Flutter semantics nodes. The fake
+Appium server (utils/fake_appium_server.py) builds page sources, element
+lookups and screenshots from these nodes.
+"""
+import struct
+import time
+import zlib
+import xml.etree.ElementTree as ET
+
+APP_PACKAGE = "com.example.my_app"
+BROWSER_PACKAGE = "com.android.chrome"
+GMAIL_PACKAGE = "com.google.android.gm"
+LAUNCHER_PACKAGE = "com.google.android.apps.nexuslauncher"
+
+SCREEN_WIDTH = 1080
+SCREEN_HEIGHT = 2400
+LIST_TOP = 600  # Top of the scrollable item list on the shopping list screen
+ROW_HEIGHT = 160
+
+VIEW = "android.view.View"
+BUTTON = "android.widget.Button"
+EDIT_TEXT = "android.widget.EditText"
+
+KEYCODE_BACK = 4
+KEYCODE_PASTE = 279
+
+
+class FakeNode:
+    """One accessibility node on the simulated screen"""
+
+    __slots__ = ("id", "class_name", "content_desc", "text", "bounds", "clickable", "action", "focused")
+
+    def __init__(self, node_id, class_name, bounds, content_desc=None, text="",
+                 clickable=False, action=None, focused=False):
+        """Initialize FakeNode
+
+        Args:
+            node_id: Stable element id (also used as the WebDriver element id)
+            class_name: Android class name (e.g. android.widget.Button)
+            bounds: Tuple (x1, y1, x2, y2) in screen pixels
+            content_desc: Accessibility label, or None
+            text: Text content (EditText fields)
+            clickable: Whether the node reacts to clicks
+            action: Callable invoked on click
+            focused: Whether the node has the input focus
+        """
+        self.id = node_id
+        self.class_name = class_name
+        self.bounds = bounds
+        self.content_desc = content_desc
+        self.text = text
+        self.clickable = clickable
+        self.action = action
+        self.focused = focused
+
+    def attribute(self, name):
+        """Return an attribute the way UiAutomator2 reports it (strings)"""
+        x1, y1, x2, y2 = self.bounds
+        values = {
+            "content-desc": self.content_desc if self.content_desc is not None else "null",
+            "text": self.text,
+            "class": self.class_name,
+            "className": self.class_name,
+            "clickable": str(self.clickable).lower(),
+            "enabled": "true",
+            "displayed": "true",
+            "focusable": str(self.clickable or self.class_name == EDIT_TEXT).lower(),
+            "focused": str(self.focused).lower(),
+            "bounds": f"[{x1},{y1}][{x2},{y2}]",
+            "package": APP_PACKAGE,
+            "resource-id": "",
+        }
+        return values.get(name)
+
+    @property
+    def rect(self):
+        """W3C element rect"""
+        x1, y1, x2, y2 = self.bounds
+        return {"x": x1, "y": y1, "width": x2 - x1, "height": y2 - y1}
+
+
+class FakeFlutterApp:
+    """State machine for the simulated app and the device around it"""
+
+    def __init__(self, animation_seconds=0.0):
+        self.animation_seconds = animation_seconds
+        self.reset()
+
+    def reset(self):
+        """Fresh app state, as after a reinstall / new session without noReset"""
+        self.package = APP_PACKAGE
+        self.screen = "home"
+        self.items = []  # [serial, name, quantity]
+        self.name_text = ""
+        self.quantity_text = "1"
+        self.scroll_offset = 0
+        self.focused = None  # Id of the input field that receives typed keys
+        self.clipboard = ""
+        self._serial = 0
+        self._animation_end = 0.0
+
+    # --- Navigation -----------------------------------------------------
+
+    def back(self):
+        """Handle the Android back key"""
+        if self.package != APP_PACKAGE:
+            self.package = APP_PACKAGE
+        elif self.screen == "shopping_list":
+            self.screen = "home"
+        else:
+            self.package = LAUNCHER_PACKAGE
+
+    def activate(self, package):
+        """Bring a package to the foreground"""
+        self.package = package
+
+    def open_shopping_list(self):
+        # The list is route state, so it starts empty every time the route is pushed
+        self.screen = "shopping_list"
+        self.items = []
+        self.name_text = ""
+        self.quantity_text = "1"
+        self.scroll_offset = 0
+        self.focused = None
+        self._animate()
+
+    # --- Shopping list --------------------------------------------------
+
+    def add_item(self):
+        """Add Button: append the entered item and reset the fields"""
+        name = self.name_text.strip()
+        if not name:
+            return
+        quantity = int(self.quantity_text) if self.quantity_text.strip().isdigit() else 1
+        self._serial += 1
+        self.items.append([self._serial, name, max(quantity, 1)])
+        self.name_text = ""
+        self.quantity_text = "1"
+        self._animate()
+
+    def delete_item(self, serial):
+        self.items = [item for item in self.items if item[0] != serial]
+        self.scroll_offset = min(self.scroll_offset, self.max_scroll)
+        self._animate()
+
+    def _animate(self):
+        self._animation_end = time.monotonic() + self.animation_seconds
+
+    def animation_offset(self):
+        """Pixels the item rows are still below their final position"""
+        remaining = self._animation_end - time.monotonic()
+        if not self.animation_seconds or remaining <= 0:
+            return 0
+        return int(ROW_HEIGHT * remaining / self.animation_seconds) + 1
+
+    def seed_items(self, items):
+        """Open the shopping list with items already added (test setup shortcut)
+
+        Args:
+            items: Iterable of (name, quantity) tuples
+        """
+        self.open_shopping_list()
+        for name, quantity in items:
+            self._serial += 1
+            self.items.append([self._serial, name, quantity])
+
+    @property
+    def max_scroll(self):
+        """Largest scroll offset of the item list (rows plus the Total row)"""
+        content_height = len(self.items) * ROW_HEIGHT + 100
+        return max(0, content_height - (SCREEN_HEIGHT - LIST_TOP))
+
+    def scroll(self, delta):
+        """Scroll the item list by delta pixels (positive scrolls down)
+
+        Returns:
+            bool: True if the list can scroll further in that direction
+        """
+        self.scroll_offset = min(max(self.scroll_offset + int(delta), 0), self.max_scroll)
+        return self.scroll_offset > 0 if delta < 0 else self.scroll_offset < self.max_scroll
+
+    def node_at(self, x, y):
+        """Topmost clickable node at a screen point, or None"""
+        for node in reversed(self.nodes()):
+            x1, y1, x2, y2 = node.bounds
+            if node.clickable and x1 <= x < x2 and y1 <= y < y2:
+                return node
+        return None
+
+    def set_text(self, node_id, text):
+        """Replace the text of an input field"""
+        if node_id == "list-name":
+            self.name_text = text
+        elif node_id == "list-quantity":
+            self.quantity_text = text
+
+    def focus(self, node_id):
+        """Give an input field the keyboard focus (clicking a field does this)"""
+        self.focused = node_id
+
+    def type_text(self, text):
+        """Key events: append text to the focused field (ignored without focus)"""
+        if self.focused == "list-name":
+            self.name_text += text
+        elif self.focused == "list-quantity":
+            self.quantity_text += text
+
+    def press_key(self, keycode):
+        """Android key event: BACK (4) and PASTE (279) are supported, others are ignored"""
+        if keycode == KEYCODE_BACK:
+            self.back()
+        elif keycode == KEYCODE_PASTE:
+            self.type_text(self.clipboard)
+
+    # --- Rendering ------------------------------------------------------
+
+    def nodes(self):
+        """Return the nodes on screen, in document order
+
+        Returns:
+            list: FakeNode objects for the foreground app
+        """
+        if self.package != APP_PACKAGE:
+            return [FakeNode(f"ext-{self.package}", VIEW, (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT),
+                             content_desc=self.package)]
+        if self.screen == "shopping_list":
+            return self._shopping_list_nodes()
+        return self._home_nodes()
+
+    def _home_nodes(self):
+        def button(node_id, label, top, action):
+            return FakeNode(node_id, BUTTON, (240, top, 840, top + 150), content_desc=label,
+                            clickable=True, action=action)
+
+        return [
+            FakeNode("home-title", VIEW, (0, 100, SCREEN_WIDTH, 250), content_desc="Flutter Demo Home Page"),
+            button("home-web_search", "Web Search", 800, lambda: self.activate(BROWSER_PACKAGE)),
+            button("home-gmail", "Open Gmail", 1000, lambda: self.activate(GMAIL_PACKAGE)),
+            button("home-shopping_list", "Shopping List", 1200, self.open_shopping_list),
+        ]
+
+    def _shopping_list_nodes(self):
+        nodes = [
+            FakeNode("list-back", BUTTON, (0, 100, 150, 250), content_desc="Back",
+                     clickable=True, action=self.back),
+            FakeNode("list-title", VIEW, (150, 100, SCREEN_WIDTH, 250), content_desc="Shopping List"),
+            FakeNode("list-header", VIEW, (40, 280, SCREEN_WIDTH - 40, 380),
+                     content_desc="Add items to your shopping list"),
+            FakeNode("list-name", EDIT_TEXT, (40, 400, 700, 540), text=self.name_text, clickable=True,
+                     action=lambda: self.focus("list-name"), focused=self.focused == "list-name"),
+            FakeNode("list-quantity", EDIT_TEXT, (720, 400, 900, 540), text=self.quantity_text,
+                     clickable=True, action=lambda: self.focus("list-quantity"),
+                     focused=self.focused == "list-quantity"),
+            FakeNode("list-add", BUTTON, (920, 400, 1040, 540), clickable=True, action=self.add_item),
+        ]
+        if not self.items:
+            nodes.append(FakeNode("list-empty", VIEW, (40, 700, SCREEN_WIDTH - 40, 800),
+                                  content_desc="No items yet"))
+            return nodes
+
+        # Rows outside the viewport are not part of the hierarchy; rows at its edges
+        # are reported with bounds clipped to the visible part, like on a device
+        top = LIST_TOP - self.scroll_offset + self.animation_offset()
+        for serial, name, quantity in self.items:
+            row = _clip((40, top, 900, top + 140))
+            if row:
+                nodes.append(FakeNode(f"list-item-{serial}", VIEW, row, content_desc=f"{name}\nx{quantity}"))
+            delete = _clip((920, top + 20, 1040, top + 120))
+            if delete:
+                nodes.append(FakeNode(f"list-delete-{serial}", BUTTON, delete,
+                                      clickable=True, action=lambda s=serial: self.delete_item(s)))
+            top += ROW_HEIGHT
+        total = _clip((40, top, SCREEN_WIDTH - 40, top + 100))
+        if total:
+            nodes.append(FakeNode("list-total", VIEW, total, content_desc=f"Total: {len(self.items)} items"))
+        return nodes
+
+    def page_source(self, nodes=None):
+        """Render nodes as a UiAutomator2-style XML page source
+
+        Args:
+            nodes: Optional node list (defaults to the current screen)
+
+        Returns:
+            str: XML document
+        """
+        root, _ = self.hierarchy(nodes)
+        return ET.tostring(root, encoding="unicode")
+
+    def hierarchy(self, nodes=None):
+        """Build the XML hierarchy for nodes
+
+        Args:
+            nodes: Optional node list (defaults to the current screen)
+
+        Returns:
+            tuple: (root ET element, dict mapping ET element -> node id)
+        """
+        nodes = self.nodes() if nodes is None else nodes
+        root = ET.Element("hierarchy", {"index": "0", "class": "hierarchy",
+                                        "width": str(SCREEN_WIDTH), "height": str(SCREEN_HEIGHT)})
+        frame = ET.SubElement(root, "android.widget.FrameLayout", {
+            "index": "0", "package": self.package, "class": "android.widget.FrameLayout",
+            "bounds": f"[0,0][{SCREEN_WIDTH},{SCREEN_HEIGHT}]",
+        })
+        flutter_view = ET.SubElement(frame, VIEW, {
+            "index": "0", "package": self.package, "class": VIEW, "content-desc": "",
+            "bounds": f"[0,0][{SCREEN_WIDTH},{SCREEN_HEIGHT}]",
+        })
+        element_ids = {}
+        for index, node in enumerate(nodes):
+            attributes = {"index": str(index)}
+            for name in ("text", "class", "package", "content-desc", "clickable", "enabled",
+                         "focusable", "focused", "displayed", "bounds", "resource-id"):
+                value = node.attribute(name)
+                attributes[name] = "" if name == "content-desc" and value == "null" else value
+            element = ET.SubElement(flutter_view, node.class_name, attributes)
+            element_ids[element] = node.id
+        return root, element_ids
+
+    def screenshot_png(self):
+        """Render the current screen as a grayscale PNG
+
+        Each node is drawn as a box whose stripes encode its label, so
+        different buttons produce different perceptual hashes.
+
+        Returns:
+            bytes: PNG image data
+        """
+        width, height = SCREEN_WIDTH // 4, SCREEN_HEIGHT // 4  # Rendered at 1/4 scale
+        pixels = bytearray(b"\xf0" * (width * height))
+        for node in self.nodes():
+            x1, y1, x2, y2 = (v // 4 for v in node.bounds)
+            label = (node.content_desc or node.text or node.class_name).encode("utf-8") or b"?"
+            for y in range(max(y1, 0), min(y2, height)):
+                row = y * width
+                for x in range(max(x1, 0), min(x2, width)):
+                    byte = label[((x - x1) * len(label)) // max(x2 - x1, 1)]
+                    pixels[row + x] = 40 + (byte * 37 + (y - y1) * 3) % 180
+        # Upscale to full resolution so bounds match element rects
+        full_rows = []
+        for y in range(height):
+            row = pixels[y * width:(y + 1) * width]
+            scaled = bytearray(SCREEN_WIDTH)
+            for offset in range(4):
+                scaled[offset::4] = row
+            full_rows.extend([b"\x00" + bytes(scaled)] * 4)
+        return _encode_png(SCREEN_WIDTH, SCREEN_HEIGHT, b"".join(full_rows))
+
+
+def _clip(bounds):
+    """Bounds of a list node clipped to the visible list area, or None if hidden"""
+    x1, y1, x2, y2 = bounds
+    y1, y2 = max(y1, LIST_TOP), min(y2, SCREEN_HEIGHT)
+    return (x1, y1, x2, y2) if y2 > y1 else None
+
+
+def _encode_png(width, height, raw_rows):
+    """Encode filtered 8-bit grayscale scanlines as PNG"""
+    def chunk(kind, data):
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(raw_rows, 6)) + chunk(b"IEND", b""))
@@ -0,0 +1,112 @@
+"""
+Shared HTTP Transport for Appium Sessions
+
+By default every webdriver.Remote() builds its own urllib3 PoolManager, so
+each test's new session starts with cold TCP connections and nothing is
+reused between sessions. This module provides:
+- PooledAppiumConnection - an AppiumConnection whose pool manager is shared
+  by every session of the process (one pytest-xdist worker); it lives in
+  utils/pooled_connection.py and is imported on first use, so importing this
+  module (settings validation, conftest) does not load the Appium client
+- Keep-alive - connections stay open between commands and between sessions
+- Compression - asks for gzip responses (Accept-Encoding), which shrinks
+  large page_source/screenshot payloads when the server or a proxy in front
+  of it compresses; urllib3 decodes them transparently
+- Per-endpoint limits - HTTP_POOL_MAXSIZE connections per host by default,
+  overridable per host with HTTP_POOL_LIMITS ("host:port=N,host=N")
+
+Usage:
+    command_executor = create_connection(settings.APPIUM_SERVER, settings)
+    driver = webdriver.Remote(command_executor, options=options)
+"""
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def parse_pool_limits(text):
+    """Parse per-endpoint connection limits
+
+    Args:
+        text: Comma separated "host:port=N" or "host=N" entries
+
+    Returns:
+        dict: Endpoint ("host:port" or "host") -> maximum connections
+
+    Raises:
+        ValueError: If an entry is malformed or a limit is not a positive integer
+    """
+    limits = {}
+    for entry in filter(None, (part.strip() for part in text.split(","))):
+        endpoint, separator, value = entry.rpartition("=")
+        if not separator or not endpoint.strip():
+            raise ValueError(f"Expected 'host[:port]=N', got '{entry}'")
+        if not value.strip().isdigit() or int(value) < 1:
+            raise ValueError(f"Connection limit for '{endpoint}' must be a positive integer, got '{value}'")
+        limits[endpoint.strip().lower()] = int(value)
+    return limits
+
+
+def get_shared_pool(key, factory):
+    """Pool manager shared by every connection with the same key
+
+    Args:
+        key: Hashable description of the pool arguments
+        factory: Callable creating the pool manager on first use
+
+    Returns:
+        urllib3.PoolManager: Shared pool manager
+    """
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = factory()
+            logger.info(f"Created shared HTTP pool {key}")
+        return _pools[key]
+
+
+def close_shared_pools():
+    """Close all connections of the shared pool managers (end of session)"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.clear()
+        _pools.clear()
+
+
+def create_connection(server_url, settings=None):
+    """Build the command executor for webdriver.Remote()
+
+    Args:
+        server_url: Appium server URL
+        settings: Settings object; defaults to config.settings.get_settings()
+
+    Returns:
+        AppiumConnection: Pooled connection, or a stock one when HTTP_KEEP_ALIVE is off
+    """
+    from appium.webdriver.appium_connection import AppiumConnection
+    from utils.pooled_connection import PooledAppiumConnection
+
+    if settings is None:
+        from config.settings import get_settings
+        settings = get_settings()
+
+    if not settings.HTTP_KEEP_ALIVE:
+        return AppiumConnection(server_url, keep_alive=False)
+    return PooledAppiumConnection(
+        server_url,
+        keep_alive=True,
+        compression=settings.HTTP_COMPRESSION,
+        maxsize=settings.HTTP_POOL_MAXSIZE,
+        limits=parse_pool_limits(settings.HTTP_POOL_LIMITS),
+    )
+
+
+def __getattr__(name):
+    # Lazy re-exports: the connection classes import urllib3 and the Appium client
+    if name in ("EndpointPoolManager", "PooledAppiumConnection"):
+        from utils import pooled_connection
+        return getattr(pooled_connection, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,401 @@
+"""
+Log Analytics
+
+Every run writes logs/test_run_<timestamp>.log (format in logs/README.md). This
+tool turns the accumulated logs into an index that can be queried across
+weeks of runs:
+- Files are memory-mapped and scanned with one compiled bytes regex, so a log
+  is never read into Python line by line; changed files are parsed by a pool
+  of worker processes (--jobs)
+- Timed events are derived while scanning:
+  - driver_start: "[Setup] Starting Appium driver..." to "Appium driver started successfully"
+  - app_init: "Waiting for app to initialize..." to "App initialized"
+  - driver_quit: "[Teardown] Closing Appium driver..." to "Appium driver closed"
+  - test: "Starting test: <name>" to "Test completed: <name>"
+  - page_action: every pages.* line, timed from the line before it (the work
+    that line reports), named by its logger and message with numbers and
+    quoted values replaced
+- The index is an SQLite database (standard library) next to the logs. It
+  keeps the durations of each file per event kind, name and day as one
+  array('d') blob, plus the slowest occurrences of each kind per file, so it
+  stays a small fraction of the logs' size. A file whose size and
+  modification time are unchanged is skipped; a changed file is re-indexed
+  and a deleted file is removed, so updating after a run only parses the new
+  logs
+- Queries run on the index: percentiles per day / name / file, and the slowest
+  single occurrences
+
+Usage:
+    python -m utils.log_analytics index
+    python -m utils.log_analytics stats driver_start --by day
+    python -m utils.log_analytics stats page_action --by name --limit 10
+    python -m utils.log_analytics slowest page_action
+"""
+import argparse
+import contextlib
+import datetime
+import fnmatch
+import heapq
+import mmap
+import os
+import re
+import sqlite3
+import sys
+import time
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+
+from utils.stats import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+KINDS = ("driver_start", "app_init", "driver_quit", "test", "page_action")
+
+# timestamp - module - level - message (continuation lines of tracebacks do not match)
+LINE = re.compile(rb"^(\d{4}-\d\d-\d\d) (\d\d:\d\d:\d\d,\d{3}) - (\S+) - [A-Z]+ - ([^\r\n]*)", re.M)
+
+# conftest messages opening and closing a timed span
+OPENS = {
+    b"[Setup] Starting Appium driver...": "driver_start",
+    b"Waiting for app to initialize...": "app_init",
+    b"[Teardown] Closing Appium driver...": "driver_quit",
+}
+CLOSES = {
+    b"Appium driver started successfully": "driver_start",
+    b"App initialized": "app_init",
+    b"Appium driver closed": "driver_quit",
+}
+
+TEST_START = b"Starting test: "
+TEST_END = b"Test completed: "
+
+# Slowest occurrences kept per event kind and file (bounds `slowest --limit`)
+KEEP_SLOWEST = 10
+
+_VARIABLE = re.compile(r"'[^']*'|\"[^\"]*\"|\d+(?:\.\d+)?")
+
+# One row per file, event kind, name and day holding all durations as array('d') bytes,
+# plus the slowest single occurrences of each kind per file
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY, path TEXT UNIQUE, size INTEGER, mtime_ns INTEGER, lines INTEGER
+);
+CREATE TABLE IF NOT EXISTS durations (
+    file_id INTEGER, kind TEXT, name TEXT, day TEXT, count INTEGER, seconds BLOB
+);
+CREATE TABLE IF NOT EXISTS slowest (
+    file_id INTEGER, kind TEXT, name TEXT, at TEXT, seconds REAL, detail TEXT
+);
+CREATE INDEX IF NOT EXISTS durations_kind ON durations (kind, day);
+CREATE INDEX IF NOT EXISTS durations_file ON durations (file_id);
+CREATE INDEX IF NOT EXISTS slowest_kind ON slowest (kind, seconds);
+CREATE INDEX IF NOT EXISTS slowest_file ON slowest (file_id);
+"""
+
+
+def action_name(logger_name, message):
+    """Group key of a page action: short logger name and the message without variable parts"""
+    return f"{logger_name.rpartition('.')[2]}: {_VARIABLE.sub('#', message.strip())}"
+
+
+class ParsedLog:
+    """Timed events of one log file
+
+    Attributes:
+        lines: Log lines matched
+        durations: (kind, name, day) -> array('d') of seconds, in file order
+        slowest: kind -> list of (seconds, name, at, detail), slowest KEEP_SLOWEST
+    """
+
+    def __init__(self):
+        self.lines = 0
+        self.durations = defaultdict(lambda: array("d"))
+        self.slowest = {}
+
+    @property
+    def events(self):
+        return sum(len(values) for values in self.durations.values())
+
+
+def parse_log(path, keep=KEEP_SLOWEST):
+    """Scan one log file for timed events
+
+    Args:
+        path: Log file path
+        keep: Slowest occurrences kept per event kind
+
+    Returns:
+        ParsedLog: Durations and slowest occurrences of the file
+    """
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return ParsedLog()
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return _scan(data, keep)
+
+
+def _scan(data, keep):
+    parsed = ParsedLog()
+    durations = parsed.durations
+    heaps = defaultdict(list)
+    day_starts = {}
+    second_starts = {}
+    action_names = {}
+    spans = {}
+    tests = {}
+    previous = previous_time = None
+    lines = 0
+
+    def timestamp(day, clock):
+        # Lines of one second share the "HH:MM:SS" prefix, so both parts are cached
+        base = day_starts.get(day)
+        if base is None:
+            # Relative to the file's first day, so milliseconds survive as float
+            ordinal = datetime.date.fromisoformat(day.decode()).toordinal()
+            first = day_starts.setdefault(None, ordinal)
+            base = day_starts[day] = (ordinal - first) * 86400
+        second = second_starts.get(clock[:8])
+        if second is None:
+            second = second_starts[clock[:8]] = int(clock[:2]) * 3600 + int(clock[3:5]) * 60 + int(clock[6:8])
+        return base + second + int(clock[9:12]) / 1000
+
+    def record(kind, name, day, clock, seconds, detail):
+        durations[kind, name, day].append(seconds)
+        heap = heaps[kind]
+        if len(heap) < keep:
+            heapq.heappush(heap, (seconds, lines, name, day, clock, detail))
+        elif seconds > heap[0][0]:
+            heapq.heapreplace(heap, (seconds, lines, name, day, clock, detail))
+
+    for match in LINE.finditer(data):
+        day, clock, logger_name, message = match.groups()
+        lines += 1
+        # Timestamps are only computed for lines that end (or start) a timed event
+        now = None
+        if logger_name.startswith(b"pages."):
+            if previous is not None:
+                now = timestamp(day, clock)
+                if previous_time is None:
+                    previous_time = timestamp(*previous)
+                name = action_names.get((logger_name, message))
+                if name is None:
+                    name = action_names[logger_name, message] = action_name(
+                        logger_name.decode(), message.decode("utf-8", "replace"))
+                record("page_action", name, day, clock, now - previous_time, (logger_name, message))
+        elif logger_name == b"conftest":
+            if message in OPENS:
+                spans[OPENS[message]] = (day, clock)
+            elif message in CLOSES and CLOSES[message] in spans:
+                kind = CLOSES[message]
+                opened = spans.pop(kind)
+                now = timestamp(day, clock)
+                record(kind, kind, *opened, now - timestamp(*opened), None)
+        elif logger_name.startswith(b"tests."):
+            if message.startswith(TEST_START):
+                tests[message[len(TEST_START):]] = (day, clock)
+            elif message.startswith(TEST_END) and message[len(TEST_END):] in tests:
+                test = message[len(TEST_END):]
+                opened = tests.pop(test)
+                now = timestamp(day, clock)
+                record("test", test.decode("utf-8", "replace"), *opened, now - timestamp(*opened),
+                       (logger_name, b""))
+        previous, previous_time = (day, clock), now
+
+    parsed.lines = lines
+    # A plain dict so the result can be sent back from a worker process
+    parsed.durations = dict(durations)
+    parsed.slowest = {
+        kind: [(seconds, name, f"{day.decode()} {clock.decode()}", _detail(detail))
+               for seconds, _, name, day, clock, detail in sorted(heap, reverse=True)]
+        for kind, heap in heaps.items()
+    }
+    return parsed
+
+
+def _detail(detail):
+    """Readable origin of an occurrence: 'logger: message', the logger alone, or ''"""
+    if detail is None:
+        return ""
+    logger_name, message = detail
+    text = message.decode("utf-8", "replace").strip()
+    return f"{logger_name.decode()}: {text}" if text else logger_name.decode()
+
+
+class LogIndex:
+    """Incremental SQLite index of timed events in run logs
+
+    Args:
+        path: Index database path
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def update(self, log_dir, pattern="test_run_*.log", jobs=None):
+        """Index new and changed logs, drop deleted ones
+
+        Args:
+            log_dir: Directory holding the logs
+            pattern: File name pattern of the logs to index
+            jobs: Worker processes parsing changed logs (default: CPU count; 1 parses inline)
+
+        Returns:
+            dict: {'indexed', 'skipped', 'removed', 'lines', 'events', 'bytes', 'seconds'}
+        """
+        start = time.perf_counter()
+        result = dict.fromkeys(("indexed", "skipped", "removed", "lines", "events", "bytes"), 0)
+        known = {path: (file_id, size, mtime_ns)
+                 for file_id, path, size, mtime_ns in self.db.execute("SELECT id, path, size, mtime_ns FROM files")}
+        seen = set()
+        pending = []
+        for entry in sorted(os.scandir(log_dir), key=lambda entry: entry.name):
+            if not entry.is_file() or not fnmatch.fnmatch(entry.name, pattern):
+                continue
+            path = os.path.abspath(entry.path)
+            stat = entry.stat()
+            seen.add(path)
+            previous = known.get(path)
+            if previous is not None and previous[1:] == (stat.st_size, stat.st_mtime_ns):
+                result["skipped"] += 1
+            else:
+                pending.append((path, stat))
+
+        jobs = min(jobs or os.cpu_count() or 1, len(pending))
+        with contextlib.ExitStack() as stack:
+            parse = map
+            if jobs > 1:
+                parse = stack.enter_context(ProcessPoolExecutor(jobs)).map
+            with self.db:
+                for (path, stat), parsed in zip(pending, parse(parse_log, [path for path, _ in pending])):
+                    if path in known:
+                        self._forget(known[path][0])
+                    self._store(path, stat, parsed)
+                    result["indexed"] += 1
+                    result["lines"] += parsed.lines
+                    result["events"] += parsed.events
+                    result["bytes"] += stat.st_size
+                for path in known.keys() - seen:
+                    self._forget(known[path][0])
+                    result["removed"] += 1
+        result["seconds"] = round(time.perf_counter() - start, 3)
+        return result
+
+    def _store(self, path, stat, parsed):
+        file_id = self.db.execute("INSERT INTO files (path, size, mtime_ns, lines) VALUES (?, ?, ?, ?)",
+                                  (path, stat.st_size, stat.st_mtime_ns, parsed.lines)).lastrowid
+        self.db.executemany("INSERT INTO durations VALUES (?, ?, ?, ?, ?, ?)", [
+            (file_id, kind, name, day.decode(), len(values), values.tobytes())
+            for (kind, name, day), values in parsed.durations.items()
+        ])
+        self.db.executemany("INSERT INTO slowest VALUES (?, ?, ?, ?, ?, ?)", [
+            (file_id, kind, name, at, seconds, detail)
+            for kind, rows in parsed.slowest.items() for seconds, name, at, detail in rows
+        ])
+
+    def _forget(self, file_id):
+        self.db.execute("DELETE FROM durations WHERE file_id = ?", (file_id,))
+        self.db.execute("DELETE FROM slowest WHERE file_id = ?", (file_id,))
+        self.db.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    def stats(self, kind, by="day", fraction=0.95):
+        """Duration percentiles of one event kind per group
+
+        Args:
+            kind: Event kind (see KINDS)
+            by: Group by 'day', 'name' or 'file'
+            fraction: Percentile reported besides p50 and max, e.g. 0.95
+
+        Returns:
+            list: dicts {'group', 'count', 'p50', 'p<fraction>', 'max'}, by day/file in order,
+                by name slowest (by that percentile) first
+        """
+        column = {"day": "d.day", "name": "d.name", "file": "f.path"}[by]
+        rows = self.db.execute(
+            f"SELECT {column}, d.seconds FROM durations d JOIN files f ON f.id = d.file_id "
+            f"WHERE d.kind = ? ORDER BY {column}", (kind,))
+        label = f"p{round(fraction * 100, 3):g}"
+        groups = []
+        for group, members in groupby(rows, key=lambda row: row[0]):
+            seconds = array("d")
+            for _, blob in members:
+                seconds.frombytes(blob)
+            groups.append({
+                "group": os.path.basename(group) if by == "file" else group,
+                "count": len(seconds),
+                "p50": percentile(seconds, 0.5),
+                label: percentile(seconds, fraction),
+                "max": max(seconds),
+            })
+        if by == "name":
+            groups.sort(key=lambda group: group[label], reverse=True)
+        return groups
+
+    def slowest(self, kind, limit=10):
+        """Slowest single occurrences of one event kind (at most KEEP_SLOWEST)
+
+        Returns:
+            list: dicts {'seconds', 'at', 'name', 'detail', 'file'}, slowest first
+        """
+        rows = self.db.execute(
+            "SELECT s.seconds, s.at, s.name, s.detail, f.path FROM slowest s JOIN files f ON f.id = s.file_id "
+            "WHERE s.kind = ? ORDER BY s.seconds DESC LIMIT ?", (kind, min(limit, KEEP_SLOWEST)))
+        return [{"seconds": seconds, "at": at, "name": name, "detail": detail, "file": os.path.basename(path)}
+                for seconds, at, name, detail, path in rows]
+
+
+def _print_update(result):
+    rate = result["bytes"] / result["seconds"] / 1e6 if result["seconds"] else 0.0
+    print(f"Indexed {result['indexed']} logs ({result['lines']} lines, {result['events']} events, "
+          f"{result['bytes'] / 1e6:.1f} MB at {rate:.0f} MB/s), skipped {result['skipped']} unchanged, "
+          f"removed {result['removed']} in {result['seconds']:.2f} s", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index and query accumulated test run logs")
+    parser.add_argument("--logs", default=os.path.join(ROOT, "logs"), help="Log directory")
+    parser.add_argument("--index", default=None, help="Index database (default: <logs>/log_index.sqlite3)")
+    parser.add_argument("--pattern", default="test_run_*.log", help="File name pattern of the logs")
+    parser.add_argument("--no-update", action="store_true", help="Query the index without indexing new logs")
+    parser.add_argument("--jobs", type=int, default=None, help="Processes parsing changed logs (default: CPU count)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("index", help="Index new and changed logs")
+    stats = commands.add_parser("stats", help="Duration percentiles of an event kind")
+    stats.add_argument("kind", choices=KINDS)
+    stats.add_argument("--by", choices=("day", "name", "file"), default="day")
+    stats.add_argument("--percentile", type=float, default=95, help="Percentile besides p50 (default 95)")
+    stats.add_argument("--limit", type=int, default=None, help="Show at most this many groups")
+    slowest = commands.add_parser("slowest", help="Slowest occurrences of an event kind")
+    slowest.add_argument("kind", choices=KINDS)
+    slowest.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    index = LogIndex(args.index or os.path.join(args.logs, "log_index.sqlite3"))
+    try:
+        if args.command == "index" or not args.no_update:
+            _print_update(index.update(args.logs, args.pattern, args.jobs))
+        if args.command == "stats":
+            groups = index.stats(args.kind, args.by, args.percentile / 100)[:args.limit]
+            label = f"p{args.percentile:g}"
+            print(f"{args.by:<60} {'count':>7} {'p50 s':>8} {label + ' s':>8} {'max s':>8}")
+            for group in groups:
+                print(f"{group['group'][:60]:<60} {group['count']:>7} {group['p50']:>8.3f} "
+                      f"{group[label]:>8.3f} {group['max']:>8.3f}")
+        elif args.command == "slowest":
+            for row in index.slowest(args.kind, args.limit):
+                print(f"{row['seconds']:>8.3f} s  {row['at']}  {row['file']}  {row['detail'] or row['name']}")
+    finally:
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+App Performance Sampler
+
+Measures the app under test while a test runs. A background thread polls the
+device at a fixed interval and keeps the samples in memory as columns
+(array('d') per metric, no per-sample objects):
+- cpuinfo: 'mobile: getPerformanceData' user/kernel CPU % of APP_PACKAGE
+- memoryinfo: 'mobile: getPerformanceData' total PSS and native heap (kB)
+- gfxinfo: frame statistics from 'mobile: shell' dumpsys gfxinfo (UiAutomator2's
+  getPerformanceData has no frame data; needs the adb_shell insecure feature).
+  The counters are reset when the sampler starts, so they cover one test
+
+A data type the driver cannot provide is dropped after its first failure (and
+not tried again in this process); once a type has worked, a failing round is
+skipped instead. The sampler measures its own cost - time
+spent in device commands and its thread's CPU time - and stretches the
+interval when a round of commands would take more than PERF_MAX_OVERHEAD of
+the wall time, so sampling never crowds out the test's own commands.
+
+Usage:
+    sampler = PerfSampler(driver, "com.example.my_app", interval=1.0).start()
+    ...  # test steps
+    summary = sampler.stop()  # {'cpu_percent': {'p50': .., 'p95': .., 'max': ..}, ...}
+"""
+import logging
+import re
+import threading
+import time
+from array import array
+from selenium.common.exceptions import WebDriverException
+from utils.stats import percentile
+
+logger = logging.getLogger(__name__)
+
+DATA_TYPES = ("cpuinfo", "memoryinfo", "gfxinfo")
+
+# Columns stored for each data type
+COLUMNS = {
+    "cpuinfo": ("cpu_percent",),
+    "memoryinfo": ("total_pss_kb", "native_heap_kb"),
+    "gfxinfo": ("frames", "janky_frames", "frame_p90_ms"),
+}
+
+# Data types the driver could not provide / has provided, shared by every sampler of the process
+_UNSUPPORTED = {}
+_SUPPORTED = set()
+
+_GFX_TOTAL = re.compile(r"Total frames rendered:\s*(\d+)")
+_GFX_JANKY = re.compile(r"Janky frames:\s*(\d+)")
+_GFX_P90 = re.compile(r"90th percentile:\s*([\d.]+)ms")
+
+
+def _table(data):
+    """getPerformanceData returns [[names...], [values...]]; map names to floats"""
+    if not data or len(data) < 2:
+        return {}
+    values = {}
+    for name, value in zip(data[0], data[-1]):
+        try:
+            values[name] = float(value)
+        except (TypeError, ValueError):
+            continue
+    return values
+
+
+class PerfSampler:
+    """Background sampler of one app's performance data through a driver
+
+    Args:
+        driver: Appium WebDriver of the test
+        package: Package name of the app to measure
+        interval: Seconds between sampling rounds
+        data_types: Data types to sample (see DATA_TYPES)
+        max_overhead: Largest share of wall time spent in sampling commands
+        clock: Time source (seconds)
+    """
+
+    def __init__(self, driver, package, interval=1.0, data_types=DATA_TYPES, max_overhead=0.05,
+                 clock=time.monotonic):
+        self.driver = driver
+        self.package = package
+        self.interval = interval
+        self.data_types = [name for name in data_types if name not in _UNSUPPORTED]
+        self.max_overhead = max_overhead
+        self.clock = clock
+        self.times = array("d")
+        self.columns = {column: array("d") for name in self.data_types for column in COLUMNS[name]}
+        self.command_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.rounds = 0
+        self.stretched = 0
+        self._started = None
+        self._stopped = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --- Device commands -------------------------------------------------
+
+    def _performance_data(self, data_type):
+        return _table(self.driver.execute_script("mobile: getPerformanceData", {
+            "packageName": self.package, "dataType": data_type, "dataReadTimeout": 2,
+        }))
+
+    def _gfxinfo(self, *extra):
+        return self.driver.execute_script("mobile: shell", {
+            "command": "dumpsys", "args": ["gfxinfo", self.package, *extra],
+        }) or ""
+
+    def _read(self, data_type):
+        """Read one data type as {column: value}"""
+        if data_type == "cpuinfo":
+            values = self._performance_data("cpuinfo")
+            return {"cpu_percent": values.get("user", 0.0) + values.get("kernel", 0.0)}
+        if data_type == "memoryinfo":
+            values = self._performance_data("memoryinfo")
+            return {"total_pss_kb": values.get("totalPss", 0.0),
+                    "native_heap_kb": values.get("nativeHeapAllocatedSize", 0.0)}
+        output = self._gfxinfo()
+        total, janky, p90 = (_GFX_TOTAL.search(output), _GFX_JANKY.search(output), _GFX_P90.search(output))
+        if total is None:
+            raise ValueError("no frame statistics in dumpsys gfxinfo output")
+        return {"frames": float(total.group(1)), "janky_frames": float(janky.group(1)) if janky else 0.0,
+                "frame_p90_ms": float(p90.group(1)) if p90 else 0.0}
+
+    def _drop(self, data_type, reason):
+        if data_type not in _SUPPORTED:
+            _UNSUPPORTED[data_type] = reason
+        self.data_types.remove(data_type)
+        for column in COLUMNS[data_type]:
+            self.columns.pop(column, None)
+        logger.info(f"Performance data '{data_type}' unavailable, not sampled: {reason}")
+
+    def sample(self):
+        """Take one sampling round (all data types); returns its command time in seconds"""
+        start = self.clock()
+        row = {}
+        complete = True
+        for data_type in list(self.data_types):
+            try:
+                row.update(self._read(data_type))
+                _SUPPORTED.add(data_type)
+            except (WebDriverException, ValueError) as e:
+                reason = getattr(e, "msg", None) or str(e)
+                if data_type in _SUPPORTED:
+                    complete = False
+                    logger.debug(f"Performance data '{data_type}' read failed, round skipped: {reason}")
+                else:
+                    self._drop(data_type, reason)
+        cost = self.clock() - start
+        if row and complete:
+            # Only complete rows are stored, so all columns stay aligned with the timestamps
+            self.times.append(start - (start if self._started is None else self._started))
+            for column, values in self.columns.items():
+                values.append(row.get(column, 0.0))
+        self.rounds += 1
+        self.command_seconds += cost
+        return cost
+
+    # --- Thread ---------------------------------------------------------
+
+    def _run(self):
+        cpu_start = time.thread_time()
+        try:
+            while not self._stop.is_set():
+                cost = self.sample()
+                wait = self.interval - cost
+                # Keep cost / (cost + wait) within the overhead budget
+                floor = cost * (1 - self.max_overhead) / self.max_overhead if self.max_overhead else 0.0
+                if floor > wait:
+                    wait = floor
+                    self.stretched += 1
+                if not self.data_types or self._stop.wait(max(wait, 0.0)):
+                    break
+        finally:
+            self.cpu_seconds = time.thread_time() - cpu_start
+
+    def start(self):
+        """Reset the frame counters and start sampling in the background"""
+        self._started = self.clock()
+        if "gfxinfo" in self.data_types:
+            try:
+                self._gfxinfo("reset")
+            except WebDriverException as e:
+                self._drop("gfxinfo", e.msg)
+        self._thread = threading.Thread(target=self._run, name="perf-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop sampling
+
+        Returns:
+            dict: Summary (see summary())
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=max(self.interval, 10.0))
+        if self._stopped is None:
+            self._stopped = self.clock()
+        return self.summary()
+
+    # --- Results --------------------------------------------------------
+
+    def summary(self):
+        """Percentiles per metric plus the sampler's own cost
+
+        Returns:
+            dict: metric -> {'p50', 'p95', 'max'} for sampled metrics, frame totals for
+                gfxinfo, and 'sampler': {'samples', 'rounds', 'overhead', 'cpu_s', 'stretched'}
+        """
+        summary = {}
+        for column, values in self.columns.items():
+            if column in ("frames", "janky_frames") or not values:
+                continue
+            summary[column] = {"p50": percentile(values, 0.50), "p95": percentile(values, 0.95), "max": max(values)}
+        if self.columns.get("frames"):
+            frames, janky = self.columns["frames"][-1], self.columns["janky_frames"][-1]
+            summary["frames"] = {"rendered": int(frames), "janky": int(janky),
+                                 "janky_percent": round(100.0 * janky / frames, 2) if frames else 0.0}
+        elapsed = ((self._stopped or self.clock()) - self._started) if self._started is not None else 0.0
+        summary["sampler"] = {
+            "samples": len(self.times),
+            "rounds": self.rounds,
+            "command_s": round(self.command_seconds, 4),
+            "overhead": round(self.command_seconds / elapsed, 4) if elapsed > 0 else 0.0,
+            "cpu_s": round(self.cpu_seconds, 4),
+            "stretched": self.stretched,
+        }
+        return summary
+
+
+def result_properties(summary):
+    """Flatten a summary into (name, value) pairs for a test report's user_properties"""
+    properties = []
+    for metric, values in summary.items():
+        for key, value in values.items():
+            properties.append((f"perf.{metric}.{key}", round(value, 3) if isinstance(value, float) else value))
+    return properties
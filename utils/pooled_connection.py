@@ -0,0 +1,82 @@
+"""
+Pooled Appium Connection
+
+The classes behind utils/http_transport.py that need urllib3 and the Appium
+client. http_transport imports (and re-exports) them on first use only:
+- EndpointPoolManager - urllib3 PoolManager with a connection limit per endpoint
+- PooledAppiumConnection - AppiumConnection drawing from a process-wide pool
+"""
+import urllib3
+from appium.webdriver.appium_connection import AppiumConnection
+
+from utils.http_transport import get_shared_pool
+
+
+class EndpointPoolManager(urllib3.PoolManager):
+    """PoolManager with a connection limit per endpoint
+
+    Args:
+        limits: Endpoint ("host:port" or "host") -> maximum connections
+        **kwargs: Passed to urllib3.PoolManager (maxsize is the default limit)
+    """
+
+    def __init__(self, limits=None, **kwargs):
+        super().__init__(**kwargs)
+        self.limits = dict(limits or {})
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        limit = self.limits.get(f"{host}:{port}".lower(), self.limits.get(host.lower()))
+        if limit:
+            request_context = dict(request_context if request_context is not None else self.connection_pool_kw)
+            request_context["maxsize"] = limit
+        return super()._new_pool(scheme, host, port, request_context)
+
+
+class PooledAppiumConnection(AppiumConnection):
+    """AppiumConnection using a process-wide pool manager
+
+    Args:
+        remote_server_addr: Appium server URL
+        keep_alive: Reuse connections between commands and sessions
+        compression: Ask the server for gzip-compressed responses
+        maxsize: Default connections kept per endpoint
+        limits: Per-endpoint connection limits (see parse_pool_limits)
+    """
+
+    def __init__(self, remote_server_addr, keep_alive=True, compression=True, maxsize=4, limits=None):
+        self.compression = compression
+        self._maxsize = maxsize
+        self._limits = dict(limits or {})
+        super().__init__(remote_server_addr, keep_alive=keep_alive)
+
+    def _get_connection_manager(self):
+        proxy_url = getattr(self, "_proxy_url", None)
+        if proxy_url:
+            # Proxies keep the stock per-connection manager
+            return super()._get_connection_manager()
+
+        pool_args = {
+            "timeout": self.get_timeout(),
+            "maxsize": self._maxsize,
+            # Wait for a free connection instead of opening extra ones past the limit
+            "block": True,
+        }
+        if self._ca_certs:
+            pool_args.update(cert_reqs="CERT_REQUIRED", ca_certs=self._ca_certs)
+        else:
+            pool_args["cert_reqs"] = "CERT_NONE"
+        pool_args.update(self._init_args_for_pool_manager)
+
+        key = (tuple(sorted((name, str(value)) for name, value in pool_args.items())),
+               tuple(sorted(self._limits.items())))
+        return get_shared_pool(key, lambda: EndpointPoolManager(limits=self._limits, **pool_args))
+
+    def get_remote_connection_headers(self, parsed_url, keep_alive=True):
+        """Add Accept-Encoding to the Appium request headers when compression is on"""
+        headers = super().get_remote_connection_headers(parsed_url, keep_alive=keep_alive)
+        if self.compression:
+            headers["Accept-Encoding"] = "gzip"
+        return headers
+
+    def close(self):
+        """Leave the shared pool open for the next session (see close_shared_pools)"""
@@ -0,0 +1,263 @@
+"""
+Idle-Aware Session Keepalive
+
+Appium deletes a session that receives no command within its
+newCommandTimeout (NEW_COMMAND_TIMEOUT). Sessions that are held between uses
+(the secondary session of utils/app_lanes.py, pooled sessions) either expire
+while idle or, with a large timeout, hold the device for nothing. This module
+manages such sessions:
+- Every command of a managed driver updates its last-used time
+- A single background thread sleeps until the next session is about to
+  expire and sends one cheap command (GET timeouts) only to sessions that have
+  been idle that long - busy sessions are never pinged
+- Sessions idle longer than KEEPALIVE_MAX_IDLE are released (quit) instead of
+  pinged, and when more than KEEPALIVE_MAX_SESSIONS are live the longest-idle
+  one is released
+- A released or expired session is rebuilt transparently on its next use
+
+Counters (KeepaliveManager.stats()): pings, rebuilds, rebuilds_avoided (uses
+that found a session which had been idle longer than newCommandTimeout but was
+kept alive by pings), releases and expired.
+
+Usage:
+    manager = KeepaliveManager(settings).start()
+    handle = manager.register(lambda: webdriver.Remote(...), name="secondary")
+    handle.driver.current_package   # built on first use, rebuilt if it expired
+    manager.close()
+"""
+import logging
+import threading
+import time
+
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
+
+logger = logging.getLogger(__name__)
+
+
+class ManagedSession:
+    """A driver built on demand and kept alive by a KeepaliveManager
+
+    Args:
+        manager: Owning KeepaliveManager
+        factory: Callable returning a new driver
+        name: Label used in logs
+    """
+
+    def __init__(self, manager, factory, name):
+        self.manager = manager
+        self.factory = factory
+        self.name = name
+        self._driver = None
+        self.last_used = None
+        self.last_command = None  # Last command sent by the test code (pings excluded)
+        self.expired = False
+        self.starting = False  # A driver is being created outside the manager's lock
+
+    @property
+    def live(self):
+        return self._driver is not None and not self.expired
+
+    @property
+    def driver(self):
+        """Live driver, built or rebuilt if needed"""
+        return self.manager.acquire(self)
+
+    def _track(self, driver):
+        """Record the time of every command the driver sends"""
+        session = self
+
+        def execute(driver_command, params=None):
+            try:
+                return type(driver).execute(driver, driver_command, params)
+            except InvalidSessionIdException:
+                session.expired = True
+                raise
+            finally:
+                session.last_used = session.last_command = session.manager.clock()
+
+        driver.execute = execute
+        return driver
+
+    def ping(self):
+        """Send the cheapest command the server answers (GET timeouts)"""
+        from selenium.webdriver.remote.command import Command
+
+        type(self._driver).execute(self._driver, Command.GET_TIMEOUTS)
+        self.last_used = self.manager.clock()
+
+    def release(self):
+        """Quit the session now; it is rebuilt on next use"""
+        driver, self._driver = self._driver, None
+        if driver is not None and not self.expired:
+            try:
+                driver.quit()
+            except WebDriverException as e:
+                logger.debug(f"[{self.name}] quit failed: {e}")
+        self.expired = False
+
+    def __repr__(self):
+        return f"<ManagedSession {self.name} live={self.live}>"
+
+
+class KeepaliveManager:
+    """Tracks managed sessions, pings them before they expire and releases idle ones
+
+    Args:
+        settings: Resolved settings (NEW_COMMAND_TIMEOUT, KEEPALIVE_MARGIN,
+            KEEPALIVE_MAX_IDLE, KEEPALIVE_MAX_SESSIONS)
+        clock: Monotonic clock (for tests)
+    """
+
+    def __init__(self, settings, clock=time.monotonic):
+        self.timeout = settings.NEW_COMMAND_TIMEOUT
+        self.margin = min(settings.KEEPALIVE_MARGIN, self.timeout / 2)
+        self.max_idle = settings.KEEPALIVE_MAX_IDLE
+        self.max_sessions = settings.KEEPALIVE_MAX_SESSIONS
+        self.clock = clock
+        self.sessions = []
+        self.counters = {"pings": 0, "rebuilds": 0, "rebuilds_avoided": 0, "releases": 0, "expired": 0}
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def register(self, factory, name=None):
+        """Manage a session built by factory (nothing is started until first use)
+
+        Returns:
+            ManagedSession: Handle whose .driver is always a live session
+        """
+        with self._condition:
+            session = ManagedSession(self, factory, name or f"session-{len(self.sessions)}")
+            self.sessions.append(session)
+            return session
+
+    def acquire(self, session):
+        """Live driver of a managed session (called by ManagedSession.driver)
+
+        A new session is created outside the lock: starting one can take tens of
+        seconds on a device, and the keepalive thread must keep pinging the others.
+        """
+        with self._condition:
+            while session.starting:
+                self._condition.wait()
+            now = self.clock()
+            if session._driver is not None and not session.expired:
+                if now - session.last_used > self.timeout:
+                    # Missed its pings (e.g. the process was suspended): assume the server dropped it
+                    session.expired = True
+                elif session.last_command is not None and now - session.last_command > self.timeout:
+                    self.counters["rebuilds_avoided"] += 1
+            if session._driver is not None and session.expired:
+                self.counters["expired"] += 1
+                logger.info(f"[{session.name}] session expired, rebuilding")
+                session.release()
+            if session._driver is not None:
+                session.last_used = session.last_command = now
+                self._condition.notify_all()
+                return session._driver
+            if session.last_used is not None:
+                self.counters["rebuilds"] += 1
+            self._make_room(exclude=session)
+            session.starting = True
+
+        driver = None
+        try:
+            driver = session._track(session.factory())
+        finally:
+            with self._condition:
+                session.starting = False
+                if driver is not None:
+                    session._driver = driver
+                    session.last_used = session.last_command = self.clock()
+                    logger.info(f"[{session.name}] session started")
+                self._condition.notify_all()
+        return driver
+
+    def _make_room(self, exclude):
+        """Release the longest-idle sessions while too many are live"""
+        live = [s for s in self.sessions if s.live and s is not exclude]
+        while self.max_sessions and len(live) >= self.max_sessions:
+            idlest = min(live, key=lambda s: s.last_used)
+            logger.info(f"[{idlest.name}] released under pressure ({len(live) + 1} sessions wanted)")
+            idlest.release()
+            self.counters["releases"] += 1
+            live.remove(idlest)
+
+    def release_idle(self, idle_for=0.0):
+        """Release every live session idle for at least idle_for seconds
+
+        Returns:
+            int: Number of sessions released
+        """
+        with self._condition:
+            now = self.clock()
+            released = 0
+            for session in self.sessions:
+                if session.live and now - session.last_used >= idle_for:
+                    session.release()
+                    released += 1
+            self.counters["releases"] += released
+            return released
+
+    def tick(self):
+        """Ping or release sessions that are due
+
+        Returns:
+            float: Seconds until the next session is due (None if none is live)
+        """
+        with self._condition:
+            now = self.clock()
+            next_due = None
+            for session in self.sessions:
+                if not session.live:
+                    continue
+                if self.max_idle and session.last_command is not None and now - session.last_command >= self.max_idle:
+                    logger.info(f"[{session.name}] idle for {now - session.last_command:.0f}s, releasing")
+                    session.release()
+                    self.counters["releases"] += 1
+                    continue
+                due = session.last_used + self.timeout - self.margin
+                if now >= due:
+                    try:
+                        session.ping()
+                        self.counters["pings"] += 1
+                    except WebDriverException as e:
+                        logger.info(f"[{session.name}] keepalive ping failed, rebuilding on next use: {e}")
+                        session.expired = True
+                        continue
+                    due = session.last_used + self.timeout - self.margin
+                next_due = due if next_due is None else min(next_due, due)
+            return None if next_due is None else max(next_due - self.clock(), 0.0)
+
+    def _run(self):
+        while True:
+            delay = self.tick()
+            with self._condition:
+                if self._stopped:
+                    return
+                # Sleeps until the next session is due; a use or registration wakes it up to re-plan
+                self._condition.wait(delay)
+                if self._stopped:
+                    return
+
+    def start(self):
+        """Start the background keepalive thread"""
+        self._thread = threading.Thread(target=self._run, name="session-keepalive", daemon=True)
+        self._thread.start()
+        return self
+
+    def stats(self):
+        with self._condition:
+            return dict(self.counters, live=sum(1 for s in self.sessions if s.live))
+
+    def close(self):
+        """Stop the keepalive thread and quit every managed session"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join(timeout=5)
+        with self._condition:
+            for session in self.sessions:
+                session.release()
+        logger.info(f"Session keepalive: {self.stats()}")
@@ -0,0 +1,281 @@
+"""
+Generative Stress Testing for the Shopping List
+
+Generates random sequences of add/delete operations, runs them through
+ShoppingListPage and compares the page after every step with an in-memory
+model of the list. When a sequence fails it is shrunk to a minimal failing
+case before being reported (in the spirit of Hypothesis stateful testing):
+- Operations are removed in halves, quarters, ... down to single steps
+- Names are shortened and quantities lowered towards 1
+
+Names are drawn to stress the item parser: unicode, embedded newlines, the
+letter "x" (items render as 'Name\\nx{quantity}'), and names that contain
+each other ("Milk" / "Milkshake"). Runs are reproducible from the seed.
+
+Usage:
+    runner = StressRunner(page_factory, seed=0)
+    failure = runner.run(examples=25, max_operations=12)
+    assert failure is None, failure.report()
+"""
+import logging
+import random
+
+logger = logging.getLogger(__name__)
+
+NAME_PIECES = [
+    "Milk", "Milkshake", "milk", "Bread", "Eggs", "x", "X", "xx", "Box", "x2", "Tax 3x",
+    "Café", "Jalapeño", "Grüße", "日本茶", "Ñandú", "🍎", "Ω",
+    "a\nb", "Line\nx9", "\nx1",
+]
+MAX_ITEMS = 10  # Keep the list inside one viewport so get_items() sees every row
+
+
+class Operation:
+    """One step of a generated program
+
+    Attributes:
+        kind: "add" or "delete"
+        name: Item name
+        quantity: Quantity for "add"
+    """
+
+    __slots__ = ("kind", "name", "quantity")
+
+    def __init__(self, kind, name, quantity=1):
+        self.kind = kind
+        self.name = name
+        self.quantity = quantity
+
+    def __eq__(self, other):
+        return isinstance(other, Operation) and (self.kind, self.name, self.quantity) == (
+            other.kind, other.name, other.quantity)
+
+    def __repr__(self):
+        if self.kind == "add":
+            return f"add({self.name!r}, {self.quantity})"
+        return f"delete({self.name!r})"
+
+
+class ShoppingListModel:
+    """In-memory model of the app's shopping list"""
+
+    def __init__(self):
+        self.items = []
+
+    def add(self, name, quantity):
+        name = name.strip()
+        if name:
+            self.items.append((name, max(quantity, 1)))
+        return True
+
+    def delete(self, name):
+        """Remove the first item with exactly this name"""
+        for index, (item_name, _) in enumerate(self.items):
+            if item_name == name:
+                del self.items[index]
+                return True
+        return False
+
+    def rendered(self):
+        """Item descriptions as the app renders them"""
+        return [f"{name}\nx{quantity}" for name, quantity in self.items]
+
+
+def generate_name(rng):
+    """Random item name built from one to three tricky pieces"""
+    name = " ".join(rng.choice(NAME_PIECES) for _ in range(rng.randint(1, 3))).strip()
+    return name or "x"
+
+
+def generate_program(rng, max_operations):
+    """Random operation sequence
+
+    Args:
+        rng: random.Random instance
+        max_operations: Upper bound on the number of operations
+
+    Returns:
+        list: Operation objects
+    """
+    program, names = [], []
+    for _ in range(rng.randint(1, max_operations)):
+        if names and (len(names) >= MAX_ITEMS or rng.random() < 0.35):
+            # Mostly delete an existing item, sometimes a name that is not in the list
+            name = rng.choice(names) if rng.random() < 0.8 else generate_name(rng)
+            program.append(Operation("delete", name))
+            if name in names:
+                names.remove(name)
+        else:
+            name = generate_name(rng)
+            program.append(Operation("add", name, rng.choice([1, 1, 2, 3, 10, 12, 99])))
+            names.append(name)
+    return program
+
+
+class Failure:
+    """A failing program and what went wrong
+
+    Attributes:
+        program: Operations (shrunk when returned by StressRunner.run)
+        step: Index of the failing operation
+        message: Description of the mismatch
+        seed: Seed that generated the original program
+        original_length: Length of the program before shrinking
+    """
+
+    def __init__(self, program, step, message, seed=None, original_length=None):
+        self.program = program
+        self.step = step
+        self.message = message
+        self.seed = seed
+        self.original_length = original_length or len(program)
+
+    def report(self):
+        lines = [f"Shopping list diverged from the model at step {self.step}: {self.message}",
+                 f"Minimal program ({len(self.program)} of {self.original_length} operations, seed {self.seed}):"]
+        lines += [f"  {index}: {operation!r}" for index, operation in enumerate(self.program)]
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"Failure(step={self.step}, program={self.program!r})"
+
+
+def check_program(page, program):
+    """Run a program on a freshly opened list and compare with the model after every step
+
+    Args:
+        page: ShoppingListPage on an empty list
+        program: Operation list
+
+    Returns:
+        Failure or None
+    """
+    model = ShoppingListModel()
+    for step, operation in enumerate(program):
+        if operation.kind == "add":
+            expected = model.add(operation.name, operation.quantity)
+            result = page.add_item(operation.name, operation.quantity)
+        else:
+            expected = model.delete(operation.name)
+            result = page.delete_item(operation.name)
+        if result != expected:
+            return Failure(program, step, f"{operation!r} returned {result}, model returned {expected}")
+        items = page.get_items()
+        if items != model.rendered():
+            return Failure(program, step, f"after {operation!r} the page shows {items!r}, "
+                                          f"model has {model.rendered()!r}")
+    return None
+
+
+def _simplified_operations(operation):
+    """Simpler variants of one operation, simplest first"""
+    if operation.kind == "add" and operation.quantity != 1:
+        yield Operation("add", operation.name, 1)
+    name = operation.name
+    for candidate in (name[:len(name) // 2], name[len(name) // 2:], name[1:], name[:-1]):
+        if candidate.strip() and candidate == candidate.strip() and candidate != name:
+            yield Operation(operation.kind, candidate, operation.quantity)
+
+
+def shrink(program, fails, max_attempts=300):
+    """Reduce a failing program while it keeps failing
+
+    Args:
+        program: Failing operation list
+        fails: Callable(program) -> Failure or None
+        max_attempts: Upper bound on re-runs
+
+    Returns:
+        Failure: Failure of the smallest program found
+    """
+    failure = fails(program)
+    attempts = 0
+
+    def attempt(candidate):
+        nonlocal attempts, failure
+        if attempts >= max_attempts or not candidate:
+            return False
+        attempts += 1
+        result = fails(candidate)
+        if result is not None:
+            failure = result
+            return True
+        return False
+
+    improved = True
+    while improved and attempts < max_attempts:
+        improved = False
+        # Drop chunks of operations, largest first; steps after the failure never matter
+        current = failure.program[:failure.step + 1]
+        if len(current) < len(failure.program) and attempt(current):
+            improved = True
+            continue
+        chunk = len(current) // 2
+        while chunk >= 1 and not improved:
+            for start in range(0, len(current), chunk):
+                if attempt(current[:start] + current[start + chunk:]):
+                    improved = True
+                    break
+            chunk //= 2
+        if improved:
+            continue
+        # Simplify single operations, keeping delete names in sync with their add
+        for index, operation in enumerate(current):
+            for simpler in _simplified_operations(operation):
+                candidate = [simpler if i == index else
+                             Operation(op.kind, simpler.name, op.quantity)
+                             if op.name == operation.name and simpler.name != operation.name else op
+                             for i, op in enumerate(current)]
+                if attempt(candidate):
+                    improved = True
+                    break
+            if improved:
+                break
+
+    logger.info(f"Shrunk failing program to {len(failure.program)} operations in {attempts} runs")
+    return failure
+
+
+class StressRunner:
+    """Generates programs, runs them and shrinks the first failure
+
+    Args:
+        page_factory: Callable returning a ShoppingListPage on an empty list
+            (called once per program run)
+        seed: Random seed; the same seed replays the same programs
+    """
+
+    def __init__(self, page_factory, seed=0):
+        self.page_factory = page_factory
+        self.seed = seed
+        self.runs = 0
+        self.operations = 0
+
+    def _check(self, program):
+        self.runs += 1
+        self.operations += len(program)
+        return check_program(self.page_factory(), program)
+
+    def run(self, examples=25, max_operations=12):
+        """Run generated programs until one fails
+
+        Args:
+            examples: Number of programs to generate
+            max_operations: Upper bound on operations per program
+
+        Returns:
+            Failure: Shrunk failure, or None if every program matched the model
+        """
+        rng = random.Random(self.seed)
+        for example in range(examples):
+            program = generate_program(rng, max_operations)
+            failure = self._check(program)
+            if failure is not None:
+                logger.warning(f"Example {example} failed: {failure.message}")
+                shrunk = shrink(failure.program, self._check)
+                shrunk.seed = self.seed
+                shrunk.original_length = len(program)
+                return shrunk
+        logger.info(f"{examples} generated programs matched the model "
+                    f"({self.operations} operations in {self.runs} runs)")
+        return None
@@ -0,0 +1,17 @@
+"""
+Small statistics helpers shared by the performance sampler and the log analytics
+
+Standard library only, so offline tools can import them without loading the
+WebDriver client.
+"""
+import math
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a sequence (None when empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    # Rounded first so float error (0.07 * 100 = 7.000000000000001) does not skip a rank
+    rank = max(math.ceil(round(fraction * len(ordered), 9)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
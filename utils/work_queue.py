@@ -0,0 +1,365 @@
+"""
+Distributed Work Queue
+
+Coordinator side of multi-host runs (plugins/distributed.py). A coordinator
+holds the test IDs of a run and hands them out over HTTP/JSON to worker agents
+on any host that can reach it (standard library only, like the fake Appium
+server):
+- POST /register   - a worker joins (name, host, Appium server)
+- POST /lease      - a worker asks for a batch of tests; when the queue is
+  empty it steals the unstarted half of the largest other lease
+- POST /start      - a worker is about to run a test (false if the test was
+  stolen or requeued meanwhile, so it is never run twice)
+- POST /result     - outcome, duration and failure text of a finished test
+- POST /heartbeat  - worker is alive (sent from a background thread, so a
+  test that runs for minutes does not look like a dead worker)
+- POST /leave      - worker is done; anything still leased is requeued
+- GET  /status     - JSON progress
+
+A worker that misses heartbeats for WORKER_HEARTBEAT_TIMEOUT is declared dead:
+its leased tests go back to the front of the queue and the test it was running
+is retried on another worker, up to WORK_MAX_ATTEMPTS runs in total.
+"""
+import json
+import logging
+import threading
+import time
+import urllib.request
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+
+class Coordinator:
+    """Work queue state of one run
+
+    Args:
+        nodeids: Test IDs to run, in order
+        lease_size: Tests handed out per lease
+        heartbeat_timeout: Seconds without a heartbeat before a worker is dead
+        max_attempts: Runs of a test before a worker death counts as its failure
+        clock: Monotonic clock (for tests)
+    """
+
+    def __init__(self, nodeids, lease_size=4, heartbeat_timeout=20.0, max_attempts=2, clock=time.monotonic):
+        self.nodeids = list(nodeids)
+        self.lease_size = lease_size
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_attempts = max_attempts
+        self.clock = clock
+        self.pending = deque(self.nodeids)
+        self.leases = {}    # worker -> deque of leased, not yet started tests
+        self.running = {}   # worker -> test being run
+        self.attempts = {}  # test -> runs started
+        self.results = {}   # test -> result dict
+        self.workers = {}   # worker -> info
+        self.counters = {"leases": 0, "steals": 0, "stolen_tests": 0, "requeued": 0, "dead_workers": 0}
+        self.condition = threading.Condition()
+
+    @property
+    def done(self):
+        return len(self.results) == len(self.nodeids)
+
+    def register(self, name, host=None, appium_server=None):
+        """Add a worker
+
+        Returns:
+            str: Unique worker id
+        """
+        with self.condition:
+            worker = name
+            suffix = 1
+            while worker in self.workers:
+                suffix += 1
+                worker = f"{name}-{suffix}"
+            self.workers[worker] = {"name": worker, "host": host, "appium_server": appium_server,
+                                    "last_seen": self.clock(), "alive": True, "completed": 0}
+            self.leases[worker] = deque()
+            logger.info(f"Worker {worker} joined from {host} ({appium_server})")
+            return worker
+
+    def _touch(self, worker):
+        info = self.workers.get(worker)
+        if info is None or not info["alive"]:
+            return False
+        info["last_seen"] = self.clock()
+        return True
+
+    def heartbeat(self, worker):
+        """Returns: bool: False if the worker is unknown or was declared dead"""
+        with self.condition:
+            return self._touch(worker)
+
+    def lease(self, worker):
+        """Next batch of tests for a worker
+
+        Returns:
+            dict: {"tests": [...]}, {"wait": seconds} while other workers still
+            hold tests that may come back, or {"done": True}
+        """
+        with self.condition:
+            if not self._touch(worker):
+                return {"done": True, "reason": "unknown or dead worker"}
+            self._reap()
+            tests = []
+            if self.pending:
+                # Smaller batches as the queue drains, so the tail is spread over all workers
+                alive = sum(1 for info in self.workers.values() if info["alive"]) or 1
+                size = max(1, min(self.lease_size, -(-len(self.pending) // alive)))
+                tests = [self.pending.popleft() for _ in range(min(size, len(self.pending)))]
+            else:
+                victim = max((w for w in self.leases if w != worker), key=lambda w: len(self.leases[w]), default=None)
+                if victim is not None and self.leases[victim]:
+                    # Steal the unstarted back half of the victim's lease (at least one test)
+                    count = max(1, len(self.leases[victim]) // 2)
+                    tests = [self.leases[victim].pop() for _ in range(count)][::-1]
+                    self.counters["steals"] += 1
+                    self.counters["stolen_tests"] += count
+                    logger.info(f"Worker {worker} stole {count} tests from {victim}")
+            if tests:
+                self.leases[worker].extend(tests)
+                self.counters["leases"] += 1
+                return {"tests": tests}
+            if self.done:
+                return {"done": True}
+            return {"wait": min(1.0, self.heartbeat_timeout / 4)}
+
+    def start(self, worker, nodeid):
+        """Claim a leased test right before running it
+
+        Returns:
+            bool: True if the worker still owns the test
+        """
+        with self.condition:
+            lease = self.leases.get(worker)
+            if not self._touch(worker) or lease is None or nodeid not in lease:
+                return False
+            lease.remove(nodeid)
+            self.running[worker] = nodeid
+            self.attempts[nodeid] = self.attempts.get(nodeid, 0) + 1
+            return True
+
+    def report(self, worker, result):
+        """Record the result of a test the worker started
+
+        Args:
+            worker: Worker id
+            result: {"nodeid", "outcome", "duration", "longrepr"}
+
+        Returns:
+            bool: False if the result was ignored (test not running on this worker)
+        """
+        with self.condition:
+            nodeid = result["nodeid"]
+            if self.running.get(worker) != nodeid or nodeid in self.results:
+                return False
+            self._touch(worker)
+            del self.running[worker]
+            self.results[nodeid] = dict(result, worker=worker, attempts=self.attempts[nodeid])
+            self.workers[worker]["completed"] += 1
+            self.condition.notify_all()
+            return True
+
+    def leave(self, worker):
+        """A worker stops; requeue whatever it still holds"""
+        with self.condition:
+            if worker in self.workers and self.workers[worker]["alive"]:
+                self._retire(worker, "left")
+
+    def _retire(self, worker, reason):
+        info = self.workers[worker]
+        info["alive"] = False
+        leased = list(self.leases.pop(worker, ()))
+        self.pending.extendleft(reversed(leased))
+        requeued = len(leased)
+        nodeid = self.running.pop(worker, None)
+        if nodeid is not None and nodeid not in self.results:
+            if self.attempts.get(nodeid, 0) < self.max_attempts:
+                self.pending.appendleft(nodeid)
+                requeued += 1
+            else:
+                self.results[nodeid] = {"nodeid": nodeid, "outcome": "failed", "duration": 0.0, "worker": worker,
+                                        "attempts": self.attempts[nodeid],
+                                        "longrepr": f"Worker {worker} {reason} while running this test "
+                                                    f"({self.attempts[nodeid]} attempts)"}
+        self.counters["requeued"] += requeued
+        if requeued:
+            logger.info(f"Worker {worker} {reason}: {requeued} tests requeued")
+        self.condition.notify_all()
+
+    def _reap(self):
+        now = self.clock()
+        for worker, info in self.workers.items():
+            if info["alive"] and now - info["last_seen"] > self.heartbeat_timeout:
+                logger.warning(f"Worker {worker} missed heartbeats for {now - info['last_seen']:.0f}s, declared dead")
+                self.counters["dead_workers"] += 1
+                self._retire(worker, "died")
+
+    def reap(self):
+        """Declare workers without recent heartbeats dead and requeue their tests"""
+        with self.condition:
+            self._reap()
+
+    def wait(self, timeout=None):
+        """Block until every test has a result
+
+        Returns:
+            bool: True if the run finished within timeout
+        """
+        deadline = None if timeout is None else self.clock() + timeout
+        with self.condition:
+            while not self.done:
+                remaining = None if deadline is None else deadline - self.clock()
+                if remaining is not None and remaining <= 0:
+                    return False
+                # Wake up periodically to reap dead workers even if nobody calls in
+                self.condition.wait(min(self.heartbeat_timeout / 2, remaining or self.heartbeat_timeout / 2))
+                self._reap()
+            return True
+
+    def status(self):
+        with self.condition:
+            outcomes = {}
+            for result in self.results.values():
+                outcomes[result["outcome"]] = outcomes.get(result["outcome"], 0) + 1
+            return {
+                "total": len(self.nodeids), "finished": len(self.results), "pending": len(self.pending),
+                "leased": sum(len(lease) for lease in self.leases.values()), "running": dict(self.running),
+                "outcomes": outcomes, "counters": dict(self.counters),
+                "workers": {w: {k: v for k, v in info.items() if k != "last_seen"}
+                            for w, info in self.workers.items()},
+            }
+
+
+def _make_handler(coordinator):
+    class CoordinatorHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass  # Workers poll constantly; the coordinator logs state changes instead
+
+        def _send(self, payload, status=200):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.split("?", 1)[0] == "/status":
+                self._send(coordinator.status())
+            else:
+                self._send({"error": "not found"}, 404)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            path = self.path.split("?", 1)[0]
+            try:
+                if path == "/register":
+                    payload = {"worker": coordinator.register(body.get("name", "worker"), body.get("host"),
+                                                              body.get("appium_server"))}
+                elif path == "/lease":
+                    payload = coordinator.lease(body["worker"])
+                elif path == "/start":
+                    payload = {"ok": coordinator.start(body["worker"], body["nodeid"])}
+                elif path == "/result":
+                    payload = {"ok": coordinator.report(body["worker"], body["result"])}
+                elif path == "/heartbeat":
+                    payload = {"ok": coordinator.heartbeat(body["worker"])}
+                elif path == "/leave":
+                    coordinator.leave(body["worker"])
+                    payload = {"ok": True}
+                else:
+                    self._send({"error": "not found"}, 404)
+                    return
+            except KeyError as e:
+                self._send({"error": f"missing field {e}"}, 400)
+                return
+            self._send(payload)
+
+    return CoordinatorHandler
+
+
+class CoordinatorServer:
+    """HTTP front end of a Coordinator
+
+    Args:
+        coordinator: Coordinator to serve
+        host: Interface to bind ("0.0.0.0" to accept workers from other hosts)
+        port: Port (0 picks a free one)
+    """
+
+    def __init__(self, coordinator, host="127.0.0.1", port=0):
+        self.coordinator = coordinator
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(coordinator))
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{'127.0.0.1' if host == '0.0.0.0' else host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="work-queue", daemon=True)
+        self._thread.start()
+        logger.info(f"Coordinator serving {len(self.coordinator.nodeids)} tests on {self.url}")
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class CoordinatorClient:
+    """Worker-side client of a CoordinatorServer
+
+    Args:
+        url: Coordinator URL
+        timeout: Seconds per request
+    """
+
+    def __init__(self, url, timeout=10.0):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.worker = None
+
+    def _post(self, path, payload):
+        request = urllib.request.Request(f"{self.url}{path}", data=json.dumps(payload).encode("utf-8"),
+                                         headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+    def register(self, name, host=None, appium_server=None):
+        self.worker = self._post("/register", {"name": name, "host": host, "appium_server": appium_server})["worker"]
+        return self.worker
+
+    def lease(self):
+        return self._post("/lease", {"worker": self.worker})
+
+    def start(self, nodeid):
+        return self._post("/start", {"worker": self.worker, "nodeid": nodeid})["ok"]
+
+    def report(self, result):
+        return self._post("/result", {"worker": self.worker, "result": result})["ok"]
+
+    def heartbeat(self):
+        return self._post("/heartbeat", {"worker": self.worker})["ok"]
+
+    def leave(self):
+        self._post("/leave", {"worker": self.worker})
+
+    def status(self):
+        with urllib.request.urlopen(f"{self.url}/status", timeout=self.timeout) as response:
+            return json.loads(response.read())